@@ -23,6 +23,12 @@ class SecureAdminSite(AdminSite):
         }
         js = ('admin/js/admin.js',)
     
+    def get_urls(self):
+        # ModelAdmins are imported and registered on first use, not at boot
+        from .registry import register_all_models
+        register_all_models()
+        return super().get_urls()
+    
     def has_permission(self, request):
         """
         Only allow superusers and staff members to access admin.
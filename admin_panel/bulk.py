@@ -0,0 +1,138 @@
+"""
+Set-based bulk actions for the admin panel content list
+Selected items arrive as ``<type>:<pk>`` tokens (article:12, book:3, movie:7).
+Each action runs as one UPDATE/DELETE per content type, tag changes as one
+batched INSERT/DELETE on the through table, and the whole request sends a
+single content_changed notification. None of these send per-row save
+signals, so the pages affected before and after each change are purged from
+the proxy cache here.
+"""
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from articles.models import Article, Category, Tag
+from core.cache_policy import content_paths, purge
+from core.content_index import index_objects
+from core.signals import batch_content_changes, notify_content_changed
+from reviews.models import BookCategory, BookReview, MovieCategory, MovieReview
+
+CONTENT_TYPES = {
+    'article': Article,
+    'book': BookReview,
+    'movie': MovieReview,
+}
+
+CATEGORY_MODELS = {
+    'article': Category,
+    'book': BookCategory,
+    'movie': MovieCategory,
+}
+
+ACTIONS = ('publish', 'unpublish', 'archive', 'feature', 'unfeature', 'recategorize', 'add_tags', 'remove_tags', 'delete')
+
+
+class BulkActionError(ValueError):
+    pass
+
+
+def parse_selection(tokens):
+    """{'article': [ids], ...} from ``<type>:<pk>`` tokens; bare ids are articles"""
+    selection = {}
+    for token in tokens:
+        content_type, _, pk = token.rpartition(':')
+        content_type = content_type or 'article'
+        if content_type in CONTENT_TYPES and pk.isdigit():
+            selection.setdefault(content_type, set()).add(int(pk))
+    return selection
+
+
+def _status_update(content_type, action, now):
+    """UPDATE kwargs for publish / unpublish / archive"""
+    if action == 'publish':
+        # Keep the original publication date of republished items
+        published_at = Coalesce('published_at', Value(now))
+        if content_type == 'article':
+            return {'status': 'published', 'published_at': published_at}
+        return {'is_published': True, 'published_at': published_at}
+    if content_type == 'article':
+        return {'status': 'draft' if action == 'unpublish' else 'archived'}
+    # Reviews have no archived state; archiving just takes them offline
+    return {'is_published': False}
+
+
+def _update(content_type, ids, action, category=None):
+    model = CONTENT_TYPES[content_type]
+    now = timezone.now()
+    if action in ('publish', 'unpublish', 'archive'):
+        values = _status_update(content_type, action, now)
+    elif action in ('feature', 'unfeature'):
+        values = {'is_featured': action == 'feature'}
+    else:  # recategorize
+        values = {'category': category}
+    # update() bypasses auto_now and post_save, so stamp updated_at, reindex and purge explicitly
+    before = content_paths(content_type, ids)
+    count = model.objects.filter(pk__in=ids).update(**values, updated_at=now)
+    index_objects(content_type, ids)
+    purge(before | content_paths(content_type, ids))
+    return count
+
+
+def _change_tags(ids, tag_ids, add):
+    through = Article.tags.through
+    before = content_paths('article', ids)
+    if add:
+        article_ids = Article.objects.filter(pk__in=ids).values_list('pk', flat=True)
+        links = [through(article_id=article_id, tag_id=tag_id) for article_id in article_ids for tag_id in tag_ids]
+        through.objects.bulk_create(links, ignore_conflicts=True)
+        count = len(article_ids)
+    else:
+        through.objects.filter(article_id__in=ids, tag_id__in=tag_ids).delete()
+        count = len(ids)
+    # Through-table writes send no m2m_changed; announce the change explicitly
+    notify_content_changed(Article)
+    purge(before | content_paths('article', ids))
+    return count
+
+
+def apply_bulk_action(action, selection, category=None, tag_ids=()):
+    """
+    Run ``action`` over ``selection`` (from parse_selection) and return the
+    number of items affected. ``category`` is a ``<type>:<pk>`` token and only
+    applies to items of that type; tags only apply to articles.
+    """
+    if action not in ACTIONS:
+        raise BulkActionError(f"Unknown action '{action}'")
+
+    target_category = None
+    if action == 'recategorize':
+        content_type, _, pk = (category or '').rpartition(':')
+        if content_type not in CATEGORY_MODELS or not pk.isdigit():
+            raise BulkActionError('Select a category')
+        target_category = CATEGORY_MODELS[content_type].objects.filter(pk=int(pk)).first()
+        if target_category is None:
+            raise BulkActionError('Category not found')
+        selection = {content_type: selection.get(content_type, ())}
+
+    if action in ('add_tags', 'remove_tags'):
+        tag_ids = list(Tag.objects.filter(pk__in=tag_ids).values_list('pk', flat=True))
+        if not tag_ids:
+            raise BulkActionError('Select at least one tag')
+        selection = {'article': selection.get('article', ())}
+
+    count = 0
+    with transaction.atomic(), batch_content_changes():
+        for content_type, ids in selection.items():
+            if not ids:
+                continue
+            model = CONTENT_TYPES[content_type]
+            if action == 'delete':
+                # Per-row post_delete signals are folded into the batch notification
+                count += model.objects.filter(pk__in=ids).delete()[1].get(model._meta.label, 0)
+            elif action in ('add_tags', 'remove_tags'):
+                count += _change_tags(ids, tag_ids, add=action == 'add_tags')
+            else:
+                count += _update(content_type, ids, action, target_category)
+                notify_content_changed(model)
+    return count
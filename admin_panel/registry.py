@@ -1,12 +1,30 @@
 """
 Admin Registry - Register all models to custom admin site
 This module handles registration of all models to the custom admin site.
+Registration is deferred: Django's admin autodiscovery is disabled
+(SimpleAdminConfig) and SecureAdminSite calls register_all_models() when its
+URLs are first built, so workers never import the ModelAdmin classes at boot.
 """
+import threading
+
 from django.contrib.auth.models import Group
 
+_registered = False
+_lock = threading.Lock()
+
 
 def register_all_models():
-    """Register all models to the custom admin site"""
+    """Register all models to the custom admin site (once; safe to call repeatedly)"""
+    global _registered
+    if _registered:
+        return
+    with _lock:
+        if not _registered:
+            _register_all_models()
+            _registered = True
+
+
+def _register_all_models():
     from admin_panel.admin_site import admin_site
     
     # Import admin classes
@@ -20,8 +38,10 @@ def register_all_models():
     from newsletter.models import NewsletterSubscriber, NewsletterCampaign
     from comments.admin import CommentAdmin
     from comments.models import Comment
-    from core.admin import SiteSettingsAdmin, ContactMessageAdmin
-    from core.models import SiteSettings, ContactMessage
+    from core.admin import SiteSettingsAdmin, ContactMessageAdmin, SearchQueryStatAdmin
+    from core.models import SiteSettings, ContactMessage, SearchQueryStat
+    from tasks.admin import TaskAdmin
+    from tasks.models import Task
     
     # Register models
     admin_site.register(User, UserAdmin)
@@ -38,5 +58,7 @@ def register_all_models():
     admin_site.register(Comment, CommentAdmin)
     admin_site.register(SiteSettings, SiteSettingsAdmin)
     admin_site.register(ContactMessage, ContactMessageAdmin)
+    admin_site.register(SearchQueryStat, SearchQueryStatAdmin)
+    admin_site.register(Task, TaskAdmin)
     admin_site.register(Group)
 
@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.messages import get_messages
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import Author
+from articles.models import Article, Category, Tag
+from comments.models import Comment
+
+from .bulk import BulkActionError, apply_bulk_action, parse_selection
+
+
+class BulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user('writer')
+        author = Author.objects.create(user=user, display_name='Writer', slug='writer')
+        cls.articles = [
+            Article.objects.create(title=f'Article {n}', slug=f'article-{n}', author=author, excerpt='x', content='x')
+            for n in range(3)
+        ]
+        cls.tags = [Tag.objects.create(name=f'Tag {n}', slug=f'tag-{n}') for n in range(2)]
+
+    def selection(self, *articles):
+        return parse_selection([f'article:{article.pk}' for article in articles])
+
+    def test_parse_selection(self):
+        self.assertEqual(
+            parse_selection(['article:1', '2', 'book:3', 'movie:x', 'poem:4']),
+            {'article': {1, 2}, 'book': {3}},
+        )
+
+    def test_publish_keeps_the_original_publication_date(self):
+        first, second, _ = self.articles
+        apply_bulk_action('publish', self.selection(first))
+        published_at = Article.objects.get(pk=first.pk).published_at
+        self.assertIsNotNone(published_at)
+
+        self.assertEqual(apply_bulk_action('publish', self.selection(first, second)), 2)
+        self.assertEqual(Article.objects.get(pk=first.pk).published_at, published_at)
+        self.assertEqual(Article.objects.filter(status='published').count(), 2)
+
+    def test_tags_are_added_and_removed_in_bulk(self):
+        first, second, third = self.articles
+        tag_ids = [tag.pk for tag in self.tags]
+        apply_bulk_action('add_tags', self.selection(first, second), tag_ids=tag_ids)
+        # Adding again is a no-op, not a duplicate row
+        apply_bulk_action('add_tags', self.selection(first), tag_ids=tag_ids)
+        self.assertEqual(Article.tags.through.objects.count(), 4)
+
+        apply_bulk_action('remove_tags', self.selection(first, third), tag_ids=[self.tags[0].pk])
+        self.assertEqual(list(first.tags.all()), [self.tags[1]])
+        self.assertEqual(second.tags.count(), 2)
+
+    def test_recategorize_only_applies_to_that_type(self):
+        category = Category.objects.create(name='News', slug='news')
+        selection = parse_selection([f'article:{self.articles[0].pk}', 'book:1'])
+        count = apply_bulk_action('recategorize', selection, category=f'article:{category.pk}')
+        self.assertEqual(count, 1)
+        self.assertEqual(Article.objects.get(pk=self.articles[0].pk).category, category)
+
+    def test_delete(self):
+        self.assertEqual(apply_bulk_action('delete', self.selection(*self.articles[:2])), 2)
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_invalid_actions(self):
+        with self.assertRaises(BulkActionError):
+            apply_bulk_action('explode', self.selection(*self.articles))
+        with self.assertRaises(BulkActionError):
+            apply_bulk_action('add_tags', self.selection(*self.articles), tag_ids=[0])
+
+
+class CommentBulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        user = get_user_model().objects.create_user('writer')
+        author = Author.objects.create(user=user, display_name='Writer', slug='writer')
+        article = Article.objects.create(title='Article', slug='article', author=author, excerpt='x', content='x')
+        cls.target = {'content_type': ContentType.objects.get_for_model(Article), 'object_id': article.pk}
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def comment(self, **kwargs):
+        return Comment.objects.create(name='Reader', email='reader@example.com', content='Hi', **self.target, **kwargs)
+
+    def post(self, action, *comments):
+        response = self.client.post(
+            reverse('admin_panel:comment_bulk_action'),
+            {'action': action, 'comment_ids': [comment.pk for comment in comments]},
+        )
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_approve_and_spam_are_recorded_as_moderated(self):
+        approved, spam, untouched = self.comment(), self.comment(), self.comment(is_spam=True)
+        self.post('approve', approved)
+        self.post('spam', spam)
+        approved.refresh_from_db()
+        spam.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertTrue(approved.is_approved and approved.moderated_at)
+        self.assertTrue(spam.is_spam and spam.moderated_at)
+        self.assertIsNone(untouched.moderated_at)
+
+    def test_reject_reports_the_selected_comments_only(self):
+        parent = self.comment()
+        self.comment(parent=parent)
+        self.assertEqual(self.post('reject', parent), ['1 comment(s) deleted.'])
+        self.assertFalse(Comment.objects.exists())
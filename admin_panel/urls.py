@@ -3,7 +3,11 @@ Admin Panel URLs for Parsa Journal
 Custom admin panel routes
 """
 from django.urls import path
-from . import views
+
+from core.lazy_views import LazyViews
+
+# Public-only workers never import the admin views, forms and bulk/export helpers
+views = LazyViews('admin_panel.views')
 
 app_name = 'admin_panel'
 
@@ -17,6 +21,10 @@ urlpatterns = [
     path('articles/<int:pk>/toggle-featured/', views.article_toggle_featured, name='article_toggle_featured'),
     path('articles/<int:pk>/change-status/', views.article_change_status, name='article_change_status'),
     path('articles/bulk-delete/', views.article_bulk_delete, name='article_bulk_delete'),
+    path('content/bulk-action/', views.content_bulk_action, name='content_bulk_action'),
+    path('comments/', views.comment_queue, name='comment_queue'),
+    path('comments/bulk-action/', views.comment_bulk_action, name='comment_bulk_action'),
+    path('export/<slug:name>/', views.export_data, name='export_data'),
     path('statistics/', views.statistics, name='statistics'),
     path('api/chart-data/', views.chart_data, name='chart_data'),
 ]
@@ -5,11 +5,14 @@ Comprehensive admin panel with article management
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, Sum
+from django.db.models import F, Q, Count, Sum
 from django.db.models.functions import TruncDate, TruncDay, TruncMonth
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponseBadRequest
+from django.urls import reverse
+from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from datetime import timedelta, datetime
 import json
@@ -17,9 +20,13 @@ import json
 from articles.models import Article, Category, Tag
 from reviews.models import BookReview, MovieReview, BookCategory, MovieCategory
 from accounts.models import Author
-from core.models import ContactMessage
+from core.cache_policy import content_paths, purge
+from core.content_index import type_for_model
+from core.exports import ExportError, stream_export
+from core.models import ContactMessage, ContentEntry
 from newsletter.models import NewsletterSubscriber
 from comments.models import Comment
+from .bulk import BulkActionError, apply_bulk_action, parse_selection
 from .forms import ArticleForm, CategoryForm, TagForm
 
 
@@ -121,99 +128,102 @@ def dashboard(request):
     return render(request, 'admin_panel/dashboard.html', context)
 
 
+CONTENT_LIST_QUERYSETS = {
+    'article': lambda: Article.objects.select_related('author', 'category').prefetch_related('tags'),
+    'book': lambda: BookReview.objects.select_related('author', 'category'),
+    'movie': lambda: MovieReview.objects.select_related('author', 'category'),
+}
+
+
+def _load_content_page(entries):
+    """Model instances for a page of index entries, in index order (one query per type)"""
+    entries = list(entries)
+    ids_by_type = {}
+    for entry in entries:
+        ids_by_type.setdefault(entry.content_type, []).append(entry.object_id)
+    objects = {
+        content_type: CONTENT_LIST_QUERYSETS[content_type]().in_bulk(ids)
+        for content_type, ids in ids_by_type.items()
+    }
+    return [
+        objects[entry.content_type][entry.object_id]
+        for entry in entries if entry.object_id in objects[entry.content_type]
+    ]
+
+
 @login_required
 @user_passes_test(is_superuser, login_url='core:login')
 def article_list(request):
     """Content list with search, filter, and pagination - includes articles, books, and movies"""
     content_type = request.GET.get('type', 'all')  # all, article, book, movie
     
-    # Base querysets
-    articles_qs = Article.objects.select_related('author', 'category').prefetch_related('tags').all()
-    books_qs = BookReview.objects.select_related('author', 'category').all()
-    movies_qs = MovieReview.objects.select_related('author', 'category').all()
+    # Filter, order and paginate on the cross-type index, then load only the page's objects
+    entries = ContentEntry.objects.all()
+    if content_type in CONTENT_LIST_QUERYSETS:
+        entries = entries.filter(content_type=content_type)
     
     # Search
     search_query = request.GET.get('q', '').strip()
     if search_query:
-        articles_qs = articles_qs.filter(
+        articles_qs = Article.objects.filter(
             Q(title__icontains=search_query) |
             Q(excerpt__icontains=search_query) |
             Q(content__icontains=search_query) |
             Q(author__display_name__icontains=search_query)
         )
-        books_qs = books_qs.filter(
+        books_qs = BookReview.objects.filter(
             Q(title__icontains=search_query) |
             Q(book_title__icontains=search_query) |
             Q(book_author__icontains=search_query) |
             Q(excerpt__icontains=search_query) |
             Q(author__display_name__icontains=search_query)
         )
-        movies_qs = movies_qs.filter(
+        movies_qs = MovieReview.objects.filter(
             Q(title__icontains=search_query) |
             Q(movie_title__icontains=search_query) |
             Q(director__icontains=search_query) |
             Q(excerpt__icontains=search_query) |
             Q(author__display_name__icontains=search_query)
         )
+        entries = entries.filter(
+            Q(content_type='article', object_id__in=articles_qs.values('id')) |
+            Q(content_type='book', object_id__in=books_qs.values('id')) |
+            Q(content_type='movie', object_id__in=movies_qs.values('id'))
+        )
     
-    # Filter by content type
-    if content_type == 'article':
-        all_content = list(articles_qs)
-    elif content_type == 'book':
-        all_content = list(books_qs)
-    elif content_type == 'movie':
-        all_content = list(movies_qs)
-    else:
-        # Combine all content types
-        all_content = list(articles_qs) + list(books_qs) + list(movies_qs)
-    
-    # Filter by status (for articles)
+    # Filter by status (reviews are indexed as published/draft)
     status_filter = request.GET.get('status', '')
-    if status_filter and content_type in ['all', 'article']:
-        all_content = [item for item in all_content if hasattr(item, 'status') and item.status == status_filter]
+    if status_filter:
+        entries = entries.filter(status=status_filter)
     
     # Filter by category
     category_filter = request.GET.get('category', '')
-    if category_filter:
-        if content_type == 'article':
-            all_content = [item for item in all_content if hasattr(item, 'category') and item.category and str(item.category.id) == category_filter]
-        elif content_type == 'book':
-            all_content = [item for item in all_content if hasattr(item, 'category') and item.category and str(item.category.id) == category_filter]
-        elif content_type == 'movie':
-            all_content = [item for item in all_content if hasattr(item, 'category') and item.category and str(item.category.id) == category_filter]
-        else:
-            all_content = [item for item in all_content if hasattr(item, 'category') and item.category and str(item.category.id) == category_filter]
+    if category_filter.isdigit():
+        entries = entries.filter(category_id=int(category_filter))
     
     # Filter by featured
     featured_filter = request.GET.get('featured', '')
     if featured_filter == 'yes':
-        all_content = [item for item in all_content if hasattr(item, 'is_featured') and item.is_featured]
+        entries = entries.filter(is_featured=True)
     elif featured_filter == 'no':
-        all_content = [item for item in all_content if hasattr(item, 'is_featured') and not item.is_featured]
+        entries = entries.filter(is_featured=False)
     
     # Sort all content
     order_by = request.GET.get('order_by', '-created_at')
-    reverse_order = order_by.startswith('-')
     sort_field = order_by.lstrip('-')
-    
-    def get_sort_value(item):
-        if sort_field == 'created_at':
-            return item.created_at if hasattr(item, 'created_at') else timezone.now()
-        elif sort_field == 'published_at':
-            return item.published_at if hasattr(item, 'published_at') and item.published_at else timezone.now()
-        elif sort_field == 'views':
-            return item.views if hasattr(item, 'views') else 0
-        elif sort_field == 'title':
-            return item.title.lower() if hasattr(item, 'title') else ''
-        else:
-            return item.created_at if hasattr(item, 'created_at') else timezone.now()
-    
-    all_content.sort(key=get_sort_value, reverse=reverse_order)
+    if sort_field not in ('created_at', 'published_at', 'views', 'title'):
+        sort_field = 'created_at'
+    if order_by.startswith('-'):
+        # Unpublished items (no published_at) sort as newest, as before
+        entries = entries.order_by(F(sort_field).desc(nulls_first=True), '-id')
+    else:
+        entries = entries.order_by(F(sort_field).asc(nulls_last=True), 'id')
     
     # Pagination
-    paginator = Paginator(all_content, 20)
+    paginator = Paginator(entries, 20)
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = _load_content_page(page_obj.object_list)
     
     # Get categories for filter
     categories = Category.objects.all()
@@ -232,6 +242,7 @@ def article_list(request):
         'categories': categories,
         'book_categories': book_categories,
         'movie_categories': movie_categories,
+        'tags': Tag.objects.all(),
         'status_choices': Article.STATUS_CHOICES,
     }
     return render(request, 'admin_panel/article_list.html', context)
@@ -333,11 +344,10 @@ def article_detail(request, pk):
 @user_passes_test(is_superuser, login_url='core:login')
 def article_toggle_featured(request, pk):
     """Toggle article featured status"""
-    article = get_object_or_404(Article, pk=pk)
-    article.is_featured = not article.is_featured
-    article.save()
+    article = get_object_or_404(Article.objects.only('id', 'title', 'is_featured'), pk=pk)
+    apply_bulk_action('unfeature' if article.is_featured else 'feature', {'article': [article.pk]})
     
-    status = 'featured' if article.is_featured else 'removed from featured'
+    status = 'removed from featured' if article.is_featured else 'featured'
     messages.success(request, f'Article "{article.title}" has been {status}.')
     return redirect('admin_panel:article_list')
 
@@ -346,15 +356,14 @@ def article_toggle_featured(request, pk):
 @user_passes_test(is_superuser, login_url='core:login')
 def article_change_status(request, pk):
     """Change article status"""
-    article = get_object_or_404(Article, pk=pk)
+    article = get_object_or_404(Article.objects.only('id', 'title'), pk=pk)
     new_status = request.POST.get('status', '')
+    status_actions = {'published': 'publish', 'draft': 'unpublish', 'archived': 'archive'}
     
-    if new_status in [choice[0] for choice in Article.STATUS_CHOICES]:
-        article.status = new_status
-        if new_status == 'published' and not article.published_at:
-            article.published_at = timezone.now()
-        article.save()
-        messages.success(request, f'Article "{article.title}" status has been changed to "{article.get_status_display()}".')
+    if new_status in status_actions:
+        apply_bulk_action(status_actions[new_status], {'article': [article.pk]})
+        status_label = dict(Article.STATUS_CHOICES)[new_status]
+        messages.success(request, f'Article "{article.title}" status has been changed to "{status_label}".')
     
     return redirect('admin_panel:article_list')
 
@@ -366,9 +375,7 @@ def article_bulk_delete(request):
     if request.method == 'POST':
         article_ids = request.POST.getlist('article_ids')
         if article_ids:
-            articles = Article.objects.filter(pk__in=article_ids)
-            count = articles.count()
-            articles.delete()
+            count = apply_bulk_action('delete', parse_selection(article_ids))
             messages.success(request, f'{count} article(s) have been deleted successfully.')
         else:
             messages.warning(request, 'No articles were selected.')
@@ -376,6 +383,48 @@ def article_bulk_delete(request):
     return redirect('admin_panel:article_list')
 
 
+BULK_ACTION_MESSAGES = {
+    'publish': 'published',
+    'unpublish': 'unpublished',
+    'archive': 'archived',
+    'feature': 'featured',
+    'unfeature': 'removed from featured',
+    'recategorize': 'moved to the new category',
+    'add_tags': 'tagged',
+    'remove_tags': 'untagged',
+    'delete': 'deleted',
+}
+
+
+@login_required
+@user_passes_test(is_superuser, login_url='core:login')
+def content_bulk_action(request):
+    """Apply a bulk action to the selected articles, book reviews and movie reviews"""
+    if request.method == 'POST':
+        action = request.POST.get('action', '')
+        selection = parse_selection(request.POST.getlist('content_ids'))
+        if not selection:
+            messages.warning(request, 'No content was selected.')
+        else:
+            try:
+                count = apply_bulk_action(
+                    action,
+                    selection,
+                    category=request.POST.get('category'),
+                    tag_ids=[int(pk) for pk in request.POST.getlist('tag_ids') if pk.isdigit()],
+                )
+            except BulkActionError as exc:
+                messages.error(request, str(exc))
+            else:
+                messages.success(request, f'{count} item(s) {BULK_ACTION_MESSAGES[action]}.')
+
+    # Return to the list with the filters the selection was made under
+    next_url = request.POST.get('next', '')
+    if next_url.startswith('?'):
+        return redirect(reverse('admin_panel:article_list') + next_url)
+    return redirect('admin_panel:article_list')
+
+
 @login_required
 @user_passes_test(is_superuser, login_url='core:login')
 def statistics(request):
@@ -556,3 +605,151 @@ def chart_data(request):
         'period': period
     })
 
+
+
+COMMENT_QUEUE_PAGE_SIZE = 50
+COMMENT_QUEUES = {
+    'pending': Q(is_approved=False, is_spam=False),
+    'spam': Q(is_spam=True),
+    'approved': Q(is_approved=True),
+}
+COMMENT_TARGET_FIELDS = ['id', 'title', 'slug']
+# Queue sizes shown on the tabs: one aggregate, cached briefly and dropped on moderation
+COMMENT_QUEUE_COUNTS_KEY = 'comment_queue_counts'
+COMMENT_QUEUE_COUNTS_TIMEOUT = 60
+
+
+def _comment_queue_counts():
+    counts = cache.get(COMMENT_QUEUE_COUNTS_KEY)
+    if counts is None:
+        counts = Comment.objects.aggregate(**{
+            name: Count('id', filter=condition) for name, condition in COMMENT_QUEUES.items()
+        })
+        cache.set(COMMENT_QUEUE_COUNTS_KEY, counts, COMMENT_QUEUE_COUNTS_TIMEOUT)
+    return counts
+
+
+def _attach_comment_targets(comments):
+    """
+    Set ``comment.target`` for a page of comments with one query per content
+    type (instead of a GenericForeignKey lookup per row), loading only the
+    columns the queue displays.
+    """
+    ids_by_type = {}
+    for comment in comments:
+        ids_by_type.setdefault(comment.content_type_id, set()).add(comment.object_id)
+
+    targets = {}
+    for content_type_id, ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        fields = [f for f in COMMENT_TARGET_FIELDS if any(field.name == f for field in model._meta.fields)]
+        for obj in model._default_manager.filter(pk__in=ids).only(*fields):
+            targets[(content_type_id, obj.pk)] = obj
+
+    for comment in comments:
+        comment.target = targets.get((comment.content_type_id, comment.object_id))
+
+
+def _comment_target_paths(comments):
+    """Detail page paths of the content ``comments`` belong to, for purging the proxy cache"""
+    ids_by_type = {}
+    for content_type_id, object_id in comments.values_list('content_type_id', 'object_id').distinct():
+        ids_by_type.setdefault(content_type_id, set()).add(object_id)
+    paths = set()
+    for content_type_id, ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        content_type = type_for_model(model) if model is not None else None
+        if content_type:
+            paths |= content_paths(content_type, ids, detail_only=True)
+    return paths
+
+
+@login_required
+@user_passes_test(is_superuser, login_url='core:login')
+def comment_queue(request):
+    """Comment moderation queue with keyset pagination (newest first)"""
+    queue = request.GET.get('queue', 'pending')
+    if queue not in COMMENT_QUEUES:
+        queue = 'pending'
+
+    comments = Comment.objects.filter(COMMENT_QUEUES[queue])
+    # Keyset pagination on id: ?before=<id> costs the same on every page, unlike OFFSET
+    before = request.GET.get('before')
+    if before and before.isdigit():
+        comments = comments.filter(id__lt=int(before))
+
+    page = list(
+        comments.order_by('-id').only(
+            'id', 'content_type', 'object_id', 'name', 'email', 'website', 'content',
+            'is_approved', 'is_spam', 'spam_score', 'ip_address', 'created_at',
+        )[:COMMENT_QUEUE_PAGE_SIZE + 1]
+    )
+    has_next = len(page) > COMMENT_QUEUE_PAGE_SIZE
+    page = page[:COMMENT_QUEUE_PAGE_SIZE]
+    _attach_comment_targets(page)
+
+    context = {
+        'comments': page,
+        'queue': queue,
+        'queue_counts': _comment_queue_counts(),
+        'next_before': page[-1].id if has_next else None,
+        'is_first_page': not before,
+    }
+    return render(request, 'admin_panel/comment_queue.html', context)
+
+
+@login_required
+@user_passes_test(is_superuser, login_url='core:login')
+def comment_bulk_action(request):
+    """Approve, reject (delete) or mark as spam the selected comments in one statement"""
+    queue = request.POST.get('queue', 'pending')
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        comment_ids = [int(pk) for pk in request.POST.getlist('comment_ids') if pk.isdigit()]
+        selected = Comment.objects.filter(pk__in=comment_ids)
+        # Collected before a reject deletes the rows, purged once the change is made
+        target_paths = _comment_target_paths(selected) if comment_ids else set()
+        if not comment_ids:
+            messages.warning(request, 'No comments were selected.')
+        elif action == 'approve':
+            now = timezone.now()
+            count = selected.update(is_approved=True, is_spam=False, moderated_at=now, updated_at=now)
+            messages.success(request, f'{count} comment(s) approved.')
+        elif action == 'spam':
+            now = timezone.now()
+            count = selected.update(is_approved=False, is_spam=True, moderated_at=now, updated_at=now)
+            messages.success(request, f'{count} comment(s) marked as spam.')
+        elif action == 'reject':
+            # delete() also counts the replies it cascades to; report the selected comments only
+            count = selected.count()
+            selected.delete()
+            messages.success(request, f'{count} comment(s) deleted.')
+        else:
+            messages.error(request, 'Unknown action.')
+            target_paths = set()
+        purge(target_paths)
+        cache.delete(COMMENT_QUEUE_COUNTS_KEY)
+
+    url = reverse('admin_panel:comment_queue')
+    return redirect(f'{url}?queue={queue}' if queue in COMMENT_QUEUES else url)
+
+
+@login_required
+@user_passes_test(is_superuser, login_url='core:login')
+def export_data(request, name):
+    """Stream an export as CSV or JSON Lines (?format=csv|jsonl&columns=id,email)"""
+    fmt = request.GET.get('format', 'csv')
+    requested = [column.strip() for column in request.GET.get('columns', '').split(',') if column.strip()]
+    try:
+        chunks, content_type = stream_export(name, fmt, requested)
+    except ExportError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    filename = f'{name}-{timezone.localdate():%Y%m%d}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Let nginx pass chunks through as they are produced instead of buffering the export
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,97 @@
+"""
+Cursor pagination for the content API
+A cursor encodes the ordering values of the last row of a page, so the next
+page is a keyset seek (``WHERE (published_at, id) < (...)``) that costs the
+same on page 1000 as on page 1, unlike OFFSET.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    payload = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Cursor string -> ordering values converted back to Python by the model fields"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise CursorError('Invalid cursor')
+    if not isinstance(raw, list) or len(raw) != len(ordering):
+        raise CursorError('Invalid cursor')
+
+    values = []
+    for key, value in zip(ordering, raw):
+        field = model._meta.get_field(key.lstrip('-'))
+        try:
+            values.append(field.to_python(value))
+        except ValidationError:
+            raise CursorError('Invalid cursor')
+    return values
+
+
+def _is_nullable(model, name):
+    return model._meta.get_field(name).null
+
+
+def _order_by(model, ordering):
+    """order_by() arguments for ``ordering`` with NULLs last on every backend, matching seek()"""
+    expressions = []
+    for key in ordering:
+        name = key.lstrip('-')
+        if not _is_nullable(model, name):
+            expressions.append(key)
+        elif key.startswith('-'):
+            expressions.append(F(name).desc(nulls_last=True))
+        else:
+            expressions.append(F(name).asc(nulls_last=True))
+    return expressions
+
+
+def seek(queryset, ordering, values):
+    """Rows strictly after ``values`` in ``ordering`` (lexicographic keyset condition, NULLs last)"""
+    model = queryset.model
+    condition = Q(pk__in=[])
+    for index, key in enumerate(ordering):
+        name = key.lstrip('-')
+        value = values[index]
+        if value is None:
+            # Nothing sorts after NULL in this column; only the later columns can advance
+            continue
+        operator = 'lt' if key.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{operator}': value})
+        if _is_nullable(model, name):
+            step |= Q(**{f'{name}__isnull': True})
+        for previous, previous_value in zip(ordering[:index], values[:index]):
+            previous = previous.lstrip('-')
+            if previous_value is None:
+                step &= Q(**{f'{previous}__isnull': True})
+            else:
+                step &= Q(**{previous: previous_value})
+        condition |= step
+    return queryset.filter(condition)
+
+
+def cursor_paginate(queryset, ordering, lookups, cursor=None, limit=20):
+    """
+    Return (rows, next cursor or None). Rows are ``values()`` dicts; the
+    ordering columns are fetched along with ``lookups``.
+    """
+    if cursor:
+        queryset = seek(queryset, ordering, decode_cursor(cursor, queryset.model, ordering))
+    columns = list(dict.fromkeys([*lookups, *(key.lstrip('-') for key in ordering)]))
+    rows = list(queryset.order_by(*_order_by(queryset.model, ordering)).values(*columns)[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][key.lstrip('-')] for key in ordering])
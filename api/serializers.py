@@ -0,0 +1,218 @@
+"""
+values()-based serializers for the content API
+Each serializer maps public field names to ORM lookups. Responses are built
+straight from ``queryset.values()`` rows, so no model instances are created,
+and only the columns a client asked for (``?fields=``) are selected.
+"""
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import translation
+
+from articles.models import Article
+
+SLUG_PLACEHOLDER = '__slug__'
+
+
+class FieldError(ValueError):
+    pass
+
+
+class ValuesSerializer:
+    # public name -> ORM lookup passed to values()
+    fields = {}
+    # default fieldset of list responses (detail responses default to everything)
+    list_fields = ()
+    # fields that are too heavy for list responses, even when requested
+    detail_only = ()
+    # fields stored as file paths, output as media URLs
+    file_fields = ()
+    # many-valued fields, fetched with one extra query instead of a join: name -> method
+    many_fields = {}
+    # detail URL pattern; adds a computed 'url' field
+    url_name = None
+
+    def __init__(self, requested=None, detail=False):
+        available = [*self.fields, *self.many_fields]
+        if self.url_name:
+            available.append('url')
+        if requested:
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                raise FieldError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+            if not detail:
+                heavy = [name for name in requested if name in self.detail_only]
+                if heavy:
+                    raise FieldError(f"Field(s) only available on detail responses: {', '.join(heavy)}")
+            self.names = list(dict.fromkeys(requested))
+        elif detail:
+            self.names = available
+        else:
+            self.names = list(self.list_fields)
+
+    @property
+    def lookups(self):
+        """Columns to select; the pk and slug are always fetched for related fields and URLs"""
+        lookups = ['id']
+        if 'url' in self.names:
+            lookups.append('slug')
+            if 'language' in self.fields:
+                lookups.append('language')
+        lookups.extend(self.fields[name] for name in self.names if name in self.fields)
+        return list(dict.fromkeys(lookups))
+
+    def serialize(self, rows, request, language=None):
+        url_templates = {}
+        many = {
+            name: getattr(self, method)([row['id'] for row in rows])
+            for name, method in self.many_fields.items() if name in self.names
+        }
+        media_url = settings.MEDIA_URL
+        results = []
+        for row in rows:
+            item = {}
+            for name in self.names:
+                if name == 'url':
+                    row_language = row.get('language', language)
+                    if row_language not in url_templates:
+                        url_templates[row_language] = self._url_template(request, row_language)
+                    item['url'] = url_templates[row_language].replace(SLUG_PLACEHOLDER, quote(row['slug']))
+                elif name in many:
+                    item[name] = many[name].get(row['id'], [])
+                elif name in self.file_fields:
+                    path = row[self.fields[name]]
+                    item[name] = request.build_absolute_uri(f'{media_url}{path}') if path else None
+                else:
+                    item[name] = row[self.fields[name]]
+            results.append(item)
+        return results
+
+    def _url_template(self, request, language):
+        # Reverse once per language (for its URL prefix) instead of once per row
+        with translation.override(language or settings.LANGUAGE_CODE):
+            path = reverse(self.url_name, kwargs={'slug': SLUG_PLACEHOLDER})
+        return request.build_absolute_uri(path)
+
+
+CONTENT_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'language': 'language',
+    'excerpt': 'excerpt',
+    'content': 'rendered_content',
+    'word_count': 'word_count',
+    'reading_time': 'reading_time',
+    'author': 'author__slug',
+    'author_name': 'author__display_name',
+    'category': 'category__slug',
+    'category_name': 'category__name',
+    'image_alt': 'image_alt',
+    'is_featured': 'is_featured',
+    'views': 'views',
+    'published_at': 'published_at',
+    'updated_at': 'updated_at',
+}
+
+
+class ArticleSerializer(ValuesSerializer):
+    fields = {**CONTENT_FIELDS, 'featured_image': 'featured_image'}
+    list_fields = ('id', 'title', 'slug', 'language', 'excerpt', 'author', 'category', 'reading_time', 'published_at', 'url')
+    detail_only = ('content',)
+    file_fields = ('featured_image',)
+    many_fields = {'tags': 'get_tags'}
+    url_name = 'articles:article_detail'
+
+    def get_tags(self, ids):
+        tags = {}
+        rows = Article.tags.through.objects.filter(article_id__in=ids).values_list('article_id', 'tag__slug')
+        for article_id, slug in rows:
+            tags.setdefault(article_id, []).append(slug)
+        return tags
+
+
+class BookReviewSerializer(ValuesSerializer):
+    fields = {
+        **CONTENT_FIELDS,
+        'book_title': 'book_title',
+        'book_author': 'book_author',
+        'book_isbn': 'book_isbn',
+        'book_year': 'book_year',
+        'rating': 'rating',
+        'cover_image': 'cover_image',
+        'purchase_link': 'purchase_link',
+    }
+    list_fields = ('id', 'title', 'slug', 'language', 'book_title', 'book_author', 'rating', 'excerpt', 'category', 'published_at', 'url')
+    detail_only = ('content',)
+    file_fields = ('cover_image',)
+    url_name = 'reviews:book_detail'
+
+
+class MovieReviewSerializer(ValuesSerializer):
+    fields = {
+        **CONTENT_FIELDS,
+        'movie_title': 'movie_title',
+        'director': 'director',
+        'year': 'year',
+        'genre': 'genre',
+        'rating': 'rating',
+        'poster_image': 'poster_image',
+        'watch_link': 'watch_link',
+    }
+    list_fields = ('id', 'title', 'slug', 'language', 'movie_title', 'director', 'year', 'rating', 'excerpt', 'category', 'published_at', 'url')
+    detail_only = ('content',)
+    file_fields = ('poster_image',)
+    url_name = 'reviews:movie_detail'
+
+
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'slug': 'slug',
+    'language': 'language',
+    'description': 'description',
+    'image': 'image',
+}
+
+
+class CategorySerializer(ValuesSerializer):
+    fields = CATEGORY_FIELDS
+    list_fields = ('id', 'name', 'slug', 'language', 'url')
+    file_fields = ('image',)
+    url_name = 'articles:category_detail'
+
+
+class BookCategorySerializer(CategorySerializer):
+    url_name = 'reviews:book_category_detail'
+
+
+class MovieCategorySerializer(CategorySerializer):
+    url_name = 'reviews:movie_category_detail'
+
+
+class TagSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+    }
+    list_fields = ('id', 'name', 'slug', 'url')
+    url_name = 'articles:tag_detail'
+
+
+class AuthorSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'name': 'display_name',
+        'slug': 'slug',
+        'bio': 'bio',
+        'profile_image': 'profile_image',
+        'website': 'website',
+        'twitter': 'twitter',
+        'linkedin': 'linkedin',
+        'instagram': 'instagram',
+    }
+    list_fields = ('id', 'name', 'slug', 'url')
+    file_fields = ('profile_image',)
+    url_name = 'articles:author_detail'
@@ -0,0 +1,23 @@
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('articles/', views.resource_list, {'resource': 'articles'}, name='article_list'),
+    path('articles/<uslug:slug>/', views.resource_detail, {'resource': 'articles'}, name='article_detail'),
+    path('books/', views.resource_list, {'resource': 'books'}, name='book_list'),
+    path('books/<uslug:slug>/', views.resource_detail, {'resource': 'books'}, name='book_detail'),
+    path('movies/', views.resource_list, {'resource': 'movies'}, name='movie_list'),
+    path('movies/<uslug:slug>/', views.resource_detail, {'resource': 'movies'}, name='movie_detail'),
+    path('categories/', views.resource_list, {'resource': 'categories'}, name='category_list'),
+    path('categories/<uslug:slug>/', views.resource_detail, {'resource': 'categories'}, name='category_detail'),
+    path('book-categories/', views.resource_list, {'resource': 'book-categories'}, name='book_category_list'),
+    path('book-categories/<uslug:slug>/', views.resource_detail, {'resource': 'book-categories'}, name='book_category_detail'),
+    path('movie-categories/', views.resource_list, {'resource': 'movie-categories'}, name='movie_category_list'),
+    path('movie-categories/<uslug:slug>/', views.resource_detail, {'resource': 'movie-categories'}, name='movie_category_detail'),
+    path('tags/', views.resource_list, {'resource': 'tags'}, name='tag_list'),
+    path('tags/<uslug:slug>/', views.resource_detail, {'resource': 'tags'}, name='tag_detail'),
+    path('authors/', views.resource_list, {'resource': 'authors'}, name='author_list'),
+    path('authors/<uslug:slug>/', views.resource_detail, {'resource': 'authors'}, name='author_detail'),
+]
@@ -0,0 +1,169 @@
+"""
+Read-only JSON content API
+    GET /api/v1/<resource>/?lang=&fields=&cursor=&limit=&<filters>
+    GET /api/v1/<resource>/<slug>/?lang=&fields=
+ETags are derived from the content version, so revalidation (If-None-Match)
+is answered with a 304 before any query runs.
+"""
+from dataclasses import dataclass, field
+import hashlib
+from typing import Callable, Dict, Tuple
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+
+from accounts.models import Author
+from articles.models import Article, Category, Tag
+from core.caching import get_content_version
+from reviews.models import BookCategory, BookReview, MovieCategory, MovieReview
+from . import serializers
+from .pagination import CursorError, cursor_paginate
+
+
+@dataclass
+class Resource:
+    serializer: type
+    queryset: Callable[[], QuerySet]
+    ordering: Tuple[str, ...] = ('-published_at', '-id')
+    language_field: str = 'language'
+    # query parameter -> ORM lookup
+    filters: Dict[str, str] = field(default_factory=dict)
+
+
+RESOURCES = {
+    'articles': Resource(
+        serializer=serializers.ArticleSerializer,
+        queryset=lambda: Article.objects.filter(status='published'),
+        filters={'category': 'category__slug', 'tag': 'tags__slug', 'author': 'author__slug'},
+    ),
+    'books': Resource(
+        serializer=serializers.BookReviewSerializer,
+        queryset=lambda: BookReview.objects.filter(is_published=True),
+        filters={'category': 'category__slug', 'author': 'author__slug', 'rating': 'rating'},
+    ),
+    'movies': Resource(
+        serializer=serializers.MovieReviewSerializer,
+        queryset=lambda: MovieReview.objects.filter(is_published=True),
+        filters={'category': 'category__slug', 'author': 'author__slug', 'rating': 'rating', 'year': 'year'},
+    ),
+    'categories': Resource(
+        serializer=serializers.CategorySerializer,
+        queryset=lambda: Category.objects.all(),
+        ordering=('id',),
+    ),
+    'book-categories': Resource(
+        serializer=serializers.BookCategorySerializer,
+        queryset=lambda: BookCategory.objects.all(),
+        ordering=('id',),
+    ),
+    'movie-categories': Resource(
+        serializer=serializers.MovieCategorySerializer,
+        queryset=lambda: MovieCategory.objects.all(),
+        ordering=('id',),
+    ),
+    'tags': Resource(
+        serializer=serializers.TagSerializer,
+        queryset=lambda: Tag.objects.all(),
+        ordering=('id',),
+        language_field=None,
+    ),
+    'authors': Resource(
+        serializer=serializers.AuthorSerializer,
+        queryset=lambda: Author.objects.filter(is_active=True),
+        ordering=('id',),
+        language_field=None,
+    ),
+}
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def json_response(data, etag):
+    response = JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.API_MAX_AGE)
+    return response
+
+
+def get_etag(request):
+    # Any content change bumps the version, so (version, URL) identifies the response body
+    raw = f'{get_content_version()}:{request.get_full_path()}'
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def parse_request(request, resource, detail=False):
+    """(serializer, language, queryset) from the common query parameters"""
+    language = request.GET.get('lang')
+    if language and language not in dict(settings.LANGUAGES):
+        raise ValueError(f"Unknown language '{language}'")
+    requested = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+    serializer = resource.serializer(requested, detail=detail)
+
+    queryset = resource.queryset()
+    if language and resource.language_field:
+        queryset = queryset.filter(**{resource.language_field: language})
+    return serializer, language, queryset
+
+
+@require_GET
+def resource_list(request, resource):
+    resource = RESOURCES[resource]
+    etag = get_etag(request)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        serializer, language, queryset = parse_request(request, resource)
+        limit = int(request.GET.get('limit', settings.API_PAGE_SIZE))
+        for param, lookup in resource.filters.items():
+            value = request.GET.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+    except ValueError as exc:
+        return error_response(str(exc))
+    limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+    try:
+        rows, next_cursor = cursor_paginate(
+            queryset, resource.ordering, serializer.lookups, cursor=request.GET.get('cursor'), limit=limit,
+        )
+    except CursorError as exc:
+        return error_response(str(exc))
+
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+    return json_response({
+        'results': serializer.serialize(rows, request, language),
+        'next': next_url,
+    }, etag)
+
+
+@require_GET
+def resource_detail(request, resource, slug):
+    resource = RESOURCES[resource]
+    etag = get_etag(request)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        serializer, language, queryset = parse_request(request, resource, detail=True)
+    except ValueError as exc:
+        return error_response(str(exc))
+
+    # Category slugs are only unique per language; ?lang= picks one, otherwise the first in API order wins
+    row = queryset.filter(slug=slug).order_by(*resource.ordering).values(*serializer.lookups).first()
+    if row is None:
+        return error_response('Not found', status=404)
+    return json_response(serializer.serialize([row], request, language)[0], etag)
@@ -0,0 +1,78 @@
+"""
+RSS/Atom feeds for published articles
+Filter with ?category=<slug> and ?tag=<slug>; ?full=1 embeds the full
+pre-rendered article body instead of the excerpt.
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import F
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from core.feeds import AtomFeedMixin, CachedFeed, FeedScope
+from core.templatetags.core_extras import translate_name
+from .models import Article, Category, Tag
+
+
+class LatestArticlesFeed(CachedFeed):
+    filter_params = ('category', 'tag')
+
+    def get_object(self, request):
+        language = request.LANGUAGE_CODE
+        scope = FeedScope(language=language, full=self.wants_full(request))
+        category_slug = request.GET.get('category')
+        if category_slug:
+            scope.category = get_object_or_404(Category, slug=category_slug, language=language)
+        tag_slug = request.GET.get('tag')
+        if tag_slug:
+            scope.tag = get_object_or_404(Tag, slug=tag_slug)
+        return scope
+
+    def title(self, obj):
+        parts = [self.site_name()]
+        if obj.category:
+            parts.append(translate_name(obj.category.name))
+        if obj.tag:
+            parts.append(translate_name(obj.tag.name))
+        return ' - '.join(parts)
+
+    def link(self, obj):
+        query = {}
+        if obj.category:
+            query['category'] = obj.category.slug
+        if obj.tag:
+            query['tag'] = obj.tag.slug
+        url = reverse('articles:article_list')
+        return f'{url}?{urlencode(query)}' if query else url
+
+    def description(self, obj):
+        return f'Latest articles from {self.site_name()}'
+
+    def items(self, obj):
+        articles = Article.objects.filter(status='published', language=obj.language)
+        if obj.category:
+            articles = articles.filter(category=obj.category)
+        if obj.tag:
+            articles = articles.filter(tags=obj.tag)
+        # Never load the raw editor HTML; ?full=1 reads the HTML rendered at save time
+        body = 'rendered_content' if obj.full else 'excerpt'
+        return (
+            articles.select_related('author', 'category')
+            .prefetch_related('tags')
+            .defer('content', 'rendered_content', 'meta_description')
+            .annotate(feed_body=F(body))[:settings.FEED_ITEMS]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_categories(self, item):
+        categories = [translate_name(tag.name) for tag in item.tags.all()]
+        if item.category:
+            categories.insert(0, translate_name(item.category.name))
+        return categories
+
+
+class LatestArticlesAtomFeed(AtomFeedMixin, LatestArticlesFeed):
+    pass
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('articles', '0004_category_language_alter_category_name_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='articles_ar_publish_c77e57_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='articles_ar_author__8895b2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['language', 'status', '-published_at', '-created_at'], name='article_lang_status_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['category', 'language', 'status', '-published_at', '-created_at'], name='article_cat_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', 'language', 'status', '-published_at', '-created_at'], name='article_author_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['language', 'status', '-published_at', '-created_at'], name='article_featured_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at'], name='article_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['language', 'name'], name='category_lang_name_idx'),
+        ),
+    ]
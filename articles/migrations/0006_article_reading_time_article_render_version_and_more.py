@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_remove_article_articles_ar_publish_c77e57_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='render_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rendered_content',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
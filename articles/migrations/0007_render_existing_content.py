@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+from django.db import migrations
+
+
+def render_existing(apps, schema_editor):
+    from core.content_pipeline import PIPELINE_VERSION, render_content
+
+    Article = apps.get_model('articles', 'Article')
+    batch = []
+    for article in Article.objects.only('id', 'content').iterator(chunk_size=500):
+        rendered = render_content(article.content)
+        article.rendered_content = rendered.html
+        article.word_count = rendered.word_count
+        article.reading_time = rendered.reading_time
+        article.render_version = PIPELINE_VERSION
+        batch.append(article)
+        if len(batch) >= 500:
+            Article.objects.bulk_update(batch, ['rendered_content', 'word_count', 'reading_time', 'render_version'])
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, ['rendered_content', 'word_count', 'reading_time', 'render_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_reading_time_article_render_version_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
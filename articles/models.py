@@ -24,6 +24,9 @@ class Category(models.Model):
         verbose_name_plural = 'Categories'
         ordering = ['name']
         unique_together = [['slug', 'language']]
+        indexes = [
+            models.Index(fields=['language', 'name'], name='category_lang_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -86,6 +89,12 @@ class Article(models.Model):
     excerpt = models.TextField(max_length=500, help_text='Short summary of the article')
     content = models.TextField(help_text='Article content (HTML supported)')
     
+    # Rendered on save by core.content_pipeline - templates output this, never raw content
+    rendered_content = models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content')
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes')
+    render_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    
     # Images
     featured_image = models.ImageField(upload_to='articles/', blank=True, null=True, help_text='Main image for the article')
     image_alt = models.CharField(max_length=200, blank=True, help_text='Alt text for featured image')
@@ -108,10 +117,19 @@ class Article(models.Model):
         verbose_name = 'Article'
         verbose_name_plural = 'Articles'
         ordering = ['-published_at', '-created_at']
+        # Indexes follow the public query shapes (see `manage.py explain_views`):
+        # every listing filters on language + status and orders by the model ordering.
         indexes = [
-            models.Index(fields=['-published_at', 'status']),
+            models.Index(fields=['language', 'status', '-published_at', '-created_at'], name='article_lang_status_pub_idx'),
+            models.Index(fields=['category', 'language', 'status', '-published_at', '-created_at'], name='article_cat_lang_pub_idx'),
+            models.Index(fields=['author', 'language', 'status', '-published_at', '-created_at'], name='article_author_lang_pub_idx'),
+            models.Index(
+                fields=['language', 'status', '-published_at', '-created_at'],
+                name='article_featured_pub_idx',
+                condition=models.Q(is_featured=True),
+            ),
+            models.Index(fields=['-created_at'], name='article_created_idx'),
             models.Index(fields=['slug']),
-            models.Index(fields=['author']),
         ]
 
     def __str__(self):
@@ -128,6 +146,8 @@ class Article(models.Model):
         if self.status == 'published' and not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
+        from core.content_pipeline import apply_rendered_content
+        kwargs['update_fields'] = apply_rendered_content(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
     def increment_views(self):
@@ -1,10 +1,13 @@
 from django.urls import path
 from . import views
+from .feeds import LatestArticlesAtomFeed, LatestArticlesFeed
 
 app_name = 'articles'
 
 urlpatterns = [
     path('', views.article_list, name='article_list'),
+    path('feed/', LatestArticlesFeed(), name='article_feed'),
+    path('feed/atom/', LatestArticlesAtomFeed(), name='article_atom_feed'),
     path('article/<uslug:slug>/', views.article_detail, name='article_detail'),
     path('category/<uslug:slug>/', views.category_detail, name='category_detail'),
     path('tag/<uslug:slug>/', views.tag_detail, name='tag_detail'),
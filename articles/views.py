@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
 from django.db.models import Count, Q
@@ -6,6 +7,29 @@ from django.contrib.contenttypes.models import ContentType
 from .models import Article, Category, Tag
 from comments.models import Comment
 from comments.forms import CommentForm
+from core.caching import cached, is_cache_warming
+from core.models import ContentEntry
+from core.ratelimit import get_client_ip, ratelimit
+
+
+def sidebar_aggregates(language):
+    """Top categories and tags (with published article counts) for the article list sidebar"""
+    # Show categories that have articles in the current language
+    categories = Category.objects.filter(
+        articles__language=language,
+        articles__status='published'
+    ).distinct().annotate(
+        article_count=Count('articles', filter=Q(articles__language=language, articles__status='published'))
+    ).filter(article_count__gt=0).order_by('-article_count')[:10]
+    
+    tags = Tag.objects.filter(
+        articles__language=language,
+        articles__status='published'
+    ).distinct().annotate(
+        article_count=Count('articles', filter=Q(articles__language=language, articles__status='published'))
+    ).filter(article_count__gt=0).order_by('-article_count')[:20]
+    
+    return {'categories': list(categories), 'tags': list(tags)}
 
 
 def article_list(request):
@@ -43,40 +67,33 @@ def article_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get categories and tags for sidebar (filtered by language)
-    # Show categories that have articles in the current language
-    categories = Category.objects.filter(
-        articles__language=current_language,
-        articles__status='published'
-    ).distinct().annotate(
-        article_count=Count('articles', filter=Q(articles__language=current_language, articles__status='published'))
-    ).filter(article_count__gt=0).order_by('-article_count')[:10]
-    
-    tags = Tag.objects.filter(
-        articles__language=current_language,
-        articles__status='published'
-    ).distinct().annotate(
-        article_count=Count('articles', filter=Q(articles__language=current_language, articles__status='published'))
-    ).filter(article_count__gt=0).order_by('-article_count')[:20]
+    # Categories and tags for the sidebar, cached until content changes
+    sidebar = cached(
+        'article_sidebar', current_language,
+        compute=lambda: sidebar_aggregates(current_language),
+        timeout=settings.LISTING_CACHE_TIMEOUT,
+    )
     
     context = {
         'page_obj': page_obj,
         'category': category,
         'tag': tag,
         'search_query': search_query,
-        'categories': categories,
-        'tags': tags,
+        'categories': sidebar['categories'],
+        'tags': sidebar['tags'],
     }
     return render(request, 'articles/article_list.html', context)
 
 
+@ratelimit('comment')
 def article_detail(request, slug):
     """Article detail page with comments"""
     current_language = request.LANGUAGE_CODE
     article = get_object_or_404(Article.objects.select_related('author', 'category').prefetch_related('tags'), slug=slug, status='published', language=current_language)
     
-    # Increment views
-    article.increment_views()
+    # Increment views (not for cache warming requests)
+    if not is_cache_warming(request):
+        article.increment_views()
     
     # Get related articles
     related_articles = Article.objects.filter(
@@ -105,6 +122,7 @@ def article_detail(request, slug):
                 comment.user = request.user
                 comment.name = request.user.get_full_name() or request.user.username
                 comment.email = request.user.email
+            comment.ip_address = get_client_ip(request)
             comment.save()
             messages.success(request, 'Your comment has been submitted and is awaiting moderation.')
             return redirect('articles:article_detail', slug=slug)
@@ -159,9 +177,10 @@ def author_detail(request, slug):
     from accounts.models import Author
     current_language = request.LANGUAGE_CODE
     author = get_object_or_404(Author, slug=slug, is_active=True)
-    articles = Article.objects.filter(author=author, status='published', language=current_language).select_related('category').prefetch_related('tags')
+    # Articles and reviews in one indexed query, ordered and paginated in the database
+    entries = ContentEntry.objects.published().filter(author=author, language=current_language)
     
-    paginator = Paginator(articles, 10)
+    paginator = Paginator(entries, 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
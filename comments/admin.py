@@ -1,13 +1,14 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.contrib.contenttypes.admin import GenericTabularInline
 from .models import Comment
 
 
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ['get_author_name', 'get_content_type', 'content_object', 'is_approved', 'is_spam', 'created_at']
+    list_display = ['get_author_name', 'get_content_type', 'content_object', 'is_approved', 'is_spam', 'spam_score', 'created_at']
     list_filter = ['is_approved', 'is_spam', 'created_at', 'content_type']
     search_fields = ['name', 'email', 'content', 'user__username']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'ip_address', 'spam_score', 'scored_at', 'moderated_at']
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -21,7 +22,7 @@ class CommentAdmin(admin.ModelAdmin):
             'fields': ('content', 'parent')
         }),
         ('Status', {
-            'fields': ('is_approved', 'is_spam')
+            'fields': ('is_approved', 'is_spam', 'moderated_at', 'spam_score', 'scored_at', 'ip_address')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -29,6 +30,11 @@ class CommentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        if {'is_approved', 'is_spam'} & set(form.changed_data):
+            obj.moderated_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
     def get_author_name(self, obj):
         return obj.get_author_name()
     get_author_name.short_description = 'Author'
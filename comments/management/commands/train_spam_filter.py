@@ -0,0 +1,53 @@
+"""
+Management command to train the comment spam model from moderator decisions.
+Comments a moderator marked as spam are spam examples, approved comments are
+ham. Comments the scorer flagged on its own are left out, so the model never
+learns from its own predictions. The model is written to
+COMMENT_SPAM_MODEL_PATH, where workers pick it up.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from comments.models import Comment
+from comments.spam import NaiveBayesModel, score_pending_comments
+
+
+class Command(BaseCommand):
+    help = 'Train the naive-Bayes comment spam model from moderated comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-tokens',
+            type=int,
+            default=20000,
+            help='Vocabulary size kept in the model file (default: 20000)',
+        )
+        parser.add_argument(
+            '--rescore',
+            action='store_true',
+            help='Re-score pending (unapproved, not spam) comments with the new model',
+        )
+
+    def handle(self, *args, **options):
+        model = NaiveBayesModel()
+        examples = Comment.objects.filter(Q(is_spam=True) | Q(is_approved=True), moderated_at__isnull=False)
+        for content, website, is_spam in examples.values_list('content', 'website', 'is_spam').iterator(chunk_size=2000):
+            model.train(f'{content} {website}', is_spam)
+
+        if not model.is_trained:
+            raise CommandError(
+                f'Need at least one moderated spam and one approved comment (found {model.spam_docs} spam, {model.ham_docs} ham)'
+            )
+
+        model.prune(options['max_tokens'])
+        path = str(settings.COMMENT_SPAM_MODEL_PATH)
+        model.save(path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Trained on {model.spam_docs} spam and {model.ham_docs} ham comment(s); saved to {path}'
+        ))
+
+        if options['rescore']:
+            count = Comment.objects.filter(is_approved=False, is_spam=False).update(scored_at=None)
+            scored, flagged = score_pending_comments()
+            self.stdout.write(f'Re-scored {scored} of {count} pending comment(s), {flagged} flagged as spam')
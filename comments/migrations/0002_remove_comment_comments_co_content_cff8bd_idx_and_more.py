@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comments_co_content_cff8bd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['content_type', 'object_id', '-created_at'], name='comment_target_approved_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_remove_comment_comments_co_content_cff8bd_idx_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='Hash of normalized content, for duplicate detection', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='ip_address',
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='scored_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='spam_score',
+            field=models.FloatField(blank=True, help_text='Estimated spam probability (0-1)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('scored_at__isnull', True)), fields=['id'], name='comment_unscored_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['ip_address', 'created_at'], name='comment_ip_created_idx'),
+        ),
+    ]
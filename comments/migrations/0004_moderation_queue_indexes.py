@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_spam_scoring'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', False), ('is_spam', False)), fields=['-id'], name='comment_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_spam', True)), fields=['-id'], name='comment_spam_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:04
+
+from django.db import migrations, models
+from django.db.models import F, Q
+
+
+def mark_moderated(apps, schema_editor):
+    # Only moderators approve comments; spam the scorer never saw was marked by hand
+    Comment = apps.get_model('comments', 'Comment')
+    Comment.objects.filter(
+        Q(is_approved=True) | Q(is_spam=True, scored_at__isnull=True)
+    ).update(moderated_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0004_moderation_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_moderated, migrations.RunPython.noop),
+    ]
@@ -21,6 +21,15 @@ class Comment(models.Model):
     is_approved = models.BooleanField(default=False)
     is_spam = models.BooleanField(default=False)
     
+    # Spam scoring (comments.spam) - filled in off-request by the task worker
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    content_hash = models.CharField(max_length=40, blank=True, db_index=True, help_text='Hash of normalized content, for duplicate detection')
+    spam_score = models.FloatField(null=True, blank=True, help_text='Estimated spam probability (0-1)')
+    scored_at = models.DateTimeField(null=True, blank=True)
+    # Set when a moderator approves the comment or marks it as spam, never by the scorer;
+    # train_spam_filter only learns from these decisions
+    moderated_at = models.DateTimeField(null=True, blank=True)
+    
     # For nested comments
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
     
@@ -32,8 +41,20 @@ class Comment(models.Model):
         verbose_name_plural = 'Comments'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['content_type', 'object_id']),
+            # Approved comments of one article/review, newest first
+            models.Index(
+                fields=['content_type', 'object_id', '-created_at'],
+                name='comment_target_approved_idx',
+                condition=models.Q(is_approved=True),
+            ),
             models.Index(fields=['is_approved']),
+            # Moderation queues in admin_panel, newest first (keyset pagination on id)
+            models.Index(fields=['-id'], name='comment_pending_idx', condition=models.Q(is_approved=False, is_spam=False)),
+            models.Index(fields=['-id'], name='comment_spam_idx', condition=models.Q(is_spam=True)),
+            # The scoring queue: comments the spam pipeline hasn't seen yet
+            models.Index(fields=['id'], name='comment_unscored_idx', condition=models.Q(scored_at__isnull=True)),
+            # Per-IP velocity checks
+            models.Index(fields=['ip_address', 'created_at'], name='comment_ip_created_idx'),
         ]
 
     def __str__(self):
@@ -0,0 +1,237 @@
+"""
+Comment spam scoring for Parsa Journal
+Runs off-request in the task worker: new comments are scored in batches with
+cheap local heuristics (links, duplicate content, known-bad tokens, per-IP
+velocity) plus a small naive-Bayes model trained from moderator decisions,
+and comments over the threshold are flagged as spam.
+"""
+from collections import Counter
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+URL_RE = re.compile(r'(?:https?://|www\.)([^\s/<>"\']+)[^\s<>"\']*', re.IGNORECASE)
+
+
+def normalize(text):
+    """Case- and whitespace-insensitive form used for duplicate detection"""
+    return ' '.join(WORD_RE.findall((text or '').casefold()))
+
+
+def content_hash(text):
+    return hashlib.sha1(normalize(text).encode('utf-8')).hexdigest()
+
+
+def find_links(text):
+    """Hostnames of the links in ``text``"""
+    return [host.lower().removeprefix('www.') for host in URL_RE.findall(text or '')]
+
+
+def tokenize(text):
+    tokens = [word[:30] for word in WORD_RE.findall((text or '').casefold()) if len(word) > 1]
+    tokens.extend(f'host:{host}' for host in find_links(text))
+    return tokens
+
+
+class NaiveBayesModel:
+    """Multinomial naive Bayes over comment tokens, stored as a small JSON file"""
+
+    def __init__(self, spam_counts=None, ham_counts=None, spam_docs=0, ham_docs=0):
+        self.spam_counts = Counter(spam_counts or {})
+        self.ham_counts = Counter(ham_counts or {})
+        self.spam_docs = spam_docs
+        self.ham_docs = ham_docs
+        self._totals = None
+
+    @property
+    def is_trained(self):
+        return self.spam_docs > 0 and self.ham_docs > 0
+
+    def train(self, text, is_spam):
+        tokens = tokenize(text)
+        if is_spam:
+            self.spam_counts.update(tokens)
+            self.spam_docs += 1
+        else:
+            self.ham_counts.update(tokens)
+            self.ham_docs += 1
+        self._totals = None
+
+    def smoothed_totals(self):
+        """(spam, ham) token totals plus the vocabulary size (add-one smoothing), kept until the counts change"""
+        if self._totals is None:
+            vocabulary = len(self.spam_counts.keys() | self.ham_counts.keys())
+            self._totals = (sum(self.spam_counts.values()) + vocabulary, sum(self.ham_counts.values()) + vocabulary)
+        return self._totals
+
+    def spam_probability(self, text):
+        """P(spam | text), or None while the model hasn't seen both classes"""
+        if not self.is_trained:
+            return None
+        spam_total, ham_total = self.smoothed_totals()
+        spam_log = math.log(self.spam_docs / (self.spam_docs + self.ham_docs))
+        ham_log = math.log(self.ham_docs / (self.spam_docs + self.ham_docs))
+        for token in tokenize(text):
+            spam_log += math.log((self.spam_counts[token] + 1) / spam_total)
+            ham_log += math.log((self.ham_counts[token] + 1) / ham_total)
+        # Normalize in log space to avoid underflow on long comments
+        return 1 / (1 + math.exp(max(min(ham_log - spam_log, 700), -700)))
+
+    def prune(self, max_tokens):
+        """Keep only the most frequent tokens so the model file stays small"""
+        combined = self.spam_counts + self.ham_counts
+        keep = {token for token, count in combined.most_common(max_tokens)}
+        self.spam_counts = Counter({t: c for t, c in self.spam_counts.items() if t in keep})
+        self.ham_counts = Counter({t: c for t, c in self.ham_counts.items() if t in keep})
+        self._totals = None
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {
+            'spam_docs': self.spam_docs,
+            'ham_docs': self.ham_docs,
+            'spam_counts': self.spam_counts,
+            'ham_counts': self.ham_counts,
+        }
+        # Write then rename so workers never read a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        model = cls(data['spam_counts'], data['ham_counts'], data['spam_docs'], data['ham_docs'])
+        # Computed here, once per file, rather than by the first comment scored
+        model.smoothed_totals()
+        return model
+
+
+_model_lock = threading.Lock()
+_model_cache = {'mtime': None, 'model': NaiveBayesModel()}
+
+
+def get_model():
+    """The trained model, reloaded when train_spam_filter replaces the file"""
+    path = str(settings.COMMENT_SPAM_MODEL_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return _model_cache['model']
+    with _model_lock:
+        if _model_cache['mtime'] != mtime:
+            try:
+                _model_cache['model'] = NaiveBayesModel.load(path)
+                _model_cache['mtime'] = mtime
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning(f"Could not load spam model from {path}: {exc}")
+        return _model_cache['model']
+
+
+def combine(*probabilities):
+    """Noisy-OR: the comment is spam if any independent signal says so"""
+    ham = 1.0
+    for probability in probabilities:
+        if probability:
+            ham *= 1 - probability
+    return 1 - ham
+
+
+def score_comment(comment, duplicates=0, ip_count=0, model=None):
+    """Spam probability of one comment from its content and the batch-level counts"""
+    text = comment.content or ''
+    links = find_links(text) + find_links(comment.website)
+    words = max(len(WORD_RE.findall(text)), 1)
+
+    link_signal = 0.0
+    if len(links) >= settings.COMMENT_SPAM_MAX_LINKS:
+        link_signal = 0.8
+    elif links and len(links) / words > 0.1:
+        link_signal = 0.6
+
+    lowered = text.casefold()
+    bad_hits = sum(1 for token in settings.COMMENT_SPAM_BAD_TOKENS if token in lowered)
+    bad_signal = min(0.5 * bad_hits, 0.95)
+
+    duplicate_signal = 0.9 if duplicates >= 2 else 0.6 if duplicates == 1 else 0.0
+    velocity_signal = 0.8 if ip_count > settings.COMMENT_SPAM_IP_VELOCITY else 0.0
+
+    model = model or get_model()
+    bayes_signal = model.spam_probability(f'{text} {comment.website or ""}')
+
+    return combine(link_signal, bad_signal, duplicate_signal, velocity_signal, bayes_signal)
+
+
+def score_batch(comments, model=None):
+    """
+    Score and save a batch of comments with two aggregate queries (duplicates
+    and IP velocity) and one bulk UPDATE. Returns how many were flagged.
+    """
+    now = timezone.now()
+    for comment in comments:
+        comment.content_hash = content_hash(comment.content)
+    ids = [comment.id for comment in comments]
+    hashes = {comment.content_hash for comment in comments}
+    ips = {comment.ip_address for comment in comments if comment.ip_address}
+
+    stored_duplicates = dict(
+        Comment.objects.filter(content_hash__in=hashes).exclude(id__in=ids)
+        .values_list('content_hash').annotate(count=Count('id'))
+    )
+    batch_duplicates = Counter(comment.content_hash for comment in comments)
+    since = now - timedelta(seconds=settings.COMMENT_SPAM_IP_WINDOW)
+    ip_counts = dict(
+        Comment.objects.filter(ip_address__in=ips, created_at__gte=since)
+        .values_list('ip_address').annotate(count=Count('id'))
+    ) if ips else {}
+
+    model = model or get_model()
+    flagged = 0
+    for comment in comments:
+        duplicates = stored_duplicates.get(comment.content_hash, 0) + batch_duplicates[comment.content_hash] - 1
+        comment.spam_score = score_comment(
+            comment, duplicates=duplicates, ip_count=ip_counts.get(comment.ip_address, 0), model=model,
+        )
+        comment.scored_at = now
+        # Never override a moderator who already approved the comment
+        if comment.spam_score >= settings.COMMENT_SPAM_THRESHOLD and not comment.is_approved:
+            comment.is_spam = True
+            flagged += 1
+
+    Comment.objects.bulk_update(comments, ['content_hash', 'spam_score', 'scored_at', 'is_spam'])
+    return flagged
+
+
+def score_pending_comments(batch_size=None, max_batches=None):
+    """Score unscored comments, oldest first; returns (scored, flagged)"""
+    batch_size = batch_size or settings.COMMENT_SPAM_BATCH_SIZE
+    fields = ['id', 'content', 'website', 'ip_address', 'is_approved', 'is_spam']
+    scored = flagged = batches = 0
+    model = get_model()
+    while max_batches is None or batches < max_batches:
+        batch = list(Comment.objects.filter(scored_at__isnull=True).order_by('id').only(*fields)[:batch_size])
+        if not batch:
+            break
+        flagged += score_batch(batch, model=model)
+        scored += len(batch)
+        batches += 1
+    if scored:
+        logger.info(f"Scored {scored} comment(s), flagged {flagged} as spam")
+    return scored, flagged
@@ -0,0 +1,14 @@
+"""
+Background tasks for comments (registered with the tasks queue)
+"""
+from django.conf import settings
+
+from tasks.queue import task
+
+from . import spam
+
+
+@task(periodic=settings.COMMENT_SPAM_SCORING_INTERVAL)
+def score_pending_comments():
+    """Score comments the spam pipeline hasn't seen yet and flag the spam"""
+    spam.score_pending_comments(max_batches=settings.COMMENT_SPAM_MAX_BATCHES)
@@ -23,7 +23,9 @@ ROOT_URLCONF = 'config.urls'
 # BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # No admin autodiscovery at boot: admin classes are registered on the custom
+    # site on first use (see admin_panel/registry.py)
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -41,11 +43,16 @@ INSTALLED_APPS = [
     'reviews',
     'newsletter',
     'comments',
+    'tasks',
+    'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    # 'whitenoise.middleware.WhiteNoiseMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # Serves the precompressed static files collectstatic writes
+    'core.cache_policy.CachePolicyMiddleware',  # Sees the final cookies; must be above sessions, CSRF and messages
+    'core.html_optimizer.HtmlOptimizationMiddleware',  # No-op unless HTML_OPTIMIZATION; sees the final HTML
+    'core.middleware.ReplicaPinningMiddleware',  # Must run before anything that reads the database
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # Must be after SessionMiddleware and before CommonMiddleware
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +61,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'admin_panel.middleware.AdminSecurityMiddleware',  # Custom admin security middleware
+    'core.template_profiler.TemplateProfilerMiddleware',  # No-op unless TEMPLATE_PROFILING
 ]
 
 TEMPLATES = [
@@ -96,6 +104,23 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated database URLs, one alias per replica.
+# Public page reads are spread over them; writes, admin and read-your-own-writes
+# requests stay on 'default'. To try it locally with SQLite, copy db.sqlite3 and set
+#   DATABASE_REPLICA_URLS=sqlite:///db-replica1.sqlite3,sqlite:///db-replica2.sqlite3
+REPLICA_DATABASES = []
+for _index, _url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    _alias = f'replica{_index}'
+    DATABASES[_alias] = env.db_url_config(_url)
+    DATABASES[_alias]['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASES.append(_alias)
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)  # read-your-own-writes window
+REPLICA_HEALTH_CHECK_INTERVAL = 30  # seconds a failed replica stays out of rotation
+# Apps/models that are always read from the primary
+REPLICA_PRIMARY_ONLY = ['sessions', 'tasks', 'auth', 'accounts.User']
+
 # DATABASES = {
 #     'default': dj_database_url.config(
 #         default=os.environ.get('DATABASE_URL')
@@ -122,6 +147,22 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored under their content hash (see core/storage.py), so media
+# URLs never change content and nginx can cache them as immutable.
+# `manage.py rehash_media` moves files uploaded before this to hashed names.
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    # collectstatic writes content-hashed copies (css/style.3f2a9b1c4d5e.css)
+    # with .gz and .br siblings at maximum compression plus staticfiles.json,
+    # which {% static %} reads; WhiteNoise or nginx (gzip_static) serve the
+    # precompressed files, so nothing is compressed per request
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email Configuration
@@ -134,6 +175,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 # DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@parsajournal.ir')
 
+# Cache: set CACHE_URL (e.g. redis://redis:6379/1) in production so rate limits,
+# feeds and other cached output are shared by all gunicorn workers.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 # # Cache Configuration (Redis recommended for production; fallback to LocMem)
 # CACHES = {
 #     'default': {
@@ -183,5 +230,137 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # }
 
 
+# HTML post-processing (see core/html_optimizer.py): inline per-view critical
+# CSS built by `manage.py build_critical_css`, load the full stylesheets
+# without blocking, and minify the markup. The transformed <head> is cached on
+# a digest of its content, so each page's head is processed once.
+HTML_OPTIMIZATION = env.bool('HTML_OPTIMIZATION', default=not DEBUG)
+HTML_OPTIMIZATION_CACHE_TIMEOUT = 60 * 10
+CRITICAL_CSS_DIR = env('CRITICAL_CSS_DIR', default=str(BASE_DIR / 'data' / 'critical_css'))
+CRITICAL_CSS_STYLESHEETS = ['css/style.css', 'css/dark-theme.css']
+# How much of the <body> counts as above the fold when picking rules
+CRITICAL_CSS_FOLD_BYTES = 16 * 1024
+
+# HTTP caching (see core/cache_policy.py). CACHE_POLICY_VIEWS gives the
+# policy of each public page by URL name. Anonymous requests get public
+# responses with max_age for browsers and s_maxage for the nginx proxy cache.
+# nginx may serve a stale copy for stale_while_revalidate seconds while it
+# refetches, and for stale_if_error seconds while Django is failing.
+# Cache hits never reach Django, so view counts only see misses.
+CACHE_POLICIES = {
+    'detail': {'max_age': 60, 's_maxage': 60 * 10, 'stale_while_revalidate': 60 * 5, 'stale_if_error': 60 * 60 * 24},
+    'listing': {'max_age': 60, 's_maxage': 60 * 2, 'stale_while_revalidate': 60, 'stale_if_error': 60 * 60 * 24},
+    'static_page': {'max_age': 60 * 10, 's_maxage': 60 * 60, 'stale_while_revalidate': 60 * 10, 'stale_if_error': 60 * 60 * 24},
+}
+CACHE_POLICY_VIEWS = {
+    'core:home': 'listing',
+    'core:about': 'static_page',
+    'articles:article_list': 'listing',
+    'articles:category_detail': 'listing',
+    'articles:tag_detail': 'listing',
+    'articles:author_detail': 'listing',
+    'articles:article_detail': 'detail',
+    'reviews:book_list': 'listing',
+    'reviews:book_category_detail': 'listing',
+    'reviews:book_detail': 'detail',
+    'reviews:movie_list': 'listing',
+    'reviews:movie_category_detail': 'listing',
+    'reviews:movie_detail': 'detail',
+}
+# Where the worker sends PURGE requests for the pages a content change affects
+# (nginx with ngx_cache_purge, e.g. 'http://nginx'); empty only logs the lists
+CACHE_PURGE_URL = env('CACHE_PURGE_URL', default='')
+CACHE_PURGE_TIMEOUT = 5
+
+# Template render profiler (see core/template_profiler.py): times templates,
+# blocks, includes, {% url %} and core_extras filters per request, logs the
+# heaviest ones (WARNING above the slow threshold) and shows a panel to
+# superusers. Adds overhead to every render - keep it off in production.
+TEMPLATE_PROFILING = env.bool('TEMPLATE_PROFILING', default=False)
+TEMPLATE_PROFILING_SLOW_MS = 100
+TEMPLATE_PROFILING_PANEL_ROWS = 40
+
 # Pagination
 PAGINATION_PER_PAGE = 10
+
+# Links to these hosts are treated as internal by core.content_pipeline
+# (external links get rel="noopener noreferrer nofollow" target="_blank")
+CONTENT_INTERNAL_HOSTS = ['parsajournal.ir']
+
+# Background tasks (see tasks/queue.py and `manage.py run_worker`)
+# When eager, .delay() runs the task inline - handy for local development.
+TASKS_ALWAYS_EAGER = env.bool('TASKS_ALWAYS_EAGER', default=False)
+
+# RSS/Atom feeds (see core/feeds.py). Generated XML is cached until content
+# changes; FEED_MAX_AGE is the Cache-Control max-age sent to pollers.
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_MAX_AGE = 60 * 15
+
+# Sitemap XML, home page sections and sidebar aggregates are also cached until
+# content changes (see core/caching.py); the listing timeout bounds how stale
+# their view counts get. `manage.py warm_cache` fills them after a deploy.
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+LISTING_CACHE_TIMEOUT = 60 * 10
+
+# Facet counts of the book/movie lists (see reviews/facets.py), cached per
+# language and selected filters; they only change with content, so the
+# content version does the invalidating
+FACET_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Search autocomplete (see core/autocomplete.py): a memory-mapped index file
+# shared by all workers on a host, rebuilt by the task worker this many
+# seconds after content changes (bursts of changes share one rebuild)
+AUTOCOMPLETE_INDEX_PATH = env('AUTOCOMPLETE_INDEX_PATH', default=str(BASE_DIR / 'data' / 'autocomplete.idx'))
+AUTOCOMPLETE_REBUILD_DELAY = 10
+AUTOCOMPLETE_MAX_RESULTS = 8
+AUTOCOMPLETE_MAX_AGE = 60
+
+# Site search (see core/search.py): ranked matches are cached per language and
+# normalized query until content changes and shown PAGE_SIZE at a time;
+# per-query counts are buffered in each worker and written every
+# FLUSH_INTERVAL seconds or MAX_PENDING queries
+SEARCH_CACHE_TIMEOUT = 60 * 60
+SEARCH_PAGE_SIZE = 20
+SEARCH_STATS_FLUSH_INTERVAL = 60
+SEARCH_STATS_MAX_PENDING = 500
+
+# Read-only JSON API (see api/views.py)
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_MAX_AGE = 60
+
+# Streaming CSV/JSONL exports (see core/exports.py): rows fetched per cursor
+# round trip and encoded per response chunk
+EXPORT_CHUNK_SIZE = 2000
+
+# Rate limiting (see core/ratelimit.py): '<requests>/<window>', window in s/m/h/d
+# with an optional multiplier, e.g. '5/15m'. Counters live in RATELIMIT_CACHE.
+RATELIMIT_ENABLED = env.bool('RATELIMIT_ENABLED', default=True)
+RATELIMIT_CACHE = 'default'
+# Off by default (REMOTE_ADDR). Set to e.g. HTTP_X_REAL_IP only when every request
+# comes through a proxy that overwrites the header (nginx from $remote_addr)
+RATELIMIT_CLIENT_IP_HEADER = env('RATELIMIT_CLIENT_IP_HEADER', default='')
+RATELIMIT_POLICIES = {
+    'login': '5/15m',
+    'comment': '5/10m',
+    'contact': '3/h',
+    'newsletter': '5/h',
+}
+
+# Comment spam scoring (see comments/spam.py). The worker scores new comments
+# every COMMENT_SPAM_SCORING_INTERVAL seconds; `manage.py train_spam_filter`
+# retrains the naive-Bayes model from moderated comments.
+COMMENT_SPAM_MODEL_PATH = env('COMMENT_SPAM_MODEL_PATH', default=str(BASE_DIR / 'data' / 'comment_spam_model.json'))
+COMMENT_SPAM_SCORING_INTERVAL = 30
+COMMENT_SPAM_BATCH_SIZE = 200
+COMMENT_SPAM_MAX_BATCHES = 50  # per task run
+COMMENT_SPAM_THRESHOLD = 0.9
+COMMENT_SPAM_MAX_LINKS = 3
+COMMENT_SPAM_IP_WINDOW = 60 * 60
+COMMENT_SPAM_IP_VELOCITY = 5  # comments per IP within the window
+COMMENT_SPAM_BAD_TOKENS = [
+    'viagra', 'cialis', 'casino', 'crypto giveaway', 'buy followers', 'payday loan', 'forex signals',
+    'seo services', 'bitcoin doubler', 'click here', 'work from home',
+    'کازینو', 'شرط بندی', 'شرط‌بندی',
+]
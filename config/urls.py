@@ -1,13 +1,13 @@
 """
 URL configuration for parsajournal.ir project.
 """
-from django.contrib.sitemaps.views import sitemap
 from django.urls import path, include, register_converter
 from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from django.views.i18n import set_language
-from core.sitemaps import ArticleSitemap, CategorySitemap, BookReviewSitemap, MovieReviewSitemap, StaticViewSitemap
+from core.views import csrf_token
+from core.sitemaps import ArticleSitemap, CategorySitemap, BookReviewSitemap, MovieReviewSitemap, StaticViewSitemap, cached_sitemap
 from .converters import UnicodeSlugConverter
 
 # Register custom path converter
@@ -27,9 +27,13 @@ urlpatterns = [
     # Custom Admin Panel (replaces Django default admin)
     path('admin/', include('admin_panel.urls')),
     # Sitemap
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemap.xml', cached_sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    # Read-only JSON content API (language is a ?lang= filter, not a URL prefix)
+    path('api/v1/', include('api.urls')),
     # Language switcher
     path('i18n/setlang/', set_language, name='set_language'),
+    # CSRF token for forms on proxy-cached pages (see core/cache_policy.py)
+    path('csrf/', csrf_token, name='csrf_token'),
 ]
 
 # Localized URLs
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SiteSettings, ContactMessage
+from .models import SiteSettings, ContactMessage, SearchQueryStat
 
 
 class SiteSettingsAdmin(admin.ModelAdmin):
@@ -30,3 +30,14 @@ class ContactMessageAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+class SearchQueryStatAdmin(admin.ModelAdmin):
+    list_display = ['query', 'language', 'searches', 'cache_hits', 'result_count', 'last_searched_at']
+    list_filter = ['language']
+    search_fields = ['query']
+    readonly_fields = ['language', 'query', 'searches', 'cache_hits', 'result_count', 'last_searched_at']
+
+    def has_add_permission(self, request):
+        # Rows are written by core.search
+        return False
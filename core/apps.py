@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        if settings.TEMPLATE_PROFILING:
+            from .template_profiler import install
+            install()
+        from .cache_policy import connect_purge_signals
+        from .content_index import connect_index_signals
+        from .signals import connect_content_signals
+        connect_content_signals()
+        connect_index_signals()
+        # After the index handlers: purge lists are read from the updated index
+        connect_purge_signals()
@@ -0,0 +1,277 @@
+"""
+Prefix autocomplete for the search box
+Titles, book titles/authors, movie titles/directors and tags of published
+content are normalized into sorted keys (one per word start, so "potter"
+finds "Harry Potter") and written to a compact binary file:
+
+    header | entries | key offsets | key -> entry ids | string blob
+
+Workers memory-map the file, so it is shared through the page cache instead
+of being built per process, and answer a lookup with a binary search over the
+keys. The file is rebuilt in the background (debounced) when content changes
+and atomically replaced; readers notice the new mtime and remap it.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+import bisect
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.urls import reverse
+from django.utils import translation
+
+from articles.models import Article, Tag
+from reviews.models import BookReview, MovieReview
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PJAC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIIIIIII')  # magic, version, entries, keys, and the offsets of the four sections
+ENTRY = struct.Struct('<IIIIII')  # label offset/length, url offset/length, kind, weight
+OFFSET = struct.Struct('<I')
+
+KINDS = ['article', 'book', 'movie', 'tag']
+
+# Word starts indexed per text, and the longest key kept
+MAX_WORD_STARTS = 8
+MAX_KEY_LENGTH = 64
+
+_CHARACTER_MAP = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ك': 'ک', 'ۀ': 'ه', 'ة': 'ه',
+    '‌': ' ',  # zero-width non-joiner
+    **{digit: str(value) for value, digit in enumerate('۰۱۲۳۴۵۶۷۸۹')},
+    **{digit: str(value) for value, digit in enumerate('٠١٢٣٤٥٦٧٨٩')},
+})
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """Case-, width- and Arabic/Persian-letter-insensitive form of ``text``, words separated by single spaces"""
+    text = unicodedata.normalize('NFKC', text or '').casefold().translate(_CHARACTER_MAP)
+    return _NON_WORD.sub(' ', text).strip()
+
+
+def _keys(text):
+    words = normalize(text).split()
+    for start in range(min(len(words), MAX_WORD_STARTS)):
+        yield ' '.join(words[start:])[:MAX_KEY_LENGTH]
+
+
+# -- building ---------------------------------------------------------------
+
+@dataclass
+class Suggestion:
+    kind: str
+    label: str
+    url: str
+    weight: int
+    texts: tuple
+
+
+def _suggestions(language):
+    """Every suggestion for ``language`` with the texts it should be found by"""
+    with translation.override(language):
+        articles = Article.objects.filter(status='published', language=language).values_list('title', 'slug', 'views')
+        for title, slug, views in articles.iterator():
+            url = reverse('articles:article_detail', kwargs={'slug': slug})
+            yield Suggestion('article', title, url, views, (title,))
+
+        books = BookReview.objects.filter(is_published=True, language=language).values_list(
+            'title', 'slug', 'views', 'book_title', 'book_author',
+        )
+        for title, slug, views, book_title, book_author in books.iterator():
+            url = reverse('reviews:book_detail', kwargs={'slug': slug})
+            yield Suggestion('book', title, url, views, (title, book_title, book_author))
+
+        movies = MovieReview.objects.filter(is_published=True, language=language).values_list(
+            'title', 'slug', 'views', 'movie_title', 'director',
+        )
+        for title, slug, views, movie_title, director in movies.iterator():
+            url = reverse('reviews:movie_detail', kwargs={'slug': slug})
+            yield Suggestion('movie', title, url, views, (title, movie_title, director))
+
+        published = Q(articles__status='published', articles__language=language)
+        tags = Tag.objects.filter(published).annotate(weight=Sum('articles__views', filter=published)).values_list(
+            'name', 'slug', 'weight',
+        ).distinct()
+        for name, slug, weight in tags:
+            url = reverse('articles:tag_detail', kwargs={'slug': slug})
+            yield Suggestion('tag', name, url, weight or 0, (name,))
+
+
+def build_index(path=None, languages=None):
+    """Write the index file for ``languages`` (default: all); returns (suggestions, keys)"""
+    path = str(path or settings.AUTOCOMPLETE_INDEX_PATH)
+    languages = languages or [code for code, name in settings.LANGUAGES]
+
+    blob = bytearray()
+    strings = {}
+
+    def add_string(value):
+        encoded = value.encode('utf-8')
+        if encoded not in strings:
+            strings[encoded] = len(blob)
+            blob.extend(encoded)
+        return strings[encoded], len(encoded)
+
+    entries = []
+    keys = []
+    for language in languages:
+        for suggestion in _suggestions(language):
+            entry_id = len(entries)
+            entries.append((*add_string(suggestion.label), *add_string(suggestion.url),
+                            KINDS.index(suggestion.kind), min(suggestion.weight, 2 ** 32 - 1)))
+            entry_keys = {key for text in suggestion.texts for key in _keys(text)}
+            # Keys are prefixed with the language so each language is a contiguous range
+            keys.extend(((f'{language}\x00{key}').encode('utf-8'), entry_id) for key in entry_keys)
+    # UTF-8 byte order is code point order, so lookups can compare raw bytes
+    keys.sort()
+
+    key_offsets = bytearray()
+    key_blob = bytearray()
+    for key, entry_id in keys:
+        key_offsets.extend(OFFSET.pack(len(key_blob)))
+        key_blob.extend(key)
+    key_offsets.extend(OFFSET.pack(len(key_blob)))
+    key_entries = b''.join(OFFSET.pack(entry_id) for key, entry_id in keys)
+
+    entries_offset = HEADER.size
+    key_offsets_offset = entries_offset + ENTRY.size * len(entries)
+    key_entries_offset = key_offsets_offset + len(key_offsets)
+    blob_offset = key_entries_offset + len(key_entries)
+    # The string blob holds the keys, then labels and URLs, so entry offsets are shifted past the keys
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), len(keys),
+                         entries_offset, key_offsets_offset, key_entries_offset, blob_offset)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so workers never map a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(header)
+        for label_offset, label_length, url_offset, url_length, kind, weight in entries:
+            f.write(ENTRY.pack(label_offset + len(key_blob), label_length, url_offset + len(key_blob), url_length, kind, weight))
+        f.write(key_offsets)
+        f.write(key_entries)
+        f.write(key_blob)
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return len(entries), len(keys)
+
+
+# -- lookups ----------------------------------------------------------------
+
+class AutocompleteIndex:
+    """Read-only view of a memory-mapped index file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.entry_count, self.key_count, self.entries_offset,
+         self.key_offsets_offset, self.key_entries_offset, self.blob_offset) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path} is not an autocomplete index (version {FORMAT_VERSION})')
+
+    def key(self, index):
+        start, = OFFSET.unpack_from(self.map, self.key_offsets_offset + OFFSET.size * index)
+        end, = OFFSET.unpack_from(self.map, self.key_offsets_offset + OFFSET.size * (index + 1))
+        return self.map[self.blob_offset + start:self.blob_offset + end]
+
+    def entry(self, entry_id):
+        label_offset, label_length, url_offset, url_length, kind, weight = ENTRY.unpack_from(
+            self.map, self.entries_offset + ENTRY.size * entry_id,
+        )
+        label_start = self.blob_offset + label_offset
+        url_start = self.blob_offset + url_offset
+        return {
+            'title': self.map[label_start:label_start + label_length].decode('utf-8'),
+            'type': KINDS[kind],
+            'url': self.map[url_start:url_start + url_length].decode('utf-8'),
+            'weight': weight,
+        }
+
+    def search(self, language, query, limit=8, scan_limit=256):
+        """Suggestions whose text has a word starting with ``query``, most viewed first"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        prefix = f'{language}\x00{prefix}'.encode('utf-8')
+        position = bisect.bisect_left(_KeyView(self), prefix)
+
+        # Matching keys are contiguous; rank the first scan_limit of them by weight
+        candidates = {}
+        for index in range(position, min(position + scan_limit, self.key_count)):
+            if not self.key(index).startswith(prefix):
+                break
+            entry_id, = OFFSET.unpack_from(self.map, self.key_entries_offset + OFFSET.size * index)
+            if entry_id not in candidates:
+                candidates[entry_id] = self.entry(entry_id)
+        results = sorted(candidates.values(), key=lambda entry: (-entry['weight'], entry['title']))[:limit]
+        for entry in results:
+            del entry['weight']
+        return results
+
+
+class _KeyView:
+    """Sequence of an index's keys, for bisect"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return self.index.key_count
+
+    def __getitem__(self, position):
+        return self.index.key(position)
+
+
+_index_lock = threading.Lock()
+_index_cache = {'mtime': None, 'checked': 0.0, 'index': None}
+
+
+def get_index():
+    """The mapped index, remapped when a rebuild replaces the file (checked at most once a second)"""
+    now = time.monotonic()
+    if now - _index_cache['checked'] < 1 and _index_cache['index'] is not None:
+        return _index_cache['index']
+    path = str(settings.AUTOCOMPLETE_INDEX_PATH)
+    with _index_lock:
+        _index_cache['checked'] = now
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        if _index_cache['mtime'] != mtime:
+            try:
+                _index_cache['index'] = AutocompleteIndex(path)
+                _index_cache['mtime'] = mtime
+            except (OSError, ValueError, struct.error) as exc:
+                logger.warning(f"Could not load autocomplete index from {path}: {exc}")
+        return _index_cache['index']
+
+
+def suggest(language, query, limit=8):
+    index = get_index()
+    if index is None:
+        schedule_rebuild()
+        return []
+    return index.search(language, query, limit=limit)
+
+
+def schedule_rebuild():
+    """Queue one index rebuild after AUTOCOMPLETE_REBUILD_DELAY, unless one is already queued"""
+    from tasks.models import Task
+    from .tasks import rebuild_autocomplete_index
+
+    pending = Task.objects.filter(name=rebuild_autocomplete_index.name, status=Task.STATUS_QUEUED).exists()
+    if not pending:
+        rebuild_autocomplete_index.schedule(timedelta(seconds=settings.AUTOCOMPLETE_REBUILD_DELAY))
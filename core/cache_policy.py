@@ -0,0 +1,229 @@
+"""
+HTTP caching policy for Parsa Journal
+Public pages are listed by URL name in settings.CACHE_POLICY_VIEWS, each
+naming a policy in settings.CACHE_POLICIES. CachePolicyMiddleware sets their
+Cache-Control:
+
+- anonymous requests without a session or message cookie get a shared
+  response: ``public`` with max-age for browsers, s-maxage for the nginx
+  proxy cache, and stale-while-revalidate / stale-if-error so nginx serves
+  the old copy while it refetches or while Django is down;
+- everyone else (signed-in users, pending flash messages) gets ``private``.
+
+Views that set their own Cache-Control (feeds, the API, autocomplete) are
+left alone.
+
+The language of these views comes from the URL prefix (i18n_patterns without
+a prefix for the default language), so Accept-Language is dropped from Vary
+and only Cookie remains.
+
+A shared page can't carry a per-visitor CSRF token. Its token values are
+blanked and Django's CSRF cookie is dropped from the response. base.html
+fetches a token from the ``csrf`` URL when such a form is submitted.
+
+Saving, publishing or deleting content queues the paths of the pages that
+show it. The purge_proxy_cache task sends them as PURGE requests to
+CACHE_PURGE_URL (nginx with ngx_cache_purge, see nginx.conf).
+`manage.py cache_purge_list` prints the same lists on demand.
+"""
+from dataclasses import dataclass
+from functools import partial
+import logging
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.urls import reverse
+from django.utils import translation
+from django.utils.cache import patch_cache_control
+
+from .content_index import INDEXED_TYPES, VIEWS_ONLY, type_for_model
+from .html_optimizer import CSRF_TOKEN_RE
+from .models import ContentEntry
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    max_age: int  # browsers
+    s_maxage: int  # shared caches (nginx)
+    stale_while_revalidate: int = 0
+    stale_if_error: int = 0
+
+
+def get_policy(view_name):
+    """The CachePolicy for ``view_name``, or None if the view is not listed"""
+    name = settings.CACHE_POLICY_VIEWS.get(view_name)
+    if name is None:
+        return None
+    return CachePolicy(**settings.CACHE_POLICIES[name])
+
+
+def is_shareable(request, response):
+    """Whether the response is the same for every visitor without a session"""
+    if settings.SESSION_COOKIE_NAME in request.COOKIES or CookieStorage.cookie_name in request.COOKIES:
+        return False
+    # A new session or messages cookie means the page was personalized after all
+    return set(response.cookies) <= {settings.CSRF_COOKIE_NAME}
+
+
+def _blank_csrf_token(match):
+    return match.group(1) + match.group(3)
+
+
+def _patch_vary(response):
+    # The URL prefix picks the language, so only Cookie changes the response
+    vary = [header.strip() for header in response.get('Vary', '').split(',') if header.strip()]
+    vary = [header for header in vary if header.lower() != 'accept-language']
+    if not any(header.lower() == 'cookie' for header in vary):
+        vary.append('Cookie')
+    response['Vary'] = ', '.join(vary)
+
+
+class CachePolicyMiddleware:
+    """Apply the CACHE_POLICY_VIEWS policy to successful GET responses (see module docstring)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if (
+            match is None
+            or request.method not in SAFE_METHODS
+            or response.status_code != 200
+            or response.streaming
+            or response.has_header('Cache-Control')
+        ):
+            return response
+        policy = get_policy(match.view_name)
+        if policy is None:
+            return response
+
+        _patch_vary(response)
+        if not is_shareable(request, response):
+            patch_cache_control(response, private=True, max_age=0)
+            return response
+
+        if settings.CSRF_COOKIE_NAME in response.cookies:
+            del response.cookies[settings.CSRF_COOKIE_NAME]
+        if response.get('Content-Type', '').startswith('text/html'):
+            html = response.content.decode(response.charset)
+            response.content = CSRF_TOKEN_RE.sub(_blank_csrf_token, html).encode(response.charset)
+            if response.has_header('Content-Length'):
+                response['Content-Length'] = str(len(response.content))
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=policy.max_age,
+            s_maxage=policy.s_maxage,
+            stale_while_revalidate=policy.stale_while_revalidate,
+            stale_if_error=policy.stale_if_error,
+        )
+        return response
+
+
+# -- purge lists --------------------------------------------------------------
+
+# Pages of each content type that list every published item, besides the home page
+TYPE_URL_NAMES = {
+    'article': ('articles:article_list', 'articles:article_feed', 'articles:article_atom_feed'),
+    'book': ('reviews:book_list', 'reviews:book_feed', 'reviews:book_atom_feed'),
+    'movie': ('reviews:movie_list', 'reviews:movie_feed', 'reviews:movie_atom_feed'),
+}
+
+
+def entry_paths(entry, tag_slugs=(), detail_only=False):
+    """
+    Paths of the pages that show ``entry`` (a ContentEntry) in its language:
+    its detail page and, unless ``detail_only``, the home page, the type's
+    list and feeds, and its category, author and ``tag_slugs`` pages. Empty
+    for unpublished entries. Paginated and filtered variants (?page=, facets)
+    are not listed; they expire after their policy's s-maxage.
+    """
+    if entry is None or entry.status != 'published':
+        return set()
+    with translation.override(entry.language):
+        paths = {entry.get_absolute_url()}
+        if detail_only:
+            return paths
+        paths.add(reverse('core:home'))
+        paths.update(reverse(name) for name in TYPE_URL_NAMES[entry.content_type])
+        if entry.category_slug:
+            paths.add(entry.get_category_url())
+        paths.add(reverse('articles:author_detail', kwargs={'slug': entry.author.slug}))
+        paths.update(reverse('articles:tag_detail', kwargs={'slug': slug}) for slug in tag_slugs)
+    return paths
+
+
+def content_paths(content_type, ids, detail_only=False):
+    """Paths of the pages that show the given objects of one indexed type, in two or three queries"""
+    entries = ContentEntry.objects.filter(content_type=content_type, object_id__in=ids).select_related('author')
+    tag_slugs = {}
+    if content_type == 'article' and not detail_only:
+        through = INDEXED_TYPES['article'].model.tags.through
+        for article_id, slug in through.objects.filter(article_id__in=ids).values_list('article_id', 'tag__slug'):
+            tag_slugs.setdefault(article_id, []).append(slug)
+    paths = set()
+    for entry in entries:
+        paths |= entry_paths(entry, tag_slugs.get(entry.object_id, ()), detail_only)
+    return paths
+
+
+def purge(paths):
+    """Send ``paths`` to the proxy cache's purge endpoint once the current transaction commits"""
+    if not paths:
+        return
+    paths = sorted(paths)
+    logger.info(f"Cache purge list: {' '.join(paths)}")
+    if settings.CACHE_PURGE_URL:
+        from .tasks import purge_proxy_cache
+        transaction.on_commit(partial(purge_proxy_cache.delay, paths))
+
+
+# -- signal handlers ------------------------------------------------------
+
+def _current_paths(sender, pk):
+    return content_paths(type_for_model(sender), [pk])
+
+
+def content_pre_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or instance.pk is None or (update_fields and set(update_fields) <= VIEWS_ONLY):
+        return
+    # The index still holds the old slug, category and status
+    instance._cache_purge_paths = _current_paths(sender, instance.pk)
+
+
+def content_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and set(update_fields) <= VIEWS_ONLY):
+        return
+    # Connected after core.content_index's handler, so the index is current here
+    before = instance.__dict__.pop('_cache_purge_paths', set())
+    purge(before | _current_paths(sender, instance.pk))
+
+
+def content_pre_delete(sender, instance, **kwargs):
+    purge(_current_paths(sender, instance.pk))
+
+
+def article_tags_changed(sender, instance, action, reverse, **kwargs):
+    # Before a removal and after an addition the article's tag pages include every one affected;
+    # tag.articles changes (reverse) are left to s-maxage
+    if not reverse and action in ('pre_remove', 'pre_clear', 'post_add'):
+        purge(_current_paths(type(instance), instance.pk))
+
+
+def connect_purge_signals():
+    """Called from CoreConfig.ready(), after connect_index_signals()"""
+    for content_type, indexed in INDEXED_TYPES.items():
+        uid = f'cache_purge_{content_type}'
+        pre_save.connect(content_pre_save, sender=indexed.model, dispatch_uid=f'{uid}_pre_save')
+        post_save.connect(content_saved, sender=indexed.model, dispatch_uid=f'{uid}_saved')
+        pre_delete.connect(content_pre_delete, sender=indexed.model, dispatch_uid=f'{uid}_pre_delete')
+    article_tags = INDEXED_TYPES['article'].model.tags.through
+    m2m_changed.connect(article_tags_changed, sender=article_tags, dispatch_uid='cache_purge_article_tags')
@@ -0,0 +1,57 @@
+"""
+Shared cache helpers for Parsa Journal
+Cached public output (feeds, the sitemap, home page sections, sidebar
+aggregates, ...) is keyed on a global content version that is bumped whenever
+published content changes, so invalidation is a single cache write instead of
+tracking and deleting every derived key.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'content_version'
+
+
+def get_content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a lost/evicted counter never reuses an old version
+        cache.add(CONTENT_VERSION_KEY, int(time.time()), None)
+        version = cache.get(CONTENT_VERSION_KEY, 0)
+    return version
+
+
+def bump_content_version():
+    """Invalidate every cache entry keyed on the content version"""
+    try:
+        return cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        version = int(time.time())
+        cache.set(CONTENT_VERSION_KEY, version, None)
+        return version
+
+
+def make_cache_key(prefix, *parts):
+    """Versioned cache key; parts are hashed so unicode slugs and long queries stay key-safe"""
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return f'{prefix}:{get_content_version()}:{digest}'
+
+
+def cached(prefix, *parts, compute, timeout):
+    """Versioned cache entry for ``parts``, computed and stored on a miss"""
+    key = make_cache_key(prefix, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+# WSGI environ flag set by `manage.py warm_cache`. It is not an HTTP_* key, so
+# a real client can't send it; views skip side effects such as view counting.
+CACHE_WARMING_ENVIRON_KEY = 'parsajournal.cache_warming'
+
+
+def is_cache_warming(request):
+    return bool(request.META.get(CACHE_WARMING_ENVIRON_KEY))
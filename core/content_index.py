@@ -0,0 +1,190 @@
+"""
+Maintenance of the cross-type ContentEntry index
+Every article, book review and movie review has one ContentEntry row. Saves
+and deletes keep it current through signals; bulk paths that bypass signals
+(queryset.update(), bulk_create) call index_objects() with the affected ids,
+and `manage.py rebuild_content_index` rebuilds it from scratch. Rows are
+built from values() queries and written with one upsert per batch.
+"""
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_delete, post_save
+
+from .db_router import use_primary
+from .models import ContentEntry
+
+
+@dataclass(frozen=True)
+class IndexedType:
+    model_label: str
+    category_label: str
+    image_field: str
+    url_name: str
+    category_url_name: str
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def category_model(self):
+        return apps.get_model(self.category_label)
+
+
+INDEXED_TYPES = {
+    'article': IndexedType('articles.Article', 'articles.Category', 'featured_image',
+                           'articles:article_detail', 'articles:category_detail'),
+    'book': IndexedType('reviews.BookReview', 'reviews.BookCategory', 'cover_image',
+                        'reviews:book_detail', 'reviews:book_category_detail'),
+    'movie': IndexedType('reviews.MovieReview', 'reviews.MovieCategory', 'poster_image',
+                         'reviews:movie_detail', 'reviews:movie_category_detail'),
+}
+
+ENTRY_FIELDS = [
+    'language', 'title', 'slug', 'excerpt', 'image', 'image_alt', 'author_id', 'category_id', 'category_name',
+    'category_slug', 'status', 'is_featured', 'views', 'published_at', 'created_at',
+]
+
+# Saves that only touch these fields are mirrored with a single-column UPDATE
+VIEWS_ONLY = {'views'}
+
+
+def type_for_model(model):
+    for content_type, indexed in INDEXED_TYPES.items():
+        if indexed.model_label == model._meta.label:
+            return content_type
+    return None
+
+
+def _source_values(content_type, queryset):
+    """values() rows shaped like ContentEntry fields"""
+    indexed = INDEXED_TYPES[content_type]
+    if content_type == 'article':
+        status = F('status')
+    else:
+        status = Case(When(is_published=True, then=Value('published')), default=Value('draft'))
+    return queryset.order_by('pk').values(
+        'pk', 'language', 'title', 'slug', 'excerpt', 'image_alt', 'author_id', 'category_id', 'is_featured',
+        'views', 'published_at', 'created_at',
+        entry_image=F(indexed.image_field),
+        entry_category_name=F('category__name'),
+        entry_category_slug=F('category__slug'),
+        entry_status=status,
+    )
+
+
+def _build_entry(content_type, row):
+    return ContentEntry(
+        content_type=content_type,
+        object_id=row['pk'],
+        language=row['language'],
+        title=row['title'],
+        slug=row['slug'],
+        excerpt=row['excerpt'],
+        image=row['entry_image'] or '',
+        image_alt=row['image_alt'],
+        author_id=row['author_id'],
+        category_id=row['category_id'],
+        category_name=row['entry_category_name'] or '',
+        category_slug=row['entry_category_slug'] or '',
+        status=row['entry_status'],
+        is_featured=row['is_featured'],
+        views=row['views'],
+        published_at=row['published_at'],
+        created_at=row['created_at'],
+    )
+
+
+def _upsert(entries):
+    ContentEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['content_type', 'object_id'],
+        update_fields=ENTRY_FIELDS,
+    )
+
+
+def index_objects(content_type, ids=None, batch_size=1000):
+    """
+    (Re)index the given objects of one type, or all of them when ``ids`` is
+    None, dropping entries whose object no longer exists. Returns the number
+    of entries written.
+    """
+    model = INDEXED_TYPES[content_type].model
+    queryset = model.objects.all() if ids is None else model.objects.filter(pk__in=ids)
+    written = 0
+    found = set()
+    batch = []
+    # Read the source rows from the primary: a replica may not have the write yet
+    with use_primary():
+        for row in _source_values(content_type, queryset).iterator(chunk_size=batch_size):
+            batch.append(_build_entry(content_type, row))
+            if ids is not None:
+                found.add(row['pk'])
+            if len(batch) >= batch_size:
+                _upsert(batch)
+                written += len(batch)
+                batch = []
+    if batch:
+        _upsert(batch)
+        written += len(batch)
+
+    if ids is None:
+        ContentEntry.objects.filter(content_type=content_type).exclude(object_id__in=model.objects.values('pk')).delete()
+    elif set(ids) - found:
+        remove_objects(content_type, set(ids) - found)
+    return written
+
+
+def remove_objects(content_type, ids):
+    ContentEntry.objects.filter(content_type=content_type, object_id__in=ids).delete()
+
+
+# -- signal handlers ------------------------------------------------------
+
+def content_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    content_type = type_for_model(sender)
+    if update_fields and set(update_fields) <= VIEWS_ONLY:
+        ContentEntry.objects.filter(content_type=content_type, object_id=instance.pk).update(views=instance.views)
+        return
+    index_objects(content_type, [instance.pk])
+
+
+def content_deleted(sender, instance, **kwargs):
+    remove_objects(type_for_model(sender), [instance.pk])
+
+
+def _category_type(model):
+    for content_type, indexed in INDEXED_TYPES.items():
+        if indexed.category_label == model._meta.label:
+            return content_type
+    return None
+
+
+def category_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ContentEntry.objects.filter(content_type=_category_type(sender), category_id=instance.pk).update(
+        category_name=instance.name, category_slug=instance.slug,
+    )
+
+
+def category_deleted(sender, instance, **kwargs):
+    # The content's FK is SET_NULL'd with an UPDATE, which sends no post_save
+    ContentEntry.objects.filter(content_type=_category_type(sender), category_id=instance.pk).update(
+        category_id=None, category_name='', category_slug='',
+    )
+
+
+def connect_index_signals():
+    """Called from CoreConfig.ready()"""
+    for content_type, indexed in INDEXED_TYPES.items():
+        uid = f'content_index_{content_type}'
+        post_save.connect(content_saved, sender=indexed.model, dispatch_uid=f'{uid}_saved')
+        post_delete.connect(content_deleted, sender=indexed.model, dispatch_uid=f'{uid}_deleted')
+        post_save.connect(category_saved, sender=indexed.category_model, dispatch_uid=f'{uid}_category_saved')
+        post_delete.connect(category_deleted, sender=indexed.category_model, dispatch_uid=f'{uid}_category_deleted')
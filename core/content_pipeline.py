@@ -0,0 +1,224 @@
+"""
+Content rendering pipeline for Parsa Journal
+Editor HTML is processed once, when an article or review is saved, into
+sanitized ``rendered_content`` plus precomputed word count and reading time.
+Templates output the stored result instead of trusting raw editor HTML.
+"""
+from dataclasses import dataclass
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+import math
+import re
+
+from django.utils.text import slugify
+
+# Bump whenever the output of render_content() changes, then run
+# `manage.py rerender_content` to refresh stored HTML.
+PIPELINE_VERSION = 2
+
+WORDS_PER_MINUTE = 200
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'cite', 'code', 'dd', 'del', 'div', 'dl', 'dt',
+    'em', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'li',
+    'mark', 'ol', 'p', 'pre', 's', 'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+    'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': {'class', 'dir', 'lang', 'title'},
+    'a': {'href', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start', 'type'},
+    'blockquote': {'cite'},
+}
+# Elements dropped together with everything inside them
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'}
+VOID_TAGS = {'br', 'hr', 'img'}
+HEADING_TAGS = {'h2', 'h3', 'h4'}
+URL_ATTRIBUTES = {'href', 'src', 'cite'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass
+class RenderedContent:
+    html: str
+    word_count: int
+    reading_time: int
+
+
+def _is_safe_url(value):
+    scheme = urlsplit(value.strip()).scheme.lower()
+    return scheme in ALLOWED_SCHEMES
+
+
+class _ContentSanitizer(HTMLParser):
+    """Allowlist sanitizer that also applies the per-element transformations"""
+
+    def __init__(self, internal_hosts):
+        super().__init__(convert_charrefs=True)
+        self.internal_hosts = internal_hosts
+        self.out = []
+        self.text = []
+        self.open_tags = []
+        self.drop_depth = 0
+        self.heading = None  # (tag, attrs, start index in out) while inside an anchored heading
+        self.used_ids = set()
+
+    def handle_starttag(self, tag, attrs):
+        if self.drop_depth or tag in DROP_CONTENT_TAGS:
+            if tag not in VOID_TAGS:
+                self.drop_depth += 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set()) | ALLOWED_ATTRIBUTES['*']
+        clean = {}
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not _is_safe_url(value):
+                continue
+            clean[name] = value
+
+        if tag == 'img':
+            if 'src' not in clean:
+                return
+            clean['loading'] = 'lazy'
+            clean['decoding'] = 'async'
+        elif tag == 'a' and self._is_external(clean.get('href', '')):
+            clean['rel'] = 'noopener noreferrer nofollow'
+            clean['target'] = '_blank'
+
+        if tag in HEADING_TAGS and self.heading is None:
+            self.heading = (tag, clean, len(self.out))
+            self.open_tags.append(tag)
+            return
+
+        self.out.append(self._start_tag(tag, clean))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closing element has no content and no end tag to bring drop_depth back down
+        if self.drop_depth or tag in DROP_CONTENT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and tag in ALLOWED_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.drop_depth:
+            if tag in DROP_CONTENT_TAGS or tag not in VOID_TAGS:
+                self.drop_depth -= 1
+            return
+        if tag not in ALLOWED_TAGS or tag in VOID_TAGS or tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if self.heading is not None and open_tag == self.heading[0]:
+                self._close_heading()
+            else:
+                self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        self.text.append(data)
+        self.out.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if self.heading is not None and open_tag == self.heading[0]:
+                self._close_heading()
+            else:
+                self.out.append(f'</{open_tag}>')
+
+    def _close_heading(self):
+        tag, attrs, start = self.heading
+        self.heading = None
+        inner = ''.join(self.out[start:])
+        text = re.sub(r'<[^>]+>', '', inner)
+        anchor = attrs.get('id') or slugify(text, allow_unicode=True) or 'section'
+        candidate, n = anchor, 2
+        while candidate in self.used_ids:
+            candidate = f'{anchor}-{n}'
+            n += 1
+        self.used_ids.add(candidate)
+        attrs['id'] = candidate
+        del self.out[start:]
+        self.out.append(
+            f'{self._start_tag(tag, attrs)}{inner}'
+            f'<a class="heading-anchor" href="#{escape(candidate)}" aria-hidden="true">#</a></{tag}>'
+        )
+
+    def _is_external(self, href):
+        host = urlsplit(href.strip()).netloc.lower()
+        if not host:
+            return False
+        host = host.split('@')[-1].split(':')[0]
+        return not any(host == h or host.endswith(f'.{h}') for h in self.internal_hosts)
+
+    @staticmethod
+    def _start_tag(tag, attrs):
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in attrs.items())
+        return f'<{tag}{rendered}>'
+
+
+def get_internal_hosts():
+    from django.conf import settings
+    hosts = {h.lstrip('.').lower() for h in settings.ALLOWED_HOSTS if h and h != '*'}
+    hosts.update(getattr(settings, 'CONTENT_INTERNAL_HOSTS', []))
+    return sorted(hosts)
+
+
+def render_content(html, internal_hosts=None):
+    """Sanitize and transform editor HTML; pure function safe to run in worker processes"""
+    if internal_hosts is None:
+        internal_hosts = get_internal_hosts()
+    parser = _ContentSanitizer(internal_hosts)
+    parser.feed(html or '')
+    parser.close()
+    words = len(WORD_RE.findall(' '.join(parser.text)))
+    reading_time = max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0
+    return RenderedContent(''.join(parser.out), words, reading_time)
+
+
+def render_batch(rows, internal_hosts):
+    """[(pk, content)] -> [(pk, html, word_count, reading_time)]; used by rerender_content workers"""
+    results = []
+    for pk, content in rows:
+        rendered = render_content(content, internal_hosts)
+        results.append((pk, rendered.html, rendered.word_count, rendered.reading_time))
+    return results
+
+
+RENDERED_FIELDS = ('rendered_content', 'word_count', 'reading_time', 'render_version')
+
+
+def apply_rendered_content(instance, update_fields=None):
+    """
+    Fill the rendered fields of an article/review from its ``content``.
+    Returns the update_fields to pass on to save() (unchanged when the save
+    doesn't touch ``content``, e.g. increment_views()).
+    """
+    if update_fields is not None and 'content' not in update_fields:
+        return update_fields
+    rendered = render_content(instance.content)
+    instance.rendered_content = rendered.html
+    instance.word_count = rendered.word_count
+    instance.reading_time = rendered.reading_time
+    instance.render_version = PIPELINE_VERSION
+    if update_fields is not None:
+        update_fields = set(update_fields) | set(RENDERED_FIELDS)
+    return update_fields
@@ -0,0 +1,123 @@
+"""
+Read-replica database router for Parsa Journal
+Public reads go round-robin to healthy replicas; writes, admin traffic and
+requests that recently wrote stay on the primary ('default'). Outside the
+request cycle (task worker, management commands, shell) reads stay on the
+primary too: only ReplicaPinningMiddleware unpins, per safe request.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import itertools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+# Pinned unless a request says otherwise: background code often reads right after
+# writing (e.g. rescoring only rows not scored yet) and a lagging replica misleads it
+_pinned = ContextVar('db_pinned_to_primary', default=True)
+
+_health = {}
+_health_lock = threading.Lock()
+_cycle_lock = threading.Lock()
+_counter = itertools.count()
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def pin_to_primary(pinned=True):
+    """Pin (or, with False, unpin) reads in the current request/thread to the primary; returns a reset token"""
+    return _pinned.set(pinned)
+
+
+def unpin(token):
+    _pinned.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Context manager forcing reads to the primary (e.g. right after a write)"""
+    token = pin_to_primary(True)
+    try:
+        yield
+    finally:
+        unpin(token)
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'REPLICA_DATABASES', []) if alias in settings.DATABASES]
+
+
+def _is_healthy(alias):
+    """Cheap cached health check: a replica that failed is skipped for the check interval"""
+    interval = getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 30)
+    now = time.monotonic()
+    state = _health.get(alias)
+    if state is not None and now - state[1] < interval:
+        return state[0]
+
+    with _health_lock:
+        state = _health.get(alias)
+        if state is not None and now - state[1] < interval:
+            return state[0]
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+            healthy = True
+        except Exception as exc:
+            logger.warning(f"Replica '{alias}' failed health check: {exc}")
+            healthy = False
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def _next_replica():
+    aliases = replica_aliases()
+    if not aliases:
+        return None
+
+    with _cycle_lock:
+        start = next(_counter) % len(aliases)
+
+    # Start from the next alias in rotation, falling back to the others in order
+    for alias in aliases[start:] + aliases[:start]:
+        if _is_healthy(alias):
+            return alias
+    return None
+
+
+def _is_primary_only(model):
+    primary_only = getattr(settings, 'REPLICA_PRIMARY_ONLY', [])
+    return model._meta.app_label in primary_only or model._meta.label in primary_only
+
+
+class ReplicaRouter:
+    """
+    - db_for_read: replica (round-robin, health checked) unless the context
+      is pinned (the default outside an unpinned request), a transaction is open on the primary, or the model must
+      always be read from the primary (sessions, task queue, users).
+    - db_for_write: always the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if is_pinned() or _is_primary_only(model):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return _next_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary, so objects from any alias may relate
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
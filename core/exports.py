@@ -0,0 +1,195 @@
+"""
+Streaming data exports for Parsa Journal
+Rows are read with ``values_list().iterator(chunk_size=...)`` (a server-side
+cursor on PostgreSQL) and encoded as CSV or JSON Lines one chunk at a time,
+so exporting any number of rows uses constant memory and the first bytes go
+out before the whole table has been read. Used by the admin panel export
+view and the ``export_data`` management command.
+"""
+import csv
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from articles.models import Article
+from comments.models import Comment
+from newsletter.models import NewsletterSubscriber
+from reviews.models import BookReview, MovieReview
+from .models import ContactMessage
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+@dataclass
+class Export:
+    queryset: Callable[[], QuerySet]
+    # column name -> ORM lookup passed to values_list()
+    columns: Dict[str, str]
+    ordering: tuple = ('id',)
+
+
+CONTENT_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'language': 'language',
+    'author': 'author__slug',
+    'category': 'category__slug',
+    'is_featured': 'is_featured',
+    'views': 'views',
+    'word_count': 'word_count',
+    'published_at': 'published_at',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+EXPORTS = {
+    'articles': Export(
+        queryset=lambda: Article.objects.all(),
+        columns={**CONTENT_COLUMNS, 'status': 'status'},
+    ),
+    'books': Export(
+        queryset=lambda: BookReview.objects.all(),
+        columns={
+            **CONTENT_COLUMNS,
+            'is_published': 'is_published',
+            'book_title': 'book_title',
+            'book_author': 'book_author',
+            'book_isbn': 'book_isbn',
+            'book_year': 'book_year',
+            'rating': 'rating',
+        },
+    ),
+    'movies': Export(
+        queryset=lambda: MovieReview.objects.all(),
+        columns={
+            **CONTENT_COLUMNS,
+            'is_published': 'is_published',
+            'movie_title': 'movie_title',
+            'director': 'director',
+            'year': 'year',
+            'genre': 'genre',
+            'rating': 'rating',
+        },
+    ),
+    'subscribers': Export(
+        queryset=lambda: NewsletterSubscriber.objects.all(),
+        columns={
+            'id': 'id',
+            'email': 'email',
+            'name': 'name',
+            'is_active': 'is_active',
+            'subscribed_at': 'subscribed_at',
+            'unsubscribed_at': 'unsubscribed_at',
+        },
+    ),
+    'comments': Export(
+        queryset=lambda: Comment.objects.all(),
+        columns={
+            'id': 'id',
+            'target_type': 'content_type__model',
+            'target_id': 'object_id',
+            'parent_id': 'parent_id',
+            'name': 'name',
+            'email': 'email',
+            'website': 'website',
+            'content': 'content',
+            'is_approved': 'is_approved',
+            'is_spam': 'is_spam',
+            'spam_score': 'spam_score',
+            'ip_address': 'ip_address',
+            'created_at': 'created_at',
+        },
+    ),
+    'messages': Export(
+        queryset=lambda: ContactMessage.objects.all(),
+        columns={
+            'id': 'id',
+            'name': 'name',
+            'email': 'email',
+            'subject': 'subject',
+            'message': 'message',
+            'status': 'status',
+            'created_at': 'created_at',
+            'replied_at': 'replied_at',
+        },
+    ),
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def select_columns(export, requested=None):
+    """Column names to export; ``requested`` narrows the projection"""
+    if not requested:
+        return list(export.columns)
+    unknown = [name for name in requested if name not in export.columns]
+    if unknown:
+        raise ExportError(f"Unknown column(s): {', '.join(unknown)}. Available: {', '.join(export.columns)}")
+    return list(dict.fromkeys(requested))
+
+
+def iter_rows(export, columns, chunk_size=None):
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    lookups = [export.columns[name] for name in columns]
+    queryset = export.queryset().order_by(*export.ordering).values_list(*lookups)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+class _LineBuffer:
+    """File-like target for csv.writer that hands back what was written"""
+    def write(self, value):
+        return value
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _chunked(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_csv(rows, columns, chunk_size=None):
+    # BOM so spreadsheet apps detect UTF-8 (Persian text) instead of the locale codepage
+    writer = csv.writer(_LineBuffer())
+    yield '\ufeff' + writer.writerow(columns)
+    for chunk in _chunked(rows, chunk_size or settings.EXPORT_CHUNK_SIZE):
+        yield ''.join(writer.writerow([_csv_safe(value) for value in row]) for row in chunk)
+
+
+def stream_jsonl(rows, columns, chunk_size=None):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for chunk in _chunked(rows, chunk_size or settings.EXPORT_CHUNK_SIZE):
+        yield ''.join(f'{encoder.encode(dict(zip(columns, row)))}\n' for row in chunk)
+
+
+def stream_export(name, fmt='csv', requested=None, chunk_size=None):
+    """(iterator of text chunks, content type) for the named export"""
+    if name not in EXPORTS:
+        raise ExportError(f"Unknown export '{name}'. Available: {', '.join(EXPORTS)}")
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'. Available: {', '.join(FORMATS)}")
+    export = EXPORTS[name]
+    columns = select_columns(export, requested)
+    rows = iter_rows(export, columns, chunk_size)
+    stream = stream_csv if fmt == 'csv' else stream_jsonl
+    return stream(rows, columns, chunk_size), FORMATS[fmt]
@@ -0,0 +1,267 @@
+"""
+HTML response post-processing: critical CSS and minification
+With HTML_OPTIMIZATION on, HtmlOptimizationMiddleware rewrites HTML pages:
+
+- the site stylesheets are loaded without blocking rendering, and the rules
+  the top of the page needs are inlined in a <style> block. These rules are
+  precomputed per view (each view renders one page template) and language by
+  `manage.py build_critical_css` into CRITICAL_CSS_DIR;
+- the markup is minified: comments are dropped and whitespace runs collapsed,
+  except inside <pre>, <textarea>, <script> and <style>.
+
+The transformed <head> is cached on the view, the language and a digest of
+the head, with CSRF tokens masked out first. The head only changes with the
+page's content, so pages whose body differs on every request (view counters)
+still reuse it; the body is minified per request.
+"""
+import hashlib
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+# -- minification -----------------------------------------------------------
+
+_PRESERVED = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+# Conditional comments (<!--[if IE]>) are markup, not comments
+_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+# A start or end tag, with quoted attribute values that may contain '>'
+_TAG = re.compile(r'(</?[a-zA-Z][^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*>)')
+
+
+def _collapse(match):
+    # A single space keeps the gap between inline elements; a newline keeps lines short
+    return '\n' if '\n' in match.group() else ' '
+
+
+def minify_html(html):
+    """
+    ``html`` without comments and with whitespace runs collapsed in the text
+    between tags, outside whitespace-sensitive elements. Tags are left as they
+    are, so attribute values keep their spacing.
+    """
+    parts = _PRESERVED.split(html)
+    # split() yields text, preserved block, its tag name, text, ...
+    output = []
+    for index in range(0, len(parts), 3):
+        text = _COMMENT.sub('', parts[index])
+        # split() yields text, tag, text, ...
+        for position, piece in enumerate(_TAG.split(text)):
+            output.append(piece if position % 2 else _WHITESPACE.sub(_collapse, piece))
+        if index + 1 < len(parts):
+            output.append(parts[index + 1])
+    return ''.join(output)
+
+
+# -- critical CSS -----------------------------------------------------------
+
+_STYLESHEET_LINK = re.compile(r'<link\s+rel="stylesheet"\s+href="([^"]+)"\s*/?>', re.IGNORECASE)
+
+_critical_css_lock = threading.Lock()
+_critical_css_files = {}
+
+
+def critical_css_path(view_name, language):
+    return os.path.join(str(settings.CRITICAL_CSS_DIR), f"{view_name.replace(':', '-')}.{language}.css")
+
+
+def load_critical_css(view_name, language):
+    """Critical CSS for ``view_name`` in ``language``, or None; reread when the file changes"""
+    path = critical_css_path(view_name, language)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached_file = _critical_css_files.get(path)
+    if cached_file is None or cached_file[0] != mtime:
+        with _critical_css_lock:
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    cached_file = (mtime, fh.read())
+            except OSError:
+                return None
+            _critical_css_files[path] = cached_file
+    return cached_file[1]
+
+
+def _deferred_stylesheet(href):
+    return (
+        f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
+
+
+def inline_critical_css(html, css):
+    """Inline ``css`` before the first site stylesheet and load the site stylesheets without blocking"""
+    head_end = html.find('</head>')
+    if not css or head_end == -1:
+        return html
+    head = html[:head_end]
+    inlined = False
+
+    def replace(match):
+        nonlocal inlined
+        href = match.group(1)
+        if not href.startswith(settings.STATIC_URL):
+            return match.group()
+        prefix = ''
+        if not inlined:
+            inlined = True
+            prefix = '<style>' + css.replace('</', '<\\/') + '</style>'
+        return prefix + _deferred_stylesheet(href)
+
+    head = _STYLESHEET_LINK.sub(replace, head)
+    return head + html[head_end:]
+
+
+# -- building critical CSS --------------------------------------------------
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_PSEUDO = re.compile(r'::?[a-zA-Z-]+(\([^)]*\))?')
+_ATTRIBUTE = re.compile(r'\[[^\]]*\]')
+_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_ID = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+_TYPE = re.compile(r'(?:^|[\s>+~,(])([a-zA-Z][a-zA-Z0-9]*)')
+_HTML_TAG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)([^>]*)>')
+_HTML_CLASS = re.compile(r'\bclass="([^"]*)"')
+_HTML_ID = re.compile(r'\bid="([^"]*)"')
+
+# At-rules whose blocks hold style rules; others (@font-face, @keyframes, ...) come with the full stylesheet
+_NESTED_AT_RULES = ('@media', '@supports')
+
+
+def page_tokens(html, fold_bytes):
+    """(tags, classes, ids) used in the <head> and the first ``fold_bytes`` of the <body>"""
+    body_start = html.find('<body')
+    visible = html if body_start == -1 else html[:body_start + fold_bytes]
+    tags, classes, ids = set(), set(), set()
+    for tag, attributes in _HTML_TAG.findall(visible):
+        tags.add(tag.lower())
+        for value in _HTML_CLASS.findall(attributes):
+            classes.update(value.split())
+        ids.update(_HTML_ID.findall(attributes))
+    return tags, classes, ids
+
+
+def selector_matches(selector, tokens):
+    """Whether every tag, class and id in ``selector`` occurs in the page (pseudo-classes and attributes aside)"""
+    tags, classes, ids = tokens
+    simple = _ATTRIBUTE.sub('', _PSEUDO.sub('', selector))
+    without_names = _ID.sub('', _CLASS.sub('', simple))
+    return (
+        set(_CLASS.findall(simple)) <= classes
+        and set(_ID.findall(simple)) <= ids
+        and {tag.lower() for tag in _TYPE.findall(without_names)} <= tags
+    )
+
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs of a stylesheet without comments"""
+    position = 0
+    while True:
+        open_brace = css.find('{', position)
+        if open_brace == -1:
+            return
+        depth = 1
+        index = open_brace + 1
+        while depth and index < len(css):
+            depth += {'{': 1, '}': -1}.get(css[index], 0)
+            index += 1
+        prelude = css[position:open_brace].strip()
+        # Statements such as @import / @charset end in ';' before the block
+        prelude = prelude.rsplit(';', 1)[-1].strip()
+        yield prelude, css[open_brace + 1:index - 1]
+        position = index
+
+
+def extract_critical_css(css, tokens):
+    """The rules of ``css`` whose selectors match the page ``tokens`` (see page_tokens), minified"""
+    output = []
+    for prelude, body in _css_blocks(_CSS_COMMENT.sub('', css)):
+        if prelude.startswith(_NESTED_AT_RULES):
+            inner = extract_critical_css(body, tokens)
+            if inner:
+                output.append(f'{_WHITESPACE.sub(" ", prelude)}{{{inner}}}')
+        elif prelude.startswith('@'):
+            continue
+        elif any(selector_matches(selector, tokens) for selector in prelude.split(',')):
+            declarations = _WHITESPACE.sub(' ', body).strip()
+            output.append(f'{_WHITESPACE.sub(" ", prelude)}{{{declarations}}}')
+    return ''.join(output)
+
+
+# -- middleware -------------------------------------------------------------
+
+# Every render gets a fresh masked token; mask them so otherwise identical heads share a cache entry
+CSRF_TOKEN_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")([^"]*)(")')
+_CSRF_PLACEHOLDER = '\x00csrf\x00'
+_CSRF_PLACEHOLDER_RE = re.compile(re.escape(_CSRF_PLACEHOLDER))
+
+
+def _optimize_head(head, view_name, language, cacheable):
+    """Critical CSS + minification of the <head> part of a page, cached per view, language and head digest"""
+    tokens = []
+
+    def mask(match):
+        tokens.append(match.group(2))
+        return match.group(1) + _CSRF_PLACEHOLDER + match.group(3)
+
+    masked = CSRF_TOKEN_RE.sub(mask, head)
+    key = None
+    optimized = None
+    if cacheable:
+        digest = hashlib.md5(masked.encode('utf-8')).hexdigest()
+        key = f'html_optimized_head:{view_name}:{language}:{digest}'
+        optimized = cache.get(key)
+    if optimized is None:
+        optimized = minify_html(inline_critical_css(masked, load_critical_css(view_name, language)))
+        if key is not None:
+            cache.set(key, optimized, settings.HTML_OPTIMIZATION_CACHE_TIMEOUT)
+
+    # The masked head is identical, so it has as many placeholders as there are tokens
+    tokens = iter(tokens)
+    return _CSRF_PLACEHOLDER_RE.sub(lambda match: next(tokens, ''), optimized)
+
+
+def optimize_html(html, view_name, language, cacheable=True):
+    """Critical CSS + minification of ``html``; the <head> is cached when ``cacheable`` (see module docstring)"""
+    head_end = html.find('</head>')
+    if head_end == -1:
+        return minify_html(html)
+    head_end += len('</head>')
+    return _optimize_head(html[:head_end], view_name, language, cacheable) + minify_html(html[head_end:])
+
+
+class HtmlOptimizationMiddleware:
+    """Inline critical CSS into and minify HTML pages (see module docstring)"""
+
+    def __init__(self, get_response):
+        if not settings.HTML_OPTIMIZATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if (
+            match is None
+            or response.status_code != 200
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+
+        user = getattr(request, 'user', None)
+        # Pages that show the signed-in user differ per user; don't fill the cache with them
+        cacheable = user is None or not user.is_authenticated
+        html = response.content.decode(response.charset)
+        optimized = optimize_html(html, match.view_name, getattr(request, 'LANGUAGE_CODE', ''), cacheable)
+        response.content = optimized.encode(response.charset)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
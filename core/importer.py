@@ -0,0 +1,385 @@
+"""
+Bulk content import for Parsa Journal
+Streams articles / book reviews / movie reviews from JSONL or CSV and writes
+them in batches: every row is validated with the model fields' own
+validators, authors/categories/tags are resolved through in-memory lookup
+maps (created on first sight), slugs are made unique with at most two
+queries per batch (one more per 200 colliding or repeated titles), and each batch is one
+bulk_create plus one bulk insert of tag through-rows and one upsert into the
+content index. Used by the ``import_content`` management command.
+"""
+from collections import Counter
+import csv
+from dataclasses import dataclass, field
+from functools import reduce
+import json
+import operator
+import re
+import sys
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_unicode_slug
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import slugify
+
+from accounts.models import Author
+from articles.models import Article, Category, Tag
+from reviews.models import BookCategory, BookReview, MovieCategory, MovieReview
+from .cache_policy import content_paths, purge
+from .content_index import index_objects
+from .content_pipeline import PIPELINE_VERSION, get_internal_hosts, render_content
+from .db_router import use_primary
+from .signals import batch_content_changes, notify_content_changed
+
+CONTENT_TYPES = {
+    'article': Article,
+    'book': BookReview,
+    'movie': MovieReview,
+}
+
+CATEGORY_MODELS = {
+    'article': Category,
+    'book': BookCategory,
+    'movie': MovieCategory,
+}
+
+COMMON_FIELDS = (
+    'title', 'slug', 'language', 'excerpt', 'content', 'image_alt', 'meta_title', 'meta_description',
+    'is_featured', 'views', 'published_at',
+)
+
+# Row keys copied onto the model, validated by the model field
+IMPORT_FIELDS = {
+    'article': COMMON_FIELDS + ('status', 'featured_image'),
+    'book': COMMON_FIELDS + (
+        'is_published', 'book_title', 'book_author', 'book_isbn', 'book_year', 'rating', 'cover_image', 'purchase_link',
+    ),
+    'movie': COMMON_FIELDS + (
+        'is_published', 'movie_title', 'director', 'year', 'genre', 'rating', 'poster_image', 'watch_link',
+    ),
+}
+
+REQUIRED_FIELDS = {
+    'article': ('title', 'content'),
+    'book': ('title', 'content', 'book_title', 'book_author'),
+    'movie': ('title', 'content', 'movie_title', 'director'),
+}
+
+EXCERPT_LENGTH = 300
+SLUG_MAX_LENGTH = 200
+TAG_SEPARATOR_RE = re.compile(r'\s*[|,،]\s*')
+SLUG_SUFFIX_RE = re.compile(r'-[0-9]+$')
+SLUG_PREFIX_CHUNK = 200
+
+
+class RowError(ValueError):
+    pass
+
+
+@dataclass
+class ParsedRow:
+    line: int
+    content_type: str
+    values: Dict[str, object]
+    author: str
+    category: str = ''
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ImportStats:
+    imported: int = 0
+    skipped: int = 0
+    errors: int = 0
+    created_authors: int = 0
+    created_categories: int = 0
+    created_tags: int = 0
+
+
+def read_rows(path, fmt=None):
+    """Yield (line number, dict) from a JSONL or CSV file ('-' for stdin) without loading it"""
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    yield line_number, RowError(f'invalid JSON: {exc}')
+                    continue
+                yield line_number, row if isinstance(row, dict) else RowError('expected a JSON object')
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def make_slug(text):
+    return slugify(text or '', allow_unicode=True)[:SLUG_MAX_LENGTH - 10].strip('-') or 'item'
+
+
+def make_excerpt(content):
+    # The excerpt only needs the start of the text; don't parse the whole body for it
+    text = ' '.join(strip_tags(content[:EXCERPT_LENGTH * 10]).split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH - 1].rsplit(' ', 1)[0] + '…'
+
+
+def split_tags(value):
+    if isinstance(value, (list, tuple)):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    return [tag for tag in TAG_SEPARATOR_RE.split(value or '') if tag]
+
+
+def parse_row(line, row, default_type=None):
+    """Validate one input row with the target model's field validators"""
+    content_type = (row.get('type') or default_type or '').strip().lower()
+    if content_type not in CONTENT_TYPES:
+        raise RowError(f"unknown type '{content_type}' (expected {', '.join(CONTENT_TYPES)})")
+    model = CONTENT_TYPES[content_type]
+
+    missing = [name for name in REQUIRED_FIELDS[content_type] if not row.get(name)]
+    if not row.get('author'):
+        missing.append('author')
+    if missing:
+        raise RowError(f"missing {', '.join(missing)}")
+
+    values = {}
+    for name in IMPORT_FIELDS[content_type]:
+        raw = row.get(name)
+        if raw is None or raw == '':
+            continue
+        model_field = model._meta.get_field(name)
+        try:
+            if name == 'slug':
+                # Stored slugs may be unicode (see the uslug path converter)
+                value = str(raw).strip()
+                validate_unicode_slug(value)
+            else:
+                value = model_field.clean(raw, None)
+        except ValidationError as exc:
+            raise RowError(f"{name}: {' '.join(exc.messages)}")
+        if name == 'published_at' and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        values[name] = value
+
+    return ParsedRow(
+        line=line,
+        content_type=content_type,
+        values=values,
+        author=str(row['author']).strip(),
+        category=str(row.get('category') or '').strip(),
+        tags=split_tags(row.get('tags')),
+    )
+
+
+class ContentImporter:
+    def __init__(self, batch_size=1000, create_authors=False, render=True, on_error=None):
+        self.batch_size = batch_size
+        self.create_authors = create_authors
+        self.render = render
+        self.on_error = on_error
+        self.internal_hosts = get_internal_hosts()
+        self.stats = ImportStats()
+
+    def load_lookups(self):
+        # Loaded once: the related tables are tiny next to the content
+        self.authors = dict(Author.objects.values_list('slug', 'id'))
+        self.categories = {
+            content_type: {(language, slug): pk for language, slug, pk in model.objects.values_list('language', 'slug', 'id')}
+            for content_type, model in CATEGORY_MODELS.items()
+        }
+        self.tags = {}
+        for pk, name, slug in Tag.objects.values_list('id', 'name', 'slug'):
+            self.tags[name.casefold()] = pk
+            self.tags[slug] = pk
+
+    # -- related objects -------------------------------------------------
+
+    def resolve_author(self, key):
+        slug = make_slug(key) if key not in self.authors else key
+        if slug in self.authors:
+            return self.authors[slug]
+        if not self.create_authors:
+            raise RowError(f"unknown author '{key}' (use --create-authors to create it)")
+        User = get_user_model()
+        user = User(username=slug[:150], email=f'{slug}@authors.invalid', is_active=False)
+        user.set_unusable_password()
+        user.save()
+        author = Author.objects.create(user=user, display_name=key, slug=slug)
+        self.authors[slug] = author.id
+        self.stats.created_authors += 1
+        return author.id
+
+    def resolve_category(self, content_type, language, name):
+        if not name:
+            return None
+        slug = make_slug(name)[:100]
+        categories = self.categories[content_type]
+        if (language, slug) not in categories:
+            category = CATEGORY_MODELS[content_type].objects.create(name=name[:100], slug=slug, language=language)
+            categories[(language, slug)] = category.id
+            self.stats.created_categories += 1
+        return categories[(language, slug)]
+
+    def resolve_tag(self, name):
+        key = name.casefold()
+        if key not in self.tags:
+            slug = make_slug(name)
+            tag = Tag.objects.filter(slug=slug).first() or Tag.objects.create(name=name[:50], slug=slug[:50])
+            self.tags[key] = self.tags[tag.slug] = tag.id
+            self.stats.created_tags += 1
+        return self.tags[key]
+
+    # -- slugs -----------------------------------------------------------
+
+    def assign_slugs(self, model, rows):
+        """
+        Give each row a unique slug. Rows with an explicit slug that already
+        exists are skipped, which makes re-running an import idempotent.
+        """
+        explicit = [row.values['slug'] for row in rows if 'slug' in row.values]
+        existing = set(model.objects.filter(slug__in=explicit).values_list('slug', flat=True)) if explicit else set()
+
+        bases = {row.line: make_slug(row.values['title']) for row in rows if 'slug' not in row.values}
+        taken = set(existing)
+        if bases:
+            # One query for exact collisions, one more for numbered variants of the bases that
+            # get numbered: those colliding with the table or repeated within the batch
+            collisions = set(model.objects.filter(slug__in=set(bases.values())).values_list('slug', flat=True))
+            taken |= collisions
+            repeated = {base for base, count in Counter(bases.values()).items() if count > 1}
+            # LIKE 'base-%' can use the slug index (unlike a regex); the suffix is checked here.
+            # Chunked because SQLite caps the depth of an OR expression tree.
+            numbered = sorted(collisions | repeated)
+            for start in range(0, len(numbered), SLUG_PREFIX_CHUNK):
+                prefixes = reduce(operator.or_, (
+                    Q(slug__startswith=f'{base}-') for base in numbered[start:start + SLUG_PREFIX_CHUNK]
+                ))
+                taken |= {
+                    slug for slug in model.objects.filter(prefixes).values_list('slug', flat=True)
+                    if SLUG_SUFFIX_RE.search(slug)
+                }
+
+        accepted = []
+        for row in rows:
+            if 'slug' in row.values:
+                if row.values['slug'] in taken:
+                    self.stats.skipped += 1
+                    continue
+                taken.add(row.values['slug'])
+            else:
+                base = slug = bases[row.line]
+                suffix = 2
+                while slug in taken:
+                    slug = f'{base}-{suffix}'
+                    suffix += 1
+                taken.add(slug)
+                row.values['slug'] = slug
+            accepted.append(row)
+        return accepted
+
+    # -- writing ---------------------------------------------------------
+
+    def build(self, row):
+        model = CONTENT_TYPES[row.content_type]
+        values = row.values
+        language = values.get('language') or model._meta.get_field('language').get_default()
+        instance = model(
+            **values,
+            author_id=self.resolve_author(row.author),
+            category_id=self.resolve_category(row.content_type, language, row.category),
+        )
+        if not instance.excerpt:
+            instance.excerpt = make_excerpt(instance.content)
+        published = instance.status == 'published' if row.content_type == 'article' else instance.is_published
+        if published and not instance.published_at:
+            instance.published_at = timezone.now()
+        if self.render:
+            rendered = render_content(instance.content, self.internal_hosts)
+            instance.rendered_content = rendered.html
+            instance.word_count = rendered.word_count
+            instance.reading_time = rendered.reading_time
+            instance.render_version = PIPELINE_VERSION
+        return instance
+
+    def write_batch(self, content_type, rows):
+        model = CONTENT_TYPES[content_type]
+        with transaction.atomic():
+            rows = self.assign_slugs(model, rows)
+            instances = []
+            for row in rows:
+                try:
+                    instances.append((row, self.build(row)))
+                except RowError as exc:
+                    self.report(row.line, exc)
+            if not instances:
+                return
+            created = model.objects.bulk_create([instance for _, instance in instances], batch_size=self.batch_size)
+            if any(instance.pk is None for instance in created):
+                # Backends without RETURNING: look the new ids up by slug
+                ids = dict(model.objects.filter(slug__in=[i.slug for i in created]).values_list('slug', 'id'))
+                for instance in created:
+                    instance.pk = ids[instance.slug]
+            # bulk_create sends no post_save, so index the batch and announce the change explicitly
+            index_objects(content_type, [instance.pk for instance in created], batch_size=self.batch_size)
+            notify_content_changed(model)
+
+            if content_type == 'article':
+                through = Article.tags.through
+                links = {
+                    (instance.pk, self.resolve_tag(name))
+                    for row, instance in instances for name in row.tags
+                }
+                through.objects.bulk_create(
+                    [through(article_id=article_id, tag_id=tag_id) for article_id, tag_id in links],
+                    batch_size=self.batch_size,
+                )
+            # New rows have no cached pages of their own, but the lists showing them do
+            purge(content_paths(content_type, [instance.pk for instance in created]))
+        self.stats.imported += len(instances)
+
+    def report(self, line, error):
+        self.stats.errors += 1
+        if self.on_error:
+            self.on_error(line, error)
+
+    def run(self, rows, default_type=None, on_batch=None):
+        """Import (line, dict) rows; ``on_batch(stats)`` is called after every batch"""
+        pending = {content_type: [] for content_type in CONTENT_TYPES}
+        # Read from the primary: lookups and slug checks must see this run's own writes
+        with use_primary(), batch_content_changes():
+            self.load_lookups()
+            for line, row in rows:
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    parsed = parse_row(line, row, default_type)
+                except RowError as exc:
+                    self.report(line, exc)
+                    continue
+                batch = pending[parsed.content_type]
+                batch.append(parsed)
+                if len(batch) >= self.batch_size:
+                    self.write_batch(parsed.content_type, batch)
+                    pending[parsed.content_type] = []
+                    if on_batch:
+                        on_batch(self.stats)
+            for content_type, batch in pending.items():
+                if batch:
+                    self.write_batch(content_type, batch)
+        if on_batch:
+            on_batch(self.stats)
+        return self.stats
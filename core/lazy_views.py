@@ -0,0 +1,27 @@
+"""
+Deferred view imports for URLconfs
+Reversing any URL name populates the whole resolver tree, so every URLconf
+(and the views module it imports) loads in every worker on its first request.
+A URLconf that does ``views = LazyViews('app.views')`` instead of
+``from . import views`` keeps the URL patterns but imports the views module,
+with its forms and helpers, only when one of its views is first called.
+"""
+from importlib import import_module
+
+
+class LazyViews:
+    """Stands in for a views module: each attribute is a view that imports the real one on first call"""
+
+    def __init__(self, module_path):
+        self.module_path = module_path
+
+    def __getattr__(self, name):
+        module_path = self.module_path
+
+        def view(request, *args, **kwargs):
+            return getattr(import_module(module_path), name)(request, *args, **kwargs)
+
+        # Keeps URLPattern.lookup_str (used by reverse() with dotted paths and debug pages) pointing at the real view
+        view.__module__ = module_path
+        view.__name__ = view.__qualname__ = name
+        return view
@@ -0,0 +1,100 @@
+"""
+Management command to microbenchmark Persian (Jalali) date formatting.
+Compares the original per-call month-loop conversion with the table-driven
+conversion, the memoized localized_date filter and the bulk localized_dates API.
+"""
+from datetime import timedelta
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone, translation
+
+from core.templatetags import core_extras
+
+
+def _legacy_localized_date(value):
+    """The pre-table filter: language lookup + localtime + month loop + translate on every call"""
+    translation.get_language()
+    normalized = core_extras._normalize_value(value)
+    date_value = normalized.date()
+    jy, jm, jd = core_extras._gregorian_to_jalali(date_value.year, date_value.month, date_value.day)
+    result = " ".join([str(jd), core_extras.JALALI_MONTH_NAMES[jm - 1], str(jy)])
+    return core_extras._to_persian_digits(result)
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark Jalali date formatting (legacy vs table-driven vs memoized vs bulk)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=10000,
+            help='Number of datetimes formatted per run (default: 10000)',
+        )
+        parser.add_argument(
+            '--distinct',
+            type=int,
+            default=200,
+            help='Number of distinct datetimes among them, as on real listing pages (default: 200)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per variant; the best run is reported (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        repeat = options['repeat']
+        now = timezone.now()
+        pool = [now - timedelta(days=random.randint(0, 3650), minutes=random.randint(0, 1440))
+                for _ in range(max(1, options['distinct']))]
+        values = [random.choice(pool) for _ in range(count)]
+
+        def legacy():
+            for value in values:
+                _legacy_localized_date(value)
+
+        def table():
+            for value in values:
+                core_extras._jalali_date(core_extras._normalize_value(value))
+
+        def memoized_cold():
+            core_extras._format_localized_date.cache_clear()
+            for value in values:
+                core_extras.localized_date(value)
+
+        def memoized_warm():
+            for value in values:
+                core_extras.localized_date(value)
+
+        def bulk():
+            core_extras.localized_dates(values, lang='fa')
+
+        with translation.override('fa'):
+            # Sanity check: every variant produces the same strings
+            expected = [_legacy_localized_date(value) for value in values[:100]]
+            assert [core_extras.localized_date(value) for value in values[:100]] == expected
+            assert core_extras.localized_dates(values[:100], lang='fa') == expected
+
+            memoized_warm()
+            variants = [
+                ('legacy month loop', legacy),
+                ('table-driven', table),
+                ('memoized filter (cold)', memoized_cold),
+                ('memoized filter (warm)', memoized_warm),
+                ('bulk localized_dates' + (' [numpy]' if core_extras._numpy() is not None else ''), bulk),
+            ]
+            results = []
+            for label, func in variants:
+                best = min(timeit.repeat(func, number=1, repeat=repeat))
+                results.append((label, best))
+
+        baseline = results[0][1]
+        self.stdout.write(f'Formatting {count} datetimes ({len(pool)} distinct), best of {repeat}:')
+        for label, seconds in results:
+            per_item = seconds / count * 1e6
+            self.stdout.write(f'   {label:<32} {seconds * 1000:8.2f} ms  {per_item:6.2f} us/date  x{baseline / seconds:5.1f}')
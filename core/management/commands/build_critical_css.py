@@ -0,0 +1,109 @@
+"""
+Management command to precompute the critical CSS HtmlOptimizationMiddleware inlines.
+Renders one representative page per view and language (home, lists, about,
+contact, search, and the newest article / review with its category, author
+and a tag page), collects the tags, classes and ids in the <head> and the top
+CRITICAL_CSS_FOLD_BYTES of the <body>, and keeps the CRITICAL_CSS_STYLESHEETS
+rules that can apply to them. Run it after collectstatic on deploy, or after
+stylesheet or template changes; workers pick up new files on their own.
+"""
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+from articles.models import Tag
+from core.caching import CACHE_WARMING_ENVIRON_KEY
+from core.content_index import INDEXED_TYPES
+from core.html_optimizer import critical_css_path, extract_critical_css, page_tokens
+from core.models import ContentEntry
+
+PAGE_URL_NAMES = [
+    'core:home',
+    'core:about',
+    'core:contact',
+    'core:search',
+    'articles:article_list',
+    'reviews:book_list',
+    'reviews:movie_list',
+]
+
+
+class Command(BaseCommand):
+    help = 'Precompute per-view critical CSS for inlining into HTML pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language(s) to build (default: all LANGUAGES)',
+        )
+
+    def handle(self, *args, **options):
+        css = []
+        for name in settings.CRITICAL_CSS_STYLESHEETS:
+            path = finders.find(name)
+            if path is None:
+                self.stdout.write(self.style.WARNING(f'Stylesheet {name} not found; skipped'))
+                continue
+            with open(path, encoding='utf-8') as fh:
+                css.append(fh.read())
+        if not css:
+            raise CommandError('None of CRITICAL_CSS_STYLESHEETS was found')
+        css = '\n'.join(css)
+
+        client = Client(raise_request_exception=False, HTTP_HOST=self.get_host(), **{CACHE_WARMING_ENVIRON_KEY: True})
+        os.makedirs(settings.CRITICAL_CSS_DIR, exist_ok=True)
+        written = 0
+        for language in options['languages'] or [code for code, name in settings.LANGUAGES]:
+            with translation.override(language):
+                pages = self.get_pages(language)
+            for view_name, url in pages.items():
+                response = client.get(url)
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f'  {url} returned {response.status_code}; skipped'))
+                    continue
+                tokens = page_tokens(response.content.decode(response.charset), settings.CRITICAL_CSS_FOLD_BYTES)
+                critical = extract_critical_css(css, tokens)
+                self.write(critical_css_path(view_name, language), critical)
+                written += 1
+                self.stdout.write(f'  {view_name} [{language}]: {len(critical) / 1024:.1f} KiB from {url}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} critical CSS file(s) to {settings.CRITICAL_CSS_DIR} '
+            f'(full stylesheets: {len(css) / 1024:.1f} KiB)'
+        ))
+
+    def get_pages(self, language):
+        """{view name: representative URL} of ``language``; called with the language active"""
+        pages = {name: reverse(name) for name in PAGE_URL_NAMES}
+        entries = ContentEntry.objects.published().filter(language=language).select_related('author')
+        for content_type, indexed in INDEXED_TYPES.items():
+            entry = entries.filter(content_type=content_type).first()
+            if entry is None:
+                continue
+            pages[indexed.url_name] = entry.get_absolute_url()
+            if entry.category_slug:
+                pages[indexed.category_url_name] = entry.get_category_url()
+            pages.setdefault('articles:author_detail', reverse('articles:author_detail', kwargs={'slug': entry.author.slug}))
+        tag = Tag.objects.filter(articles__language=language, articles__status='published').first()
+        if tag is not None:
+            pages['articles:tag_detail'] = reverse('articles:tag_detail', kwargs={'slug': tag.slug})
+        return pages
+
+    def write(self, path, content):
+        # Write then rename so workers never read a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        os.replace(tmp_path, path)
+
+    def get_host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        return hosts[0].lstrip('.') if hosts else 'localhost'
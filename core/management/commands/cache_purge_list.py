@@ -0,0 +1,73 @@
+"""
+Management command to list the proxy-cached paths affected by content changes.
+Saves and deletes queue their own purges (core/cache_policy.py); this is for
+changes made without signals (queryset.update(), raw SQL, imports) and for
+caches other than nginx, e.g. a CDN purge script reading the paths from
+stdout:
+
+    python manage.py cache_purge_list --since 30
+    python manage.py cache_purge_list article:12 book:3 --purge
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.cache_policy import content_paths
+from core.content_index import INDEXED_TYPES
+from core.tasks import purge_proxy_cache
+
+
+class Command(BaseCommand):
+    help = 'Print the paths of the cached pages showing the given or recently updated content'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'objects',
+            nargs='*',
+            metavar='TYPE:ID',
+            help=f'Content to list pages for; TYPE is one of {", ".join(INDEXED_TYPES)}',
+        )
+        parser.add_argument(
+            '--since',
+            type=int,
+            metavar='MINUTES',
+            help='Also include content updated in the last MINUTES minutes',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Send the paths to CACHE_PURGE_URL instead of printing them',
+        )
+
+    def handle(self, *args, **options):
+        ids_by_type = {content_type: set() for content_type in INDEXED_TYPES}
+        for item in options['objects']:
+            content_type, _, pk = item.partition(':')
+            if content_type not in INDEXED_TYPES or not pk.isdigit():
+                raise CommandError(f"Invalid object '{item}', expected e.g. article:12")
+            ids_by_type[content_type].add(int(pk))
+        if options['since'] is not None:
+            since = timezone.now() - timedelta(minutes=options['since'])
+            for content_type, indexed in INDEXED_TYPES.items():
+                ids_by_type[content_type].update(
+                    indexed.model.objects.filter(updated_at__gte=since).values_list('pk', flat=True)
+                )
+        if not any(ids_by_type.values()):
+            raise CommandError('Give TYPE:ID arguments or --since')
+
+        paths = set()
+        for content_type, ids in ids_by_type.items():
+            if ids:
+                paths |= content_paths(content_type, ids)
+        paths = sorted(paths)
+
+        if not options['purge']:
+            for path in paths:
+                self.stdout.write(path)
+            return
+        if not settings.CACHE_PURGE_URL:
+            raise CommandError('CACHE_PURGE_URL is not set')
+        purge_proxy_cache(paths)
+        self.stdout.write(self.style.SUCCESS(f'Purged {len(paths)} path(s) via {settings.CACHE_PURGE_URL}'))
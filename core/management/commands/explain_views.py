@@ -0,0 +1,240 @@
+"""
+Management command to audit the query plans behind every public and admin view.
+Renders each view through the test client, captures the SQL it executes and
+runs EXPLAIN / EXPLAIN QUERY PLAN on every SELECT, flagging full table scans
+and temporary B-trees / sorts.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from accounts.models import Author
+from articles.models import Article, Category, Tag
+from reviews.models import BookReview, MovieReview, BookCategory, MovieCategory
+
+User = get_user_model()
+
+# Lookup tables with a handful of rows - scanning them is cheaper than any index
+DEFAULT_IGNORED_TABLES = [
+    'django_content_type',
+    'django_site',
+    'django_session',
+    'core_sitesettings',
+]
+
+
+class Command(BaseCommand):
+    help = 'Capture the queries of every public/admin view and flag full scans and temp sorts in their plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            action='store_true',
+            help='Run create_test_data first so the audit runs against a seeded dataset',
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language(s) to audit (default: all LANGUAGES)',
+        )
+        parser.add_argument(
+            '--view',
+            action='append',
+            dest='views',
+            help='Only audit view(s) whose URL name contains this text',
+        )
+        parser.add_argument(
+            '--ignore-table',
+            action='append',
+            dest='ignored_tables',
+            help=f'Tables whose scans are not reported (default: {", ".join(DEFAULT_IGNORED_TABLES)})',
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the plan of every query, not just flagged ones',
+        )
+        parser.add_argument(
+            '--fail-on-issues',
+            action='store_true',
+            help='Exit with an error if any plan is flagged (for CI)',
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            call_command('create_test_data', stdout=self.stdout)
+
+        languages = options['languages'] or [code for code, name in settings.LANGUAGES]
+        self.ignored_tables = set(options['ignored_tables'] or DEFAULT_IGNORED_TABLES)
+        self.verbose_plans = options['verbose_plans']
+
+        client = Client(raise_request_exception=False)
+        admin_user = User.objects.filter(is_superuser=True, is_active=True).first()
+
+        total_queries = 0
+        flagged = []
+        for index, language in enumerate(languages):
+            # Admin views and the sitemap are not language-prefixed: audit them once
+            for name, url, needs_admin in self.get_view_urls(language, include_admin=index == 0):
+                if options['views'] and not any(v in name for v in options['views']):
+                    continue
+                if needs_admin:
+                    if admin_user is None:
+                        self.stdout.write(self.style.WARNING(f'Skipping {name}: no active superuser to log in with'))
+                        continue
+                    client.force_login(admin_user)
+                else:
+                    client.logout()
+
+                queries = self.capture(client, url)
+                total_queries += len(queries)
+                issues = self.audit(name, language, url, queries)
+                flagged.extend(issues)
+
+        self.stdout.write('')
+        self.stdout.write(f'Audited {total_queries} queries')
+        if flagged:
+            self.stdout.write(self.style.WARNING(f'{len(flagged)} flagged plan(s):'))
+            for view_name, language, problem in flagged:
+                self.stdout.write(f'   - [{language}] {view_name}: {problem}')
+            if options['fail_on_issues']:
+                raise CommandError('Query plan audit found full scans or temporary sorts')
+        else:
+            self.stdout.write(self.style.SUCCESS('No full scans or temporary sorts found'))
+
+    def get_view_urls(self, language, include_admin=True):
+        """Yield (url name, url, needs admin login) for every view with sample arguments"""
+        article = Article.objects.filter(status='published', language=language).first()
+        category = Category.objects.filter(language=language, articles__status='published').first()
+        tag = Tag.objects.filter(articles__language=language, articles__status='published').first()
+        author = Author.objects.filter(is_active=True).first()
+        book = BookReview.objects.filter(is_published=True, language=language).first()
+        movie = MovieReview.objects.filter(is_published=True, language=language).first()
+        book_category = BookCategory.objects.filter(language=language).first()
+        movie_category = MovieCategory.objects.filter(language=language).first()
+
+        views = [
+            ('core:home', {}, ''),
+            ('core:about', {}, ''),
+            ('core:contact', {}, ''),
+            ('core:search', {}, '?q=the'),
+            ('articles:article_list', {}, ''),
+            ('reviews:book_list', {}, ''),
+            ('reviews:movie_list', {}, ''),
+        ]
+        if article:
+            views.append(('articles:article_detail', {'slug': article.slug}, ''))
+        if category:
+            views.append(('articles:category_detail', {'slug': category.slug}, ''))
+            views.append(('articles:article_list', {}, f'?category={category.slug}'))
+        if tag:
+            views.append(('articles:tag_detail', {'slug': tag.slug}, ''))
+        if author:
+            views.append(('articles:author_detail', {'slug': author.slug}, ''))
+        if book:
+            views.append(('reviews:book_detail', {'slug': book.slug}, ''))
+        if movie:
+            views.append(('reviews:movie_detail', {'slug': movie.slug}, ''))
+        if book_category:
+            views.append(('reviews:book_category_detail', {'slug': book_category.slug}, ''))
+        if movie_category:
+            views.append(('reviews:movie_category_detail', {'slug': movie_category.slug}, ''))
+
+        with translation.override(language):
+            for name, kwargs, query in views:
+                yield name, reverse(name, kwargs=kwargs) + query, False
+
+        if not include_admin:
+            return
+        admin_views = [
+            ('django.contrib.sitemaps.views.sitemap', {}, ''),
+            ('admin_panel:dashboard', {}, ''),
+            ('admin_panel:article_list', {}, ''),
+            ('admin_panel:statistics', {}, ''),
+            ('admin_panel:chart_data', {}, ''),
+        ]
+        if article:
+            admin_views.append(('admin_panel:article_detail', {'pk': article.pk}, ''))
+        for name, kwargs, query in admin_views:
+            yield name, reverse(name, kwargs=kwargs) + query, name.startswith('admin_panel:')
+
+    def capture(self, client, url):
+        """Request ``url`` and return [(alias, sql)] for every query, across all databases"""
+        contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = client.get(url, HTTP_HOST=self.get_host())
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+
+        if response.status_code >= 400:
+            self.stdout.write(self.style.WARNING(f'{url} returned {response.status_code}'))
+
+        queries = []
+        for alias, context in contexts.items():
+            for query in context.captured_queries:
+                queries.append((alias, query['sql']))
+        return queries
+
+    def get_host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        return hosts[0].lstrip('.') if hosts else 'localhost'
+
+    def audit(self, view_name, language, url, queries):
+        self.stdout.write(self.style.HTTP_INFO(f'\n[{language}] {view_name}  {url}  ({len(queries)} queries)'))
+        issues = []
+        seen = set()
+        for alias, sql in queries:
+            if not sql.lstrip().upper().startswith('SELECT') or sql in seen:
+                continue
+            seen.add(sql)
+            plan = self.explain(alias, sql)
+            problems = self.find_problems(connections[alias].vendor, plan)
+            if problems or self.verbose_plans:
+                self.stdout.write(f'  {sql[:200]}')
+                for line in plan:
+                    self.stdout.write(f'      {line}')
+            for problem in problems:
+                self.stdout.write(self.style.WARNING(f'    ! {problem}'))
+                issues.append((view_name, language, problem))
+        return issues
+
+    def explain(self, alias, sql):
+        connection = connections[alias]
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}')
+            rows = cursor.fetchall()
+        if connection.vendor == 'sqlite':
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        return [' '.join(str(col) for col in row) for row in rows]
+
+    def find_problems(self, vendor, plan):
+        problems = []
+        for line in plan:
+            detail = line.strip()
+            if vendor == 'sqlite':
+                if detail.startswith('SCAN ') and ' USING ' not in detail:
+                    table = detail.split()[1]
+                    if table not in self.ignored_tables:
+                        problems.append(f'full scan of {table}')
+                elif detail.startswith('USE TEMP B-TREE'):
+                    problems.append(detail.lower())
+            elif vendor == 'postgresql':
+                if 'Seq Scan on ' in detail:
+                    table = detail.split('Seq Scan on ', 1)[1].split()[0]
+                    if table not in self.ignored_tables:
+                        problems.append(f'sequential scan of {table}')
+                elif detail.lstrip('-> ').startswith('Sort '):
+                    problems.append('explicit sort step')
+        return problems
@@ -0,0 +1,94 @@
+"""
+Management command to bulk-import articles and reviews from JSONL or CSV.
+The file is streamed row by row and written in batches (see core/importer.py),
+so a back catalogue of millions of rows imports in constant memory.
+
+One object/row per item. Keys: type (article|book|movie, or --type), title,
+content, author (author slug, or a name with --create-authors), and optionally
+slug, language, excerpt, category (name), tags (list, or "a|b" in CSV),
+status / is_published, is_featured, published_at, meta_title, ... plus the
+book_* / movie_* fields of reviews. Rows whose explicit slug already exists are
+skipped, so an interrupted import can simply be re-run.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.importer import CONTENT_TYPES, ContentImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import articles, book reviews and movie reviews from a JSONL or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSONL or CSV file ('-' reads JSONL from stdin)")
+        parser.add_argument(
+            '--format',
+            choices=['jsonl', 'csv'],
+            help='Input format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--type',
+            choices=sorted(CONTENT_TYPES),
+            help='Content type for rows without a "type" key',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert (default: 1000)',
+        )
+        parser.add_argument(
+            '--create-authors',
+            action='store_true',
+            help='Create missing authors (with an inactive user account) instead of rejecting their rows',
+        )
+        parser.add_argument(
+            '--no-render',
+            action='store_true',
+            help='Skip HTML rendering; run `manage.py rerender_content` afterwards to render in parallel',
+        )
+        parser.add_argument(
+            '--max-errors',
+            type=int,
+            default=50,
+            help='Print at most this many row errors (default: 50); the rest are only counted',
+        )
+
+    def handle(self, *args, **options):
+        printed_errors = 0
+
+        def on_error(line, error):
+            nonlocal printed_errors
+            if printed_errors < options['max_errors']:
+                self.stderr.write(f'line {line}: {error}')
+            printed_errors += 1
+
+        started = last_report = time.perf_counter()
+
+        def on_batch(stats):
+            nonlocal last_report
+            now = time.perf_counter()
+            if now - last_report >= 5:
+                last_report = now
+                rate = stats.imported / (now - started)
+                self.stdout.write(f'  {stats.imported:,} imported, {stats.skipped:,} skipped, {stats.errors:,} errors ({rate:,.0f} rows/s)')
+
+        importer = ContentImporter(
+            batch_size=options['batch_size'],
+            create_authors=options['create_authors'],
+            render=not options['no_render'],
+            on_error=on_error,
+        )
+        stats = importer.run(read_rows(options['path'], options['format']), default_type=options['type'], on_batch=on_batch)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.imported:,} item(s) in {elapsed:.1f}s ({stats.imported / max(elapsed, 1e-9):,.0f} rows/s); '
+            f'{stats.skipped:,} skipped (slug exists), {stats.errors:,} error(s)'
+        ))
+        self.stdout.write(
+            f'Created {stats.created_authors} author(s), {stats.created_categories} categor(y/ies), {stats.created_tags} tag(s)'
+        )
+        if options['no_render']:
+            self.stdout.write(self.style.WARNING('Content was not rendered; run `python manage.py rerender_content` next.'))
@@ -0,0 +1,44 @@
+"""
+Management command to rebuild the search autocomplete index file.
+The task worker rebuilds it after content changes; run this after a deploy
+(or to check the index) so the first visitors get suggestions right away.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.autocomplete import build_index, get_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the memory-mapped search autocomplete index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='After building, print the suggestions for this prefix (en and fa); repeatable',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        suggestions, keys = build_index()
+        elapsed = time.perf_counter() - started
+        path = str(settings.AUTOCOMPLETE_INDEX_PATH)
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {suggestions:,} suggestion(s) under {keys:,} key(s) in {elapsed:.2f}s '
+            f'({os.path.getsize(path) / 1024:,.0f} KiB at {path})'
+        ))
+
+        index = get_index()
+        for query in options['queries'] or []:
+            for language, name in settings.LANGUAGES:
+                started = time.perf_counter()
+                results = index.search(language, query)
+                lookup_ms = (time.perf_counter() - started) * 1000
+                self.stdout.write(f'[{language}] {query!r}: {len(results)} result(s) in {lookup_ms:.3f} ms')
+                for result in results:
+                    self.stdout.write(f'   {result["type"]:8} {result["title"]}  {result["url"]}')
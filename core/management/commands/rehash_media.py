@@ -0,0 +1,151 @@
+"""
+Management command to move existing media to content-hashed names.
+Files uploaded before ContentAddressedStorage (core/storage.py) keep their
+original names, which nginx can't cache as immutable. This copies each one to
+its hashed name (identical files collapse into one), from a pool of threads
+since the work is file I/O, then points every FileField / ImageField row at
+the new names with one UPDATE per file and field referencing it, reindexes ContentEntry,
+purges the proxy-cached pages showing the files and sends a single content_changed
+so cached pages pick up the new URLs.
+
+Originals are kept unless --delete-originals is given, so pages cached
+elsewhere (CDN, browsers) with the old URLs keep working until they expire.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import FileField
+
+from core.cache_policy import content_paths, purge
+from core.content_index import index_objects, type_for_model
+from core.models import ContentEntry
+from core.signals import batch_content_changes, notify_content_changed
+from core.storage import ContentAddressedStorage, content_hash, hashed_name, is_hashed_name
+
+
+def file_fields():
+    """[(model, field)] for every FileField stored in the default storage, except ContentEntry's copy"""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        if model is not ContentEntry
+        for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and field.storage is default_storage
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Copy media files to content-hashed names and update the rows that reference them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Threads hashing and copying files (default: 8)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without copying files or updating rows',
+        )
+        parser.add_argument(
+            '--delete-originals',
+            action='store_true',
+            help='Delete original files once no row references them',
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('The default storage is not core.storage.ContentAddressedStorage; check STORAGES')
+        self.dry_run = options['dry_run']
+
+        fields = file_fields()
+        # (model, field) -> names it references that are not hashed yet
+        references = {}
+        for model, field in fields:
+            references[model, field] = {
+                name for name in model._default_manager.exclude(**{field.name: ''})
+                .exclude(**{f'{field.name}__isnull': True})
+                .values_list(field.name, flat=True).distinct()
+                if not is_hashed_name(name)
+            }
+        names = set().union(*references.values())
+        if not names:
+            self.stdout.write(self.style.SUCCESS('All media already has content-hashed names'))
+            return
+
+        self.stdout.write(f'Rehashing {len(names)} file(s) with {options["workers"]} thread(s)...')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            results = dict(zip(names, executor.map(self.rehash, names)))
+        elapsed = time.perf_counter() - started
+
+        missing = sorted(name for name, result in results.items() if result is None)
+        for name in missing:
+            self.stdout.write(self.style.WARNING(f'  missing: {name} (left as is)'))
+        renamed = {name: result[0] for name, result in results.items() if result is not None}
+        total_bytes = sum(size for name, (new_name, size) in results.items() if name in renamed)
+        unique_bytes = sum(dict(results[name] for name in renamed).values())
+        self.stdout.write(
+            f'{len(renamed)} file(s), {total_bytes / 1024:.0f} KiB -> {len(set(renamed.values()))} unique, '
+            f'{unique_bytes / 1024:.0f} KiB in {elapsed:.1f}s'
+        )
+        if self.dry_run:
+            for old, new in sorted(renamed.items())[:20]:
+                self.stdout.write(f'  {old} -> {new}')
+            self.stdout.write(self.style.SUCCESS('Dry run: nothing changed'))
+            return
+
+        rows = self.update_rows(references, renamed)
+        self.stdout.write(self.style.SUCCESS(f'Updated {rows} row reference(s)'))
+
+        if options['delete_originals']:
+            deleted = 0
+            for old in renamed:
+                still_used = any(model._default_manager.filter(**{field.name: old}).exists() for model, field in fields)
+                if not still_used and default_storage.exists(old):
+                    default_storage.delete(old)
+                    deleted += 1
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} original file(s)'))
+
+    def rehash(self, name):
+        """(hashed name, size) for stored file ``name``, copied there unless this is a dry run; None if missing"""
+        if not default_storage.exists(name):
+            return None
+        with default_storage.open(name, 'rb') as fh:
+            content = File(fh, name)
+            if self.dry_run:
+                return hashed_name(name, content_hash(content)), content.size
+            return default_storage.save(name, content), content.size
+
+    def update_rows(self, references, renamed):
+        updated = 0
+        # content type -> ids of the rows whose image URLs change, for purging the proxy cache
+        changed = {}
+        models = set()
+        with transaction.atomic(), batch_content_changes():
+            for (model, field), names in references.items():
+                content_type = type_for_model(model)
+                for old in names & renamed.keys():
+                    new = renamed[old]
+                    rows = model._default_manager.filter(**{field.name: old})
+                    ids = set(rows.values_list('pk', flat=True)) if content_type else set()
+                    if ids:
+                        changed.setdefault(content_type, set()).update(ids)
+                    # update() skips save() and its signals; the index and caches are refreshed below
+                    count = rows.update(**{field.name: new})
+                    if count:
+                        updated += count
+                        models.add(model)
+            for content_type, ids in changed.items():
+                index_objects(content_type, ids)
+                purge(content_paths(content_type, ids))
+            if models:
+                notify_content_changed(*models)
+        return updated
@@ -0,0 +1,102 @@
+"""
+Management command to re-render stored article/review HTML.
+Run it after changing core.content_pipeline (and bumping PIPELINE_VERSION).
+Rendering is CPU-bound, so batches are processed in a process pool while
+the main process streams rows in and writes results back with bulk_update.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from articles.models import Article
+from core.content_pipeline import PIPELINE_VERSION, RENDERED_FIELDS, get_internal_hosts, render_batch
+from reviews.models import BookReview, MovieReview
+
+MODELS = {
+    'articles': Article,
+    'books': BookReview,
+    'movies': MovieReview,
+}
+
+
+class Command(BaseCommand):
+    help = 'Re-render stored content HTML for articles and reviews in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help=f'Re-render everything, not only rows older than pipeline version {PIPELINE_VERSION}',
+        )
+        parser.add_argument(
+            '--type',
+            choices=sorted(MODELS),
+            action='append',
+            dest='types',
+            help='Content type(s) to re-render (default: all)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of rendering processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Rows sent to a worker per batch (default: 200)',
+        )
+
+    def handle(self, *args, **options):
+        internal_hosts = get_internal_hosts()
+        batch_size = max(1, options['batch_size'])
+        workers = max(1, options['workers'])
+        started = time.monotonic()
+        total = 0
+
+        for type_name in options['types'] or sorted(MODELS):
+            model = MODELS[type_name]
+            queryset = model.objects.all()
+            if not options['all']:
+                queryset = queryset.filter(Q(render_version__lt=PIPELINE_VERSION) | Q(rendered_content=''))
+            rows = queryset.order_by('pk').values_list('pk', 'content')
+
+            count = 0
+            # Workers only import core.content_pipeline, so a clean 'spawn' context
+            # avoids forking the parent's database connections.
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                pending = deque()
+                batch = []
+                for row in rows.iterator(chunk_size=batch_size):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        pending.append(pool.submit(render_batch, batch, internal_hosts))
+                        batch = []
+                        # Keep a bounded number of batches in flight
+                        while len(pending) >= workers * 2:
+                            count += self.save_results(model, pending.popleft(), batch_size)
+                if batch:
+                    pending.append(pool.submit(render_batch, batch, internal_hosts))
+                while pending:
+                    count += self.save_results(model, pending.popleft(), batch_size)
+
+            self.stdout.write(f'   - {type_name}: {count} re-rendered')
+            total += count
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Re-rendered {total} item(s) in {elapsed:.1f}s with {workers} worker(s)'))
+
+    def save_results(self, model, future, batch_size):
+        objects = [
+            model(pk=pk, rendered_content=html, word_count=words, reading_time=minutes, render_version=PIPELINE_VERSION)
+            for pk, html, words, minutes in future.result()
+        ]
+        model.objects.bulk_update(objects, RENDERED_FIELDS, batch_size=batch_size)
+        return len(objects)
@@ -0,0 +1,48 @@
+"""
+Management command to show the most frequent site searches.
+Counts come from SearchQueryStat, which core/search.py updates in batches, so
+the last minute or so of searches per worker may not be included yet. The top
+queries are what `warm_cache --searches N` pre-warms.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import SearchQueryStat
+
+
+class Command(BaseCommand):
+    help = 'List the most frequent search queries with their cache hit rates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Queries to list (default: 20)',
+        )
+        parser.add_argument(
+            '--language',
+            help='Only list queries in this language',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete all statistics after listing them',
+        )
+
+    def handle(self, *args, **options):
+        stats = SearchQueryStat.objects.all()
+        if options['language']:
+            stats = stats.filter(language=options['language'])
+
+        total = sum(stats.values_list('searches', flat=True))
+        self.stdout.write(f'{stats.count()} distinct queries, {total} searches')
+        for stat in stats.order_by('-searches', 'query')[:options['top']]:
+            share = stat.searches / total if total else 0
+            self.stdout.write(
+                f'  {stat.searches:7d}  {share:6.1%}  hits {stat.hit_rate:6.1%}  '
+                f'{stat.result_count:5d} result(s)  [{stat.language}] {stat.query}'
+            )
+
+        if options['reset']:
+            deleted, _ = stats.delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} statistics row(s)'))
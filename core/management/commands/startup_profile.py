@@ -0,0 +1,181 @@
+"""
+Management command to profile worker start-up imports.
+Starts fresh interpreters that do what a gunicorn worker does at boot (import
+the WSGI application) and, with --path, resolve a first request, timing every
+module import. Unlike `python -X importtime`, this also sees the modules Django
+loads by dotted path (settings, apps, models, admin, middleware, URLconfs),
+which go through importlib.import_module(). Timings are aggregated per
+package, repeated runs are reduced to their median, and the result can be
+saved as a baseline and diffed against later runs:
+
+    python manage.py startup_profile --save startup.json
+    ... change something ...
+    python manage.py startup_profile --baseline startup.json
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in the child interpreter: times importlib's _find_and_load, which both the
+# import statement and import_module() go through, while booting the WSGI
+# application (argv[1]) and resolving an optional URL path (argv[2]). Prints
+# {module: [self us, cumulative us]} as JSON on the last line.
+BOOT_SCRIPT = '''
+import importlib._bootstrap as bootstrap
+import json
+import sys
+import time
+
+timings = {}
+stack = []
+find_and_load = bootstrap._find_and_load
+
+def timed_find_and_load(name, import_):
+    stack.append(0)
+    started = time.perf_counter_ns()
+    try:
+        return find_and_load(name, import_)
+    finally:
+        elapsed = time.perf_counter_ns() - started
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        timings.setdefault(name, [(elapsed - nested) // 1000, elapsed // 1000])
+
+bootstrap._find_and_load = timed_find_and_load
+
+from django.utils.module_loading import import_string
+import_string(sys.argv[1])
+if sys.argv[2]:
+    from django.urls import resolve
+    resolve(sys.argv[2])
+
+bootstrap._find_and_load = find_and_load
+print()
+print(json.dumps(timings))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import time of worker start-up, optionally diffed against a saved baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='',
+            help='Also resolve this URL path, as the first request would (e.g. / or /admin/)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Interpreters to start; timings are the median (default: 3)',
+        )
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=1,
+            help='Dotted components to group modules by (default: 1, i.e. top-level package)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=25,
+            help='Packages and modules to list (default: 25)',
+        )
+        parser.add_argument('--save', metavar='FILE', help='Write the timings to FILE as a baseline')
+        parser.add_argument('--baseline', metavar='FILE', help='Compare against a baseline written by --save')
+
+    def handle(self, *args, **options):
+        runs = []
+        for _ in range(max(1, options['repeat'])):
+            runs.append(self.profile(options['path']))
+        modules = self.median(runs)
+        wall = statistics.median(run_wall for run_wall, _ in runs)
+
+        total = sum(own for own, cumulative in modules.values())
+        self.stdout.write(
+            f'{len(modules)} modules imported in {total / 1000:.1f} ms '
+            f'(process wall time {wall * 1000:.0f} ms, median of {len(runs)})'
+        )
+
+        packages = self.group(modules, options['depth'])
+        self.stdout.write(self.style.HTTP_INFO('\nBy package (self time of all its modules):'))
+        for name, own in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {own / 1000:8.1f} ms  {name}')
+
+        self.stdout.write(self.style.HTTP_INFO('\nFirst-party modules by cumulative time:'))
+        local = {name: timing for name, timing in modules.items() if self.is_local(name)}
+        for name, (own, cumulative) in sorted(local.items(), key=lambda item: -item[1][1])[:options['top']]:
+            self.stdout.write(f'  {cumulative / 1000:8.1f} ms  {name}  (self {own / 1000:.1f} ms)')
+
+        if options['baseline']:
+            self.compare(modules, options['baseline'], options['depth'], options['top'])
+        if options['save']:
+            with open(options['save'], 'w') as fh:
+                json.dump({'path': options['path'], 'modules': modules}, fh, indent=1, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f'\nSaved baseline to {options["save"]}'))
+
+    def profile(self, path):
+        """(wall seconds, {module: (self us, cumulative us)}) for one fresh interpreter"""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', BOOT_SCRIPT, settings.WSGI_APPLICATION, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - started
+        if result.returncode != 0:
+            raise CommandError(f'Start-up failed:\n{result.stderr[-2000:]}')
+        modules = json.loads(result.stdout.strip().splitlines()[-1])
+        return wall, {name: tuple(timing) for name, timing in modules.items()}
+
+    def median(self, runs):
+        timings = defaultdict(list)
+        for _, modules in runs:
+            for name, timing in modules.items():
+                timings[name].append(timing)
+        return {
+            name: (statistics.median(own for own, _ in values), statistics.median(cumulative for _, cumulative in values))
+            for name, values in timings.items()
+        }
+
+    def group(self, modules, depth):
+        packages = defaultdict(float)
+        for name, (own, cumulative) in modules.items():
+            packages['.'.join(name.split('.')[:depth])] += own
+        return packages
+
+    def is_local(self, name):
+        top_level = name.split('.')[0]
+        return os.path.isfile(os.path.join(settings.BASE_DIR, top_level, '__init__.py'))
+
+    def compare(self, modules, path, depth, top):
+        try:
+            with open(path) as fh:
+                baseline = {name: tuple(timing) for name, timing in json.load(fh)['modules'].items()}
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Could not read baseline {path}: {exc}')
+
+        before, after = self.group(baseline, depth), self.group(modules, depth)
+        total_before = sum(before.values())
+        total_after = sum(after.values())
+        self.stdout.write(self.style.HTTP_INFO(f'\nCompared with {path}:'))
+        self.stdout.write(
+            f'  total {total_before / 1000:.1f} ms -> {total_after / 1000:.1f} ms '
+            f'({(total_after - total_before) / 1000:+.1f} ms), '
+            f'{len(baseline)} -> {len(modules)} modules'
+        )
+        deltas = {name: after.get(name, 0) - before.get(name, 0) for name in set(before) | set(after)}
+        for name, delta in sorted(deltas.items(), key=lambda item: -abs(item[1]))[:top]:
+            if abs(delta) < 100:
+                break
+            status = ' (new)' if name not in before else ' (gone)' if name not in after else ''
+            self.stdout.write(f'  {delta / 1000:+8.1f} ms  {name}{status}')
@@ -0,0 +1,238 @@
+"""
+Management command to warm the shared cache after a deploy or restart.
+Renders the hottest public URLs through the test client from a few threads:
+home, list pages and feeds in every language, the most viewed articles and
+reviews (from ContentEntry view counts), the biggest categories and tags, the
+most frequent searches (from SearchQueryStat) and sitemap.xml. That fills the
+cached home sections, sidebar aggregates, search results, feeds and sitemap
+(see core/caching.py). Warming requests don't count as views or searches.
+
+Only a shared cache (CACHE_URL=redis://...) is visible to the web workers;
+warming a process-local LocMemCache from a command has no effect on them.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, Q
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+from django.utils.http import urlencode
+
+from articles.models import Tag
+from core.caching import CACHE_WARMING_ENVIRON_KEY
+from core.content_index import INDEXED_TYPES
+from core.models import ContentEntry, SearchQueryStat
+
+LIST_URL_NAMES = [
+    'core:home',
+    'articles:article_list',
+    'reviews:book_list',
+    'reviews:movie_list',
+    'articles:article_feed',
+    'articles:article_atom_feed',
+    'reviews:book_feed',
+    'reviews:book_atom_feed',
+    'reviews:movie_feed',
+    'reviews:movie_atom_feed',
+]
+
+
+@contextmanager
+def record_cache_writes(alias='default'):
+    """Collect the keys written to cache ``alias`` from any thread while active"""
+    backend = type(caches[alias])
+    keys = set()
+    lock = threading.Lock()
+    patched = {name: name in backend.__dict__ for name in ('set', 'add', 'set_many')}
+    original_set, original_add, original_set_many = backend.set, backend.add, backend.set_many
+
+    def record(written):
+        with lock:
+            keys.update(written)
+
+    def set_(self, key, *args, **kwargs):
+        record([key])
+        return original_set(self, key, *args, **kwargs)
+
+    def add(self, key, *args, **kwargs):
+        added = original_add(self, key, *args, **kwargs)
+        if added:
+            record([key])
+        return added
+
+    def set_many(self, data, *args, **kwargs):
+        record(data)
+        return original_set_many(self, data, *args, **kwargs)
+
+    backend.set, backend.add, backend.set_many = set_, add, set_many
+    try:
+        yield keys
+    finally:
+        for name, original in (('set', original_set), ('add', original_add), ('set_many', original_set_many)):
+            if patched[name]:
+                setattr(backend, name, original)
+            else:
+                delattr(backend, name)
+
+
+class Command(BaseCommand):
+    help = 'Warm the cache by rendering the most visited pages in every language'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=50,
+            help='Most viewed articles/reviews to render per language (default: 50)',
+        )
+        parser.add_argument(
+            '--categories',
+            type=int,
+            default=10,
+            help='Largest categories to render per language (default: 10)',
+        )
+        parser.add_argument(
+            '--tags',
+            type=int,
+            default=10,
+            help='Largest tags to render per language (default: 10)',
+        )
+        parser.add_argument(
+            '--searches',
+            type=int,
+            default=20,
+            help='Most frequent search queries to run per language (default: 20)',
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language(s) to warm (default: all LANGUAGES)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Rendering threads (default: 4)',
+        )
+        parser.add_argument(
+            '--host',
+            help='Host header to send (default: the first ALLOWED_HOSTS entry)',
+        )
+        parser.add_argument(
+            '--scheme',
+            choices=['http', 'https'],
+            default='http' if settings.DEBUG else 'https',
+            help='Request scheme; cached sitemaps are per scheme and host (default: https unless DEBUG)',
+        )
+
+    def handle(self, *args, **options):
+        cache = caches['default']
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            self.stdout.write(self.style.WARNING(
+                f'The default cache is {type(cache).__name__}, which the web workers do not share; '
+                'set CACHE_URL to a shared cache for warming to have any effect.'
+            ))
+
+        languages = options['languages'] or [code for code, name in settings.LANGUAGES]
+        urls = [reverse('django.contrib.sitemaps.views.sitemap')]
+        for language in languages:
+            urls.extend(self.get_hot_urls(
+                language, options['top'], options['categories'], options['tags'], options['searches'],
+            ))
+        urls = list(dict.fromkeys(urls))
+
+        self.host = options['host'] or self.get_host()
+        self.secure = options['scheme'] == 'https'
+        concurrency = max(1, min(options['concurrency'], len(urls)))
+        self.stdout.write(f'Warming {len(urls)} URL(s) with {concurrency} thread(s)...')
+
+        started = time.perf_counter()
+        with record_cache_writes() as keys:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                chunks = executor.map(self.render_urls, [urls[i::concurrency] for i in range(concurrency)])
+                results = [result for chunk in chunks for result in chunk]
+        elapsed = time.perf_counter() - started
+
+        failed = [(url, status) for url, status, seconds in results if status != 200]
+        for url, status in failed:
+            self.stdout.write(self.style.WARNING(f'  {url} returned {status}'))
+        self.stdout.write('Slowest:')
+        for url, status, seconds in sorted(results, key=lambda result: -result[2])[:5]:
+            self.stdout.write(f'  {seconds * 1000:7.0f} ms  {url}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Warmed {len(results) - len(failed)}/{len(results)} URL(s) in {elapsed:.1f}s; '
+            f'{len(keys)} cache key(s) populated'
+        ))
+
+    def get_hot_urls(self, language, top, top_categories, top_tags, top_searches):
+        """List pages and feeds, then the most viewed content, categories, tags and searches of ``language``"""
+        entries = ContentEntry.objects.published().filter(language=language)
+        hottest = entries.order_by('-views', '-id')[:top]
+        # Category pages only exist in the category's own language
+        own_language_categories = Q()
+        for content_type, indexed in INDEXED_TYPES.items():
+            own_language_categories |= Q(
+                content_type=content_type,
+                category_id__in=indexed.category_model.objects.filter(language=language).values('pk'),
+            )
+        categories = (
+            entries.filter(own_language_categories)
+            .values('content_type', 'category_slug')
+            .annotate(entry_count=Count('id'))
+            .order_by('-entry_count', 'category_slug')[:top_categories]
+        )
+        tags = (
+            Tag.objects.annotate(
+                article_count=Count('articles', filter=Q(articles__language=language, articles__status='published'))
+            )
+            .filter(article_count__gt=0)
+            .order_by('-article_count', 'slug')[:top_tags]
+        )
+        searches = (
+            SearchQueryStat.objects.filter(language=language)
+            .order_by('-searches', 'query')
+            .values_list('query', flat=True)[:top_searches]
+        )
+
+        with translation.override(language):
+            urls = [reverse(name) for name in LIST_URL_NAMES]
+            urls.extend(entry.get_absolute_url() for entry in hottest)
+            urls.extend(
+                reverse(INDEXED_TYPES[row['content_type']].category_url_name, kwargs={'slug': row['category_slug']})
+                for row in categories
+            )
+            urls.extend(reverse('articles:tag_detail', kwargs={'slug': tag.slug}) for tag in tags)
+            urls.extend(f"{reverse('core:search')}?{urlencode({'q': query})}" for query in searches)
+        return urls
+
+    def render_urls(self, urls):
+        """Render ``urls`` with this thread's own client; returns [(url, status, seconds)]"""
+        client = Client(raise_request_exception=False, HTTP_HOST=self.host, **{CACHE_WARMING_ENVIRON_KEY: True})
+        results = []
+        try:
+            for url in urls:
+                started = time.perf_counter()
+                response = client.get(url, secure=self.secure)
+                if hasattr(response, 'streaming_content'):
+                    for chunk in response.streaming_content:
+                        pass
+                results.append((url, response.status_code, time.perf_counter() - started))
+        finally:
+            # Each thread opened its own connections
+            connections.close_all()
+        return results
+
+    def get_host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        return hosts[0].lstrip('.') if hosts else 'localhost'
@@ -0,0 +1,44 @@
+"""
+Core middleware for Parsa Journal
+"""
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .db_router import pin_to_primary, unpin
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Decide per request whether reads may go to a replica.
+
+    Writes (POST etc.) and admin panel requests read from the primary. After
+    a write the client gets a short-lived cookie so that its next requests
+    (e.g. the redirect back to the article after posting a comment) also
+    read from the primary and see their own changes despite replica lag.
+    """
+    cookie_name = 'pin_primary'
+
+    def process_request(self, request):
+        admin_url = getattr(settings, 'ADMIN_URL', 'admin')
+        pinned = (
+            request.method not in SAFE_METHODS
+            or self.cookie_name in request.COOKIES
+            or request.path.startswith(f'/{admin_url}/')
+        )
+        request._replica_pin_token = pin_to_primary(pinned)
+
+    def process_response(self, request, response):
+        token = getattr(request, '_replica_pin_token', None)
+        if token is not None:
+            unpin(token)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                self.cookie_name,
+                '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
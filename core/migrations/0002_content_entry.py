@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('article', 'Article'), ('book', 'Book Review'), ('movie', 'Movie Review')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('language', models.CharField(max_length=2)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(allow_unicode=True, max_length=200)),
+                ('excerpt', models.TextField(blank=True)),
+                ('image', models.ImageField(blank=True, max_length=255, upload_to='')),
+                ('image_alt', models.CharField(blank=True, max_length=200)),
+                ('category_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('category_name', models.CharField(blank=True, max_length=100)),
+                ('category_slug', models.SlugField(allow_unicode=True, blank=True, max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='content_entries', to='accounts.author')),
+            ],
+            options={
+                'verbose_name': 'Content Entry',
+                'verbose_name_plural': 'Content Entries',
+                'ordering': ['-published_at', '-id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'published')), fields=['language', '-published_at', '-id'], name='contententry_lang_pub_idx'), models.Index(condition=models.Q(('status', 'published')), fields=['author', 'language', '-published_at', '-id'], name='contententry_author_pub_idx'), models.Index(condition=models.Q(('is_featured', True), ('status', 'published')), fields=['language', '-published_at', '-id'], name='contententry_featured_idx'), models.Index(fields=['-created_at'], name='contententry_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='contententry_object_unique')],
+            },
+        ),
+    ]
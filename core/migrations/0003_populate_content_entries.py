@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:10
+
+from django.db import migrations
+from django.db.models import Case, F, Value, When
+
+SOURCES = [
+    ('article', 'articles', 'Article', 'featured_image'),
+    ('book', 'reviews', 'BookReview', 'cover_image'),
+    ('movie', 'reviews', 'MovieReview', 'poster_image'),
+]
+
+
+def populate_entries(apps, schema_editor):
+    ContentEntry = apps.get_model('core', 'ContentEntry')
+    for content_type, app_label, model_name, image_field in SOURCES:
+        model = apps.get_model(app_label, model_name)
+        if content_type == 'article':
+            status = F('status')
+        else:
+            status = Case(When(is_published=True, then=Value('published')), default=Value('draft'))
+        rows = model.objects.order_by('pk').values(
+            'pk', 'language', 'title', 'slug', 'excerpt', 'image_alt', 'author_id', 'category_id', 'is_featured',
+            'views', 'published_at', 'created_at',
+            entry_image=F(image_field),
+            entry_category_name=F('category__name'),
+            entry_category_slug=F('category__slug'),
+            entry_status=status,
+        )
+        batch = []
+        for row in rows.iterator(chunk_size=500):
+            batch.append(ContentEntry(
+                content_type=content_type,
+                object_id=row['pk'],
+                language=row['language'],
+                title=row['title'],
+                slug=row['slug'],
+                excerpt=row['excerpt'],
+                image=row['entry_image'] or '',
+                image_alt=row['image_alt'],
+                author_id=row['author_id'],
+                category_id=row['category_id'],
+                category_name=row['entry_category_name'] or '',
+                category_slug=row['entry_category_slug'] or '',
+                status=row['entry_status'],
+                is_featured=row['is_featured'],
+                views=row['views'],
+                published_at=row['published_at'],
+                created_at=row['created_at'],
+            ))
+            if len(batch) >= 500:
+                ContentEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            ContentEntry.objects.bulk_create(batch)
+
+
+def clear_entries(apps, schema_editor):
+    apps.get_model('core', 'ContentEntry').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_content_entry'),
+        ('articles', '0007_render_existing_content'),
+        ('reviews', '0008_render_existing_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_entries, clear_entries),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_populate_content_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=2)),
+                ('query', models.CharField(max_length=200)),
+                ('searches', models.PositiveIntegerField(default=0)),
+                ('cache_hits', models.PositiveIntegerField(default=0)),
+                ('result_count', models.PositiveIntegerField(default=0)),
+                ('last_searched_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Search Query',
+                'verbose_name_plural': 'Search Queries',
+                'ordering': ['-searches'],
+                'indexes': [models.Index(fields=['language', '-searches'], name='searchquerystat_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('language', 'query'), name='searchquerystat_query_unique')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 
 
 class SiteSettings(models.Model):
@@ -72,3 +73,115 @@ class ContactMessage(models.Model):
 
     def __str__(self):
         return f"Message from {self.name} - {self.subject}"
+
+
+class ContentEntryQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(status='published')
+
+
+class ContentEntry(models.Model):
+    """
+    Denormalized index row for an article, book review or movie review.
+    Cross-type listings (author pages, admin content list, ...) query this one
+    table with DB-side ordering and pagination instead of merging three
+    querysets in Python. Maintained by core.content_index from signals;
+    `manage.py rebuild_content_index` rebuilds it from scratch.
+    """
+    TYPE_CHOICES = [
+        ('article', 'Article'),
+        ('book', 'Book Review'),
+        ('movie', 'Movie Review'),
+    ]
+
+    content_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    object_id = models.PositiveIntegerField()
+    language = models.CharField(max_length=2)
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200, allow_unicode=True)
+    excerpt = models.TextField(blank=True)
+    image = models.ImageField(max_length=255, blank=True)
+    image_alt = models.CharField(max_length=200, blank=True)
+    author = models.ForeignKey('accounts.Author', on_delete=models.CASCADE, related_name='content_entries')
+    # Categories live in three tables, so they are copied rather than referenced
+    category_id = models.PositiveIntegerField(null=True, blank=True)
+    category_name = models.CharField(max_length=100, blank=True)
+    category_slug = models.SlugField(max_length=100, blank=True, allow_unicode=True)
+    # 'draft' / 'published' / 'archived'; reviews map is_published to published/draft
+    status = models.CharField(max_length=20)
+    is_featured = models.BooleanField(default=False)
+    views = models.PositiveIntegerField(default=0)
+    published_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+
+    objects = ContentEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Content Entry'
+        verbose_name_plural = 'Content Entries'
+        ordering = ['-published_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='contententry_object_unique'),
+        ]
+        # Public listings filter on status='published'; as with the content tables,
+        # that goes into partial-index conditions rather than the key.
+        indexes = [
+            models.Index(
+                fields=['language', '-published_at', '-id'],
+                name='contententry_lang_pub_idx',
+                condition=models.Q(status='published'),
+            ),
+            models.Index(
+                fields=['author', 'language', '-published_at', '-id'],
+                name='contententry_author_pub_idx',
+                condition=models.Q(status='published'),
+            ),
+            models.Index(
+                fields=['language', '-published_at', '-id'],
+                name='contententry_featured_idx',
+                condition=models.Q(status='published', is_featured=True),
+            ),
+            models.Index(fields=['-created_at'], name='contententry_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_content_type_display()}: {self.title}"
+
+    def get_absolute_url(self):
+        from .content_index import INDEXED_TYPES
+        return reverse(INDEXED_TYPES[self.content_type].url_name, kwargs={'slug': self.slug})
+
+    def get_category_url(self):
+        from .content_index import INDEXED_TYPES
+        if not self.category_slug:
+            return ''
+        return reverse(INDEXED_TYPES[self.content_type].category_url_name, kwargs={'slug': self.category_slug})
+
+
+class SearchQueryStat(models.Model):
+    """Search counts per language and normalized query, flushed in batches by core.search"""
+    language = models.CharField(max_length=2)
+    query = models.CharField(max_length=200)
+    searches = models.PositiveIntegerField(default=0)
+    cache_hits = models.PositiveIntegerField(default=0)
+    # Result count of the latest search
+    result_count = models.PositiveIntegerField(default=0)
+    last_searched_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Search Query'
+        verbose_name_plural = 'Search Queries'
+        ordering = ['-searches']
+        constraints = [
+            models.UniqueConstraint(fields=['language', 'query'], name='searchquerystat_query_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['language', '-searches'], name='searchquerystat_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.query} ({self.language})"
+
+    @property
+    def hit_rate(self):
+        return self.cache_hits / self.searches if self.searches else 0
@@ -0,0 +1,134 @@
+"""
+Rate limiting for Parsa Journal
+Sliding-window counters kept in the cache with atomic increments, so limits
+hold across gunicorn workers as long as CACHE_URL points at a shared cache
+(Redis). Policies are named in settings.RATELIMIT_POLICIES and applied with
+the @ratelimit decorator; limited requests get a 429 before the view - and
+the ORM - runs.
+"""
+from dataclasses import dataclass
+from functools import wraps
+import ipaddress
+import logging
+import math
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+PERIOD_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@dataclass(frozen=True)
+class Policy:
+    limit: int
+    window: int  # seconds
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    limited: bool
+    count: float
+    retry_after: int
+
+
+def parse_rate(rate):
+    """'5/15m' -> Policy(limit=5, window=900)"""
+    match = RATE_RE.match(rate.replace(' ', ''))
+    if not match:
+        raise ValueError(f"Invalid rate '{rate}', expected e.g. '5/m' or '10/15m'")
+    limit, multiplier, period = match.groups()
+    return Policy(int(limit), int(multiplier or 1) * PERIOD_SECONDS[period])
+
+
+def get_policy(name):
+    return parse_rate(settings.RATELIMIT_POLICIES[name])
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
+
+
+def get_client_ip(request):
+    """
+    Client address for rate limiting and Comment.ip_address: REMOTE_ADDR, or
+    settings.RATELIMIT_CLIENT_IP_HEADER when a trusted proxy overwrites that
+    header (nginx sets X-Real-IP from the peer address). X-Forwarded-For is
+    client-controlled and would allow trivial bypass. Values that aren't an IP
+    address fall back to REMOTE_ADDR.
+    """
+    header = getattr(settings, 'RATELIMIT_CLIENT_IP_HEADER', None)
+    if header and request.META.get(header):
+        ip = _valid_ip(request.META[header])
+        if ip:
+            return ip
+    return _valid_ip(request.META.get('REMOTE_ADDR', '')) or '0.0.0.0'
+
+
+def _increment(cache, key, timeout):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # First hit in this window; add() loses the race if another worker created it
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        return cache.incr(key)
+
+
+def hit(policy_name, key):
+    """
+    Count one request for ``key`` under the named policy and report whether it
+    is over the limit. Sliding window: the current fixed window's count plus
+    the previous window's count weighted by how much of it still overlaps.
+    """
+    policy = get_policy(policy_name)
+    cache = caches[settings.RATELIMIT_CACHE]
+    window_index, elapsed = divmod(time.time(), policy.window)
+    base = f'ratelimit:{policy_name}:{key}'
+
+    current = _increment(cache, f'{base}:{int(window_index)}', timeout=policy.window * 2)
+    previous = cache.get(f'{base}:{int(window_index) - 1}', 0)
+    remaining = 1 - elapsed / policy.window
+    count = previous * remaining + current
+    if count <= policy.limit:
+        return RateLimitResult(False, count, 0)
+
+    if current > policy.limit:
+        retry_after = policy.window - elapsed
+    else:
+        # Wait until enough of the previous window has slid out
+        retry_after = policy.window * (remaining - (policy.limit - current) / previous)
+    return RateLimitResult(True, count, max(1, math.ceil(retry_after)))
+
+
+def too_many_requests(result):
+    response = HttpResponse('Too many requests. Please try again later.', status=429, content_type='text/plain')
+    response['Retry-After'] = str(result.retry_after)
+    return response
+
+
+def ratelimit(policy_name, methods=('POST',), key=get_client_ip):
+    """
+    View decorator applying the named policy per client IP (or ``key(request)``).
+    Only requests with one of ``methods`` are counted - by default the writes.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method in methods:
+                client = key(request)
+                result = hit(policy_name, client)
+                if result.limited:
+                    logger.warning(f"Rate limited '{policy_name}' for {client} ({result.count:.1f} requests in window)")
+                    return too_many_requests(result)
+            return view_func(request, *args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,179 @@
+"""
+Cached, ranked site search
+Articles, book reviews and movie reviews matching a query are scored in the
+database (a title match outweighs a match in the excerpt, which outweighs one
+in the body) and merged into one ranked list of (content_type, id) pairs. That
+list, not rendered HTML, is cached on the language and the normalized query
+through the versioned keys of core/caching.py, so any content change
+invalidates every cached search at once. Only the requested page is loaded,
+from the ContentEntry index, so rendering cost is bounded by the page size no
+matter how many documents match.
+
+Each search is counted per (language, query) in process memory and flushed to
+SearchQueryStat in batches, so `manage.py search_stats` can show which queries
+dominate and `manage.py warm_cache --searches N` can pre-warm them.
+"""
+from collections import Counter
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from articles.models import Article, Tag
+from reviews.models import BookReview, MovieReview
+
+from .caching import make_cache_key
+from .models import ContentEntry, SearchQueryStat
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_LENGTH = 200
+
+# Content type -> (model, published filter, {field matched: score of a match})
+SEARCH_TYPES = {
+    'article': (Article, Q(status='published'), {'title': 8, 'excerpt': 2, 'content': 1}),
+    'book': (BookReview, Q(is_published=True), {'title': 8, 'book_title': 4, 'book_author': 4, 'excerpt': 2, 'content': 1}),
+    'movie': (MovieReview, Q(is_published=True), {'title': 8, 'movie_title': 4, 'director': 4, 'excerpt': 2, 'content': 1}),
+}
+TAG_MATCH_SCORE = 4
+
+# ContentEntry columns a result card shows
+CARD_FIELDS = [
+    'content_type', 'object_id', 'language', 'title', 'slug', 'excerpt', 'image', 'image_alt',
+    'category_name', 'category_slug', 'views', 'published_at',
+]
+
+
+def normalize_query(query):
+    """Collapse whitespace and case so equivalent queries share a cache entry and a stats row"""
+    return ' '.join((query or '').split()).casefold()[:MAX_QUERY_LENGTH]
+
+
+def _score(content_type, query):
+    model, published, weights = SEARCH_TYPES[content_type]
+    terms = [When(Q(**{f'{field}__icontains': query}), then=Value(weight)) for field, weight in weights.items()]
+    if content_type == 'article':
+        # A subquery rather than a join, so an article with several matching tags is one row
+        tag_match = Exists(Tag.objects.filter(articles=OuterRef('pk'), name__icontains=query))
+        terms.append(When(tag_match, then=Value(TAG_MATCH_SCORE)))
+    score = Value(0)
+    for term in terms:
+        score = score + Case(term, default=Value(0), output_field=IntegerField())
+    return score
+
+
+def search(language, query):
+    """[(content_type, id)] of published content of ``language`` matching ``query``, best match first"""
+    matches = []
+    for content_type, (model, published, weights) in SEARCH_TYPES.items():
+        rows = (
+            model.objects.filter(published, language=language)
+            .annotate(score=_score(content_type, query))
+            .filter(score__gt=0)
+            .order_by()
+            .values_list('id', 'score', 'published_at')
+        )
+        matches.extend((score, published_at, content_type, pk) for pk, score, published_at in rows)
+    # Equal scores fall back to the newest first
+    matches.sort(key=lambda match: (match[0], match[1].timestamp() if match[1] else 0, match[3]), reverse=True)
+    return [(content_type, pk) for score, published_at, content_type, pk in matches]
+
+
+def cached_search(language, query, record=True):
+    """search() for the normalized ``query``, served from the cache when possible"""
+    query = normalize_query(query)
+    key = make_cache_key('search_ranked', language, query)
+    results = cache.get(key)
+    hit = results is not None
+    if not hit:
+        results = search(language, query)
+        cache.set(key, results, settings.SEARCH_CACHE_TIMEOUT)
+    if record:
+        record_search(language, query, hit, len(results))
+    return results
+
+
+def type_counts(results):
+    """{content_type: matches} for a result list"""
+    counts = Counter(content_type for content_type, pk in results)
+    return {content_type: counts[content_type] for content_type in SEARCH_TYPES}
+
+
+def load_entries(results):
+    """ContentEntry cards for a page of (content_type, id) pairs, in the same order"""
+    if not results:
+        return []
+    wanted = Q()
+    for content_type in SEARCH_TYPES:
+        ids = [pk for result_type, pk in results if result_type == content_type]
+        if ids:
+            wanted |= Q(content_type=content_type, object_id__in=ids)
+    entries = {
+        (entry.content_type, entry.object_id): entry
+        for entry in ContentEntry.objects.filter(wanted).only(*CARD_FIELDS)
+    }
+    # Skip anything deleted or unpublished since the list was cached
+    return [entries[result] for result in results if result in entries]
+
+
+# -- statistics -------------------------------------------------------------
+
+_stats_lock = threading.Lock()
+# (language, query) -> [searches, cache hits, result count of the latest search]
+_pending_stats = {}
+_last_flush = time.monotonic()
+
+
+def record_search(language, query, hit, result_count):
+    """Count a search; buffered counts are written every SEARCH_STATS_FLUSH_INTERVAL seconds"""
+    global _last_flush
+    with _stats_lock:
+        counts = _pending_stats.setdefault((language, query), [0, 0, 0])
+        counts[0] += 1
+        counts[1] += int(hit)
+        counts[2] = result_count
+        due = (
+            time.monotonic() - _last_flush >= settings.SEARCH_STATS_FLUSH_INTERVAL
+            or len(_pending_stats) >= settings.SEARCH_STATS_MAX_PENDING
+        )
+        if not due:
+            return
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _last_flush = time.monotonic()
+    flush_stats(pending)
+
+
+def flush_stats(pending=None):
+    """Add buffered counts to SearchQueryStat (all of this process's, by default)"""
+    if pending is None:
+        with _stats_lock:
+            pending = dict(_pending_stats)
+            _pending_stats.clear()
+    if not pending:
+        return 0
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            # Create missing rows first so every query below is a plain increment
+            SearchQueryStat.objects.bulk_create(
+                [SearchQueryStat(language=language, query=query, last_searched_at=now) for language, query in pending],
+                ignore_conflicts=True,
+            )
+            for (language, query), (searches, hits, result_count) in pending.items():
+                SearchQueryStat.objects.filter(language=language, query=query).update(
+                    searches=F('searches') + searches,
+                    cache_hits=F('cache_hits') + hits,
+                    result_count=result_count,
+                    last_searched_at=now,
+                )
+    except DatabaseError:
+        # Statistics are best effort; never fail a search over them
+        logger.exception("Could not save search statistics")
+        return 0
+    return len(pending)
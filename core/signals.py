@@ -0,0 +1,108 @@
+"""
+Content change notifications for Parsa Journal
+Saving or deleting public content sends ``content_changed`` once the
+transaction commits; cached output listens to it to invalidate itself.
+Bulk operations wrap their writes in ``batch_content_changes()`` so a change
+to many rows (or several models) is announced once instead of per row.
+"""
+from contextlib import contextmanager
+from functools import partial
+import threading
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .caching import bump_content_version
+
+# Sent with sender=<model class> after content of that model changed, and
+# models=<set of model classes> (more than one for a batch spanning models)
+content_changed = Signal()
+
+CONTENT_MODELS = [
+    'articles.Article',
+    'articles.Category',
+    'articles.Tag',
+    'reviews.BookReview',
+    'reviews.MovieReview',
+    'reviews.BookCategory',
+    'reviews.MovieCategory',
+    'accounts.Author',
+]
+
+# Saves that only touch these fields (e.g. increment_views()) don't change public output
+NON_CONTENT_FIELDS = {'views'}
+
+
+_batch = threading.local()
+
+
+def _send_content_changed(models):
+    models = frozenset(models)
+    sender = next(iter(models)) if len(models) == 1 else None
+    content_changed.send(sender=sender, models=models)
+
+
+def notify_content_changed(*models):
+    """Send content_changed for ``models`` when the current transaction commits"""
+    pending = getattr(_batch, 'models', None)
+    if pending is not None:
+        pending.update(models)
+        return
+    transaction.on_commit(partial(_send_content_changed, models))
+
+
+@contextmanager
+def batch_content_changes():
+    """
+    Collect the content_changed notifications raised inside the block (per-row
+    post_save/post_delete included) and send a single one on exit. Nested
+    blocks fold into the outermost one.
+    """
+    if getattr(_batch, 'models', None) is not None:
+        yield
+        return
+    _batch.models = set()
+    try:
+        yield
+    finally:
+        models, _batch.models = _batch.models, None
+    if models:
+        notify_content_changed(*models)
+
+
+def content_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= NON_CONTENT_FIELDS:
+        return
+    notify_content_changed(sender)
+
+
+def content_deleted(sender, instance, **kwargs):
+    notify_content_changed(sender)
+
+
+def article_tags_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        notify_content_changed(type(instance))
+
+
+@receiver(content_changed)
+def invalidate_content_caches(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(content_changed)
+def schedule_autocomplete_rebuild(sender, **kwargs):
+    from .autocomplete import schedule_rebuild
+    schedule_rebuild()
+
+
+def connect_content_signals():
+    """Called from CoreConfig.ready()"""
+    for label in CONTENT_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(content_saved, sender=model, dispatch_uid=f'content_saved_{label}')
+        post_delete.connect(content_deleted, sender=model, dispatch_uid=f'content_deleted_{label}')
+    article_tags = apps.get_model('articles.Article').tags.through
+    m2m_changed.connect(article_tags_changed, sender=article_tags, dispatch_uid='article_tags_changed')
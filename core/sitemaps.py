@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import sitemap as sitemap_view
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.urls import reverse
 from articles.models import Article, Category
+from core.caching import make_cache_key
 from reviews.models import BookReview, MovieReview
 
 
@@ -55,3 +60,20 @@ class StaticViewSitemap(Sitemap):
     def location(self, item):
         return reverse(item)
 
+
+
+def cached_sitemap(request, sitemaps, **kwargs):
+    """sitemap.xml, rendered once per content version and page"""
+    key = make_cache_key('sitemap', request.scheme, request.get_host(), request.GET.get('p', '1'))
+    cached = cache.get(key)
+    if cached is None:
+        response = sitemap_view(request, sitemaps, **kwargs)
+        if response.status_code != 200:
+            return response
+        response.render()
+        cached = {
+            'content': response.content,
+            'headers': {name: response[name] for name in ('Content-Type', 'X-Robots-Tag', 'Last-Modified') if response.has_header(name)},
+        }
+        cache.set(key, cached, settings.SITEMAP_CACHE_TIMEOUT)
+    return HttpResponse(cached['content'], headers=cached['headers'])
@@ -0,0 +1,71 @@
+"""
+Content-addressed media storage
+Uploads are stored under a hash of their bytes instead of their original file
+name, keeping the upload_to directory:
+
+    articles/cover.jpg  ->  articles/3f/9a0c...e1.jpg
+
+A file's URL therefore changes whenever its content does, so /media/ can be
+served with a year-long immutable Cache-Control (see nginx.conf), and
+uploading the same bytes to the same directory twice stores them once.
+Because rows may share a file, nothing should delete media through the
+storage while a row still references it; `manage.py rehash_media --delete-originals` only removes files
+nothing points to any more.
+"""
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+
+HASH_LENGTH = 32
+CHUNK_SIZE = 64 * 1024
+
+# <upload_to>/<2 hex>/<30 hex>[.ext]
+HASHED_NAME_RE = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{%d}(\.[a-z0-9]+)?$' % (HASH_LENGTH - 2))
+
+
+def content_hash(content):
+    """Hex digest of a File's bytes, read in chunks; leaves the file at position 0"""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name, digest):
+    """Storage name for content ``digest`` uploaded as ``name``"""
+    directory, filename = posixpath.split(name.replace('\\', '/'))
+    extension = os.path.splitext(filename)[1].lower()
+    return posixpath.join(directory, digest[:2], digest[2:] + extension)
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(name or ''))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and skips writing bytes it already has"""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        validate_file_name(name, allow_relative_path=True)
+        name = hashed_name(name, content_hash(content))
+        if self.exists(name):
+            # Identical bytes are already stored under this name
+            return name
+        # If a concurrent upload of the same bytes won the race, _save() picks
+        # an alternative name; that costs a duplicate, never a wrong file.
+        name = self._save(name, content)
+        validate_file_name(name, allow_relative_path=True)
+        return name
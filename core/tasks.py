@@ -0,0 +1,34 @@
+"""
+Background tasks for core (registered with the tasks queue)
+"""
+import logging
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+from tasks.queue import task
+
+from . import autocomplete
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def rebuild_autocomplete_index():
+    """Rebuild the search autocomplete index file from published content"""
+    autocomplete.build_index()
+
+
+@task(max_attempts=5)
+def purge_proxy_cache(paths):
+    """Send a PURGE request for each path to CACHE_PURGE_URL (see core/cache_policy.py)"""
+    base = settings.CACHE_PURGE_URL.rstrip('/')
+    for path in paths:
+        try:
+            urlopen(Request(base + path, method='PURGE'), timeout=settings.CACHE_PURGE_TIMEOUT).close()
+        except HTTPError as exc:
+            # 404: nothing cached under that path
+            if exc.code != 404:
+                raise
+    logger.info(f"Purged {len(paths)} path(s) from the proxy cache")
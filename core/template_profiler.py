@@ -0,0 +1,161 @@
+"""
+Opt-in template render profiler
+With TEMPLATE_PROFILING on, Template rendering, {% block %}, {% include %},
+{% url %} and the core_extras filters are wrapped with timers. Each request
+gets a Recorder; TemplateProfilerMiddleware logs the heaviest entries and, for
+DEBUG or superusers, appends a panel to HTML pages. Times are split into total
+(including nested entries) and self (excluding them), so the panel shows which
+fragment itself is worth caching.
+
+Nothing is patched when the setting is off.
+"""
+import functools
+import html
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Template
+from django.template.defaulttags import URLNode
+from django.template.loader_tags import BlockNode, IncludeNode
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_recorder = ContextVar('template_profiler_recorder', default=None)
+
+# Filter libraries whose filters are timed (they are plain Python, unlike the built-ins)
+PROFILED_FILTER_LIBRARIES = ['core.templatetags.core_extras']
+
+
+class Recorder:
+    """Per-request timings keyed by (kind, name): [calls, total seconds, self seconds]"""
+
+    def __init__(self):
+        self.stats = {}
+        self.stack = []
+        # Time in outermost entries, i.e. total template rendering time
+        self.total = 0.0
+
+    def enter(self):
+        self.stack.append(0.0)
+        return time.perf_counter()
+
+    def exit(self, kind, name, started):
+        elapsed = time.perf_counter() - started
+        nested = self.stack.pop()
+        if self.stack:
+            self.stack[-1] += elapsed
+        else:
+            self.total += elapsed
+        entry = self.stats.setdefault((kind, name), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += elapsed - nested
+
+    def rows(self, limit=None):
+        """(kind, name, calls, total ms, self ms), heaviest self time first"""
+        rows = [
+            (kind, name, calls, total * 1000, own * 1000)
+            for (kind, name), (calls, total, own) in self.stats.items()
+        ]
+        rows.sort(key=lambda row: -row[4])
+        return rows[:limit]
+
+
+def _timed(kind, label):
+    """Decorator timing ``func`` as (kind, label(*args)) while a Recorder is active"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            started = recorder.enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.exit(kind, label(*args), started)
+        wrapper._template_profiler = True
+        return wrapper
+    return decorator
+
+
+def install():
+    """Wrap the template classes and filters; called from CoreConfig.ready() when enabled"""
+    if getattr(Template._render, '_template_profiler', False):
+        return
+    Template._render = _timed('template', lambda template, context: template.name or '<string>')(Template._render)
+    BlockNode.render = _timed('block', lambda node, context: node.name)(BlockNode.render)
+    IncludeNode.render = _timed('include', lambda node, context: node.template.token)(IncludeNode.render)
+    URLNode.render = _timed('tag', lambda node, context: 'url')(URLNode.render)
+
+    for library_path in PROFILED_FILTER_LIBRARIES:
+        library = import_string(f'{library_path}.register')
+        # Templates look filters up in this dict when they are compiled, so this
+        # must run before the first template is loaded. functools.wraps keeps
+        # the is_safe / needs_autoescape flags and the signature for args_check.
+        for name, func in library.filters.items():
+            library.filters[name] = _timed('filter', lambda *args, name=name: name)(func)
+
+
+class TemplateProfilerMiddleware:
+    """Record template timings per request; log them and show a panel on HTML pages"""
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = Recorder()
+        token = _recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+            # TemplateResponses render lazily, after the view returns
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        finally:
+            _recorder.reset(token)
+
+        if not recorder.stats:
+            return response
+        total_ms = recorder.total * 1000
+        response['Server-Timing'] = f'templates;dur={total_ms:.1f}'
+        level = logging.WARNING if total_ms >= settings.TEMPLATE_PROFILING_SLOW_MS else logging.INFO
+        logger.log(
+            level, 'Templates for %s took %.1f ms; heaviest: %s', request.path, total_ms,
+            ', '.join(f'{kind} {name} {own:.1f} ms/{calls}x' for kind, name, calls, total, own in recorder.rows(5)),
+        )
+        if self.show_panel(request, response):
+            content = response.content.decode(response.charset)
+            position = content.rfind('</body>')
+            if position != -1:
+                content = content[:position] + self.render_panel(recorder, total_ms) + content[position:]
+                response.content = content.encode(response.charset)
+        return response
+
+    def show_panel(self, request, response):
+        user = getattr(request, 'user', None)
+        return (
+            (settings.DEBUG or (user is not None and user.is_superuser))
+            and response.status_code == 200
+            and not response.streaming
+            and response.get('Content-Type', '').startswith('text/html')
+        )
+
+    def render_panel(self, recorder, total_ms):
+        rows = ''.join(
+            f'<tr><td>{kind}</td><td>{html.escape(str(name))}</td><td>{calls}</td>'
+            f'<td>{total:.2f}</td><td>{own:.2f}</td></tr>'
+            for kind, name, calls, total, own in recorder.rows(settings.TEMPLATE_PROFILING_PANEL_ROWS)
+        )
+        return (
+            '<details id="template-profile" dir="ltr" style="position:fixed;bottom:0;right:0;z-index:9999;'
+            'max-height:60vh;overflow:auto;background:#fff;border:1px solid #ccc;font:12px monospace;padding:4px">'
+            f'<summary>Templates: {total_ms:.1f} ms</summary>'
+            '<table><tr><th>kind</th><th>name</th><th>calls</th><th>total ms</th><th>self ms</th></tr>'
+            f'{rows}</table></details>'
+        )
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Tuple
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 
 from django import template
 from django.utils import timezone, translation
@@ -29,12 +30,12 @@ PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
 TIME_TOKENS = set("HhGgisuaA")
 
 
-def _normalize_value(value: date | datetime | None) -> date | datetime | None:
+def _normalize_value(value: date | datetime | None, tz=None) -> date | datetime | None:
     if value is None:
         return None
     if isinstance(value, datetime):
         if timezone.is_aware(value):
-            value = timezone.localtime(value)
+            value = timezone.localtime(value, tz)
         return value
     if isinstance(value, date):
         return value
@@ -83,6 +84,70 @@ def _include_time(fmt: str | None) -> bool:
     return any(token in fmt for token in TIME_TOKENS)
 
 
+# Table-driven conversion: the ordinal of 1 Farvardin for every Jalali year in
+# range, plus a day-of-year -> (month, day) table. Built once at import from the
+# arithmetic algorithm above, which stays as the fallback outside the range.
+JALALI_TABLE_FIRST_YEAR = 1200  # 1821 CE
+JALALI_TABLE_LAST_YEAR = 1600  # 2222 CE
+
+
+def _build_nowruz_ordinals() -> List[int]:
+    ordinals = []
+    for jy in range(JALALI_TABLE_FIRST_YEAR, JALALI_TABLE_LAST_YEAR + 2):
+        gy = jy + 621
+        for g_day in range(19, 24):
+            if _gregorian_to_jalali(gy, 3, g_day) == (jy, 1, 1):
+                ordinals.append(date(gy, 3, g_day).toordinal())
+                break
+    return ordinals
+
+
+def _build_day_of_year_table() -> List[Tuple[int, int]]:
+    table = []
+    for month, days in enumerate(JALALI_MONTH_DAYS, start=1):
+        table.extend((month, day) for day in range(1, days + 1))
+    table.append((12, 30))  # Esfand 30 in leap years
+    return table
+
+
+NOWRUZ_ORDINALS = _build_nowruz_ordinals()
+DAY_OF_YEAR_TABLE = _build_day_of_year_table()
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    """
+    NumPy, imported on first use rather than at worker boot (it costs more than
+    the rest of the template libraries together), or None when not installed.
+    """
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional; localized_dates() falls back to per-item lookups
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=1)
+def _nowruz_array():
+    np = _numpy()
+    return np.array(NOWRUZ_ORDINALS, dtype=np.int64)
+
+
+def _ordinal_to_jalali(ordinal: int) -> Tuple[int, int, int]:
+    """O(1) conversion of a proleptic Gregorian ordinal to (jy, jm, jd)"""
+    if not NOWRUZ_ORDINALS[0] <= ordinal < NOWRUZ_ORDINALS[-1]:
+        value = date.fromordinal(ordinal)
+        return _gregorian_to_jalali(value.year, value.month, value.day)
+    # Mean Jalali year is 12053 / 33 days; the estimate is off by at most one year
+    index = (ordinal - NOWRUZ_ORDINALS[0]) * 33 // 12053
+    if ordinal < NOWRUZ_ORDINALS[index]:
+        index -= 1
+    elif ordinal >= NOWRUZ_ORDINALS[index + 1]:
+        index += 1
+    jm, jd = DAY_OF_YEAR_TABLE[ordinal - NOWRUZ_ORDINALS[index]]
+    return JALALI_TABLE_FIRST_YEAR + index, jm, jd
+
+
 def _jalali_date(value: date | datetime, include_time: bool = False) -> str:
     if isinstance(value, datetime):
         dt_value = value
@@ -91,9 +156,8 @@ def _jalali_date(value: date | datetime, include_time: bool = False) -> str:
         dt_value = None
         date_value = value
 
-    jy, jm, jd = _gregorian_to_jalali(date_value.year, date_value.month, date_value.day)
-    parts = [str(jd), JALALI_MONTH_NAMES[jm - 1], str(jy)]
-    result = " ".join(parts)
+    jy, jm, jd = _ordinal_to_jalali(date_value.toordinal())
+    result = f"{jd} {JALALI_MONTH_NAMES[jm - 1]} {jy}"
 
     if include_time and dt_value is not None:
         result = f"{result}, {dt_value.strftime('%H:%M')}"
@@ -101,21 +165,81 @@ def _jalali_date(value: date | datetime, include_time: bool = False) -> str:
     return _to_persian_digits(result)
 
 
-@register.filter
-def localized_date(value: date | datetime | None, fmt: str = "F d, Y") -> str:
-    normalized = _normalize_value(value)
-    if normalized is None:
-        return ""
+def _current_language() -> str:
+    return (translation.get_language() or "en").split("-")[0]
 
-    current_lang = (translation.get_language() or "en").split("-")[0]
 
-    if current_lang == "fa":
+@lru_cache(maxsize=8192)
+def _format_localized_date(value: date | datetime, fmt: str, lang: str, tz) -> str:
+    """Fully formatted date string, memoized per (value, format, language, timezone)"""
+    normalized = _normalize_value(value, tz)
+    if lang == "fa":
         return _jalali_date(normalized, include_time=_include_time(fmt))
-
-    with translation.override(current_lang or "en"):
+    with translation.override(lang or "en"):
         return date_format(normalized, fmt)
 
 
+def _is_aware(value: date | datetime) -> bool:
+    return isinstance(value, datetime) and value.utcoffset() is not None
+
+
+def _key_timezone(value: date | datetime):
+    # Only aware datetimes depend on the active timezone; skip the lookup otherwise
+    if _is_aware(value):
+        return timezone.get_current_timezone()
+    return None
+
+
+@register.filter
+def localized_date(value: date | datetime | None, fmt: str = "F d, Y") -> str:
+    if not isinstance(value, (date, datetime)):
+        return ""
+    return _format_localized_date(value, fmt, _current_language(), _key_timezone(value))
+
+
+def localized_dates(values: Iterable[date | datetime | None], fmt: str = "F d, Y", lang: str | None = None) -> List[str]:
+    """
+    Format a whole list of dates/datetimes in one call (lists, exports, labels).
+    Language and timezone are resolved once; Persian conversions are vectorized
+    with NumPy when it is installed.
+    """
+    values = list(values)
+    lang = lang or _current_language()
+    tz = timezone.get_current_timezone()
+    np = _numpy()
+    if lang != "fa" or np is None:
+        return [
+            _format_localized_date(value, fmt, lang, tz if _is_aware(value) else None)
+            if isinstance(value, (date, datetime)) else ""
+            for value in values
+        ]
+
+    include_time = _include_time(fmt)
+    # Listing pages repeat the same timestamps; convert each distinct value once
+    unique = list(dict.fromkeys(value for value in values if isinstance(value, (date, datetime))))
+    normalized = [_normalize_value(value, tz) for value in unique]
+    ordinals = np.fromiter(
+        (value.toordinal() for value in normalized), dtype=np.int64, count=len(normalized)
+    )
+    nowruz = _nowruz_array()
+    in_range = (ordinals >= NOWRUZ_ORDINALS[0]) & (ordinals < NOWRUZ_ORDINALS[-1])
+    year_index = np.searchsorted(nowruz, ordinals, side="right") - 1
+    day_of_year = ordinals - nowruz[np.clip(year_index, 0, len(nowruz) - 1)]
+
+    formatted = {}
+    for position, (value, local_value) in enumerate(zip(unique, normalized)):
+        if in_range[position]:
+            jm, jd = DAY_OF_YEAR_TABLE[day_of_year[position]]
+            jy = JALALI_TABLE_FIRST_YEAR + int(year_index[position])
+        else:
+            jy, jm, jd = _ordinal_to_jalali(int(ordinals[position]))
+        text = f"{jd} {JALALI_MONTH_NAMES[jm - 1]} {jy}"
+        if include_time and isinstance(local_value, datetime):
+            text = f"{text}, {local_value.strftime('%H:%M')}"
+        formatted[value] = _to_persian_digits(text)
+    return [formatted.get(value, "") if isinstance(value, (date, datetime)) else "" for value in values]
+
+
 @register.filter
 def localized_number(value: int | float | str | None) -> str:
     if value is None:
@@ -1,3 +1,184 @@
-from django.test import TestCase
+from datetime import date, timedelta
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from accounts.models import Author
+from articles.models import Article
+from core.importer import ContentImporter, ParsedRow
+from core.ratelimit import hit
+from core.storage import ContentAddressedStorage, is_hashed_name
+from core.templatetags.core_extras import _gregorian_to_jalali, _ordinal_to_jalali, localized_dates
+
+from .content_pipeline import render_content
+
+
+class RenderContentTests(SimpleTestCase):
+    def render(self, html):
+        return render_content(html, internal_hosts=['parsajournal.ir']).html
+
+    def test_disallowed_tags_are_unwrapped(self):
+        self.assertEqual(self.render('<p>a <font color="red">b</font></p>'), '<p>a b</p>')
+
+    def test_disallowed_attributes_are_dropped(self):
+        self.assertEqual(
+            self.render('<p class="lead" style="color:red" onclick="x()">a</p>'),
+            '<p class="lead">a</p>',
+        )
+
+    def test_unsafe_urls_are_dropped(self):
+        self.assertEqual(self.render('<a href="javascript:alert(1)">a</a>'), '<a>a</a>')
+        self.assertEqual(self.render('<img src="data:image/png;base64,AA">'), '')
+
+    def test_dropped_elements_lose_their_content(self):
+        self.assertEqual(self.render('<script>alert(1)</script><p>after</p>'), '<p>after</p>')
+        self.assertEqual(self.render('<svg><g><text>x</text></g></svg><p>after</p>'), '<p>after</p>')
+
+    def test_self_closing_child_of_dropped_element(self):
+        self.assertEqual(self.render('<svg><circle r="1"/></svg><p>after</p>'), '<p>after</p>')
+        self.assertEqual(self.render('<math><mi/></math><p>after</p>'), '<p>after</p>')
+
+    def test_self_closing_dropped_element(self):
+        self.assertEqual(self.render('<script/><p>after</p>'), '<p>after</p>')
+
+    def test_unclosed_tags_are_closed(self):
+        self.assertEqual(self.render('<ul><li><b>a</ul><p>b'), '<ul><li><b>a</b></li></ul><p>b</p>')
+
+    def test_external_links_and_images(self):
+        self.assertEqual(
+            self.render('<a href="https://example.com/">a</a><a href="https://parsajournal.ir/x">b</a>'),
+            '<a href="https://example.com/" rel="noopener noreferrer nofollow" target="_blank">a</a>'
+            '<a href="https://parsajournal.ir/x">b</a>',
+        )
+        self.assertEqual(
+            self.render('<img src="/media/a.jpg" alt="a">'),
+            '<img src="/media/a.jpg" alt="a" loading="lazy" decoding="async">',
+        )
+
+    def test_heading_anchors_are_unique(self):
+        html = self.render('<h2>Intro</h2><h2>Intro</h2>')
+        self.assertIn('<h2 id="intro">', html)
+        self.assertIn('<h2 id="intro-2">', html)
+
+    def test_word_count_skips_dropped_content(self):
+        rendered = render_content('<p>one two</p><script>three four</script>', internal_hosts=[])
+        self.assertEqual((rendered.word_count, rendered.reading_time), (2, 1))
+
+
+@override_settings(RATELIMIT_POLICIES={'test': '3/m'})
+class SlidingWindowTests(SimpleTestCase):
+    WINDOW_START = 6000.0  # a multiple of the 60s window
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def hit_at(self, elapsed):
+        with mock.patch('core.ratelimit.time') as clock:
+            clock.time.return_value = self.WINDOW_START + elapsed
+            return hit('test', '203.0.113.1')
+
+    def test_limit_within_one_window(self):
+        for _ in range(3):
+            self.assertFalse(self.hit_at(0).limited)
+        result = self.hit_at(10)
+        self.assertTrue(result.limited)
+        self.assertEqual(result.retry_after, 50)
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(4):
+            self.hit_at(0)
+        # Half of the previous window (4 hits) still overlaps: 2 + 1
+        result = self.hit_at(90)
+        self.assertFalse(result.limited)
+        self.assertEqual(result.count, 3)
+        # 2 + 2 is over the limit until a quarter more of the previous window slides out
+        result = self.hit_at(90)
+        self.assertTrue(result.limited)
+        self.assertEqual(result.retry_after, 15)
+
+    def test_keys_are_counted_separately(self):
+        for _ in range(4):
+            self.hit_at(0)
+        with mock.patch('core.ratelimit.time') as clock:
+            clock.time.return_value = self.WINDOW_START
+            self.assertFalse(hit('test', '203.0.113.2').limited)
+
+
+class AssignSlugsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user('writer')
+        cls.author = Author.objects.create(user=user, display_name='Writer', slug='writer')
+        for slug in ('hello', 'hello-2', 'hello-world-extra'):
+            Article.objects.create(title=slug, slug=slug, author=cls.author, excerpt='x', content='x')
+
+    def rows(self, *values):
+        return [ParsedRow(line, 'article', dict(row), author='writer') for line, row in enumerate(values, 1)]
+
+    def test_collisions_get_the_next_free_number(self):
+        rows = ContentImporter().assign_slugs(Article, self.rows({'title': 'Hello'}, {'title': 'Hello'}))
+        self.assertEqual([row.values['slug'] for row in rows], ['hello-3', 'hello-4'])
+
+    def test_repeated_titles_within_a_batch(self):
+        Article.objects.create(title='x', slug='new-title-2', author=self.author, excerpt='x', content='x')
+        rows = ContentImporter().assign_slugs(Article, self.rows({'title': 'New title'}, {'title': 'New title'}))
+        self.assertEqual([row.values['slug'] for row in rows], ['new-title', 'new-title-3'])
+
+    def test_existing_explicit_slugs_are_skipped(self):
+        importer = ContentImporter()
+        rows = importer.assign_slugs(
+            Article, self.rows({'slug': 'hello', 'title': 'Hello'}, {'slug': 'fresh', 'title': 'Fresh'}),
+        )
+        self.assertEqual([row.values['slug'] for row in rows], ['fresh'])
+        self.assertEqual(importer.stats.skipped, 1)
+
+    def test_explicit_slug_is_not_reused_for_a_title(self):
+        rows = ContentImporter().assign_slugs(Article, self.rows({'slug': 'fresh', 'title': 'x'}, {'title': 'Fresh'}))
+        self.assertEqual([row.values['slug'] for row in rows], ['fresh', 'fresh-2'])
+
+
+class JalaliConversionTests(SimpleTestCase):
+    def test_table_matches_the_arithmetic_conversion(self):
+        day = date(1990, 1, 1)
+        while day < date(2040, 1, 1):
+            self.assertEqual(
+                _ordinal_to_jalali(day.toordinal()), _gregorian_to_jalali(day.year, day.month, day.day), day,
+            )
+            day += timedelta(days=1)
+
+    def test_known_dates(self):
+        self.assertEqual(_ordinal_to_jalali(date(2024, 3, 20).toordinal()), (1403, 1, 1))
+        self.assertEqual(_ordinal_to_jalali(date(2025, 3, 20).toordinal()), (1403, 12, 30))
+        # Outside the table the arithmetic conversion is used
+        self.assertEqual(_ordinal_to_jalali(date(1800, 3, 21).toordinal()), _gregorian_to_jalali(1800, 3, 21))
+
+    def test_localized_dates_matches_single_conversion(self):
+        values = [date(2024, 3, 20), None, date(2024, 3, 20), date(1700, 1, 1)]
+        formatted = localized_dates(values, lang='fa')
+        self.assertEqual(formatted[1], '')
+        self.assertEqual(formatted[0], formatted[2])
+        self.assertIn('۱۴۰۳', formatted[0])
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_name_is_the_content_hash(self):
+        name = self.storage.save('articles/Cover.JPG', ContentFile(b'image'))
+        self.assertTrue(name.startswith('articles/'))
+        self.assertTrue(name.endswith('.jpg'))
+        self.assertTrue(is_hashed_name(name))
+
+    def test_identical_bytes_are_stored_once(self):
+        first = self.storage.save('articles/a.jpg', ContentFile(b'same'))
+        second = self.storage.save('articles/b.jpg', ContentFile(b'same'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, self.storage.save('articles/c.jpg', ContentFile(b'other')))
@@ -8,6 +8,7 @@ urlpatterns = [
     path('about/', views.about, name='about'),
     path('contact/', views.contact, name='contact'),
     path('search/', views.search, name='search'),
+    path('search/autocomplete/', views.autocomplete, name='autocomplete'),
     path('newsletter/subscribe/', views.newsletter_subscribe, name='newsletter_subscribe'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
@@ -1,26 +1,33 @@
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
-from django.db.models import Q
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from .autocomplete import suggest
+from .caching import cached, is_cache_warming
 from .models import SiteSettings
+from .ratelimit import ratelimit
+from .search import SEARCH_TYPES, cached_search, load_entries, type_counts
 from .forms import ContactForm, NewsletterForm
 from articles.models import Article
 from reviews.models import BookReview, MovieReview
 from newsletter.models import NewsletterSubscriber
 
 
-def home(request):
-    """Home page with latest articles and featured reviews"""
-    current_language = request.LANGUAGE_CODE
+def home_sections(language):
+    """Latest and featured content shown on the home page, as lists (cacheable)"""
     # Get latest published articles
-    latest_articles = Article.objects.filter(status='published', language=current_language).select_related('author', 'category')[:6]
+    latest_articles = Article.objects.filter(status='published', language=language).select_related('author', 'category')[:6]
     
     # Get featured articles
-    featured_articles = Article.objects.filter(status='published', is_featured=True, language=current_language).select_related('author', 'category')[:3]
+    featured_articles = Article.objects.filter(status='published', is_featured=True, language=language).select_related('author', 'category')[:3]
     
     # Get featured reviews
-    featured_books = BookReview.objects.filter(is_published=True, is_featured=True, language=current_language).select_related('author', 'category').order_by('-published_at', '-created_at')[:3]
-    featured_movies = MovieReview.objects.filter(is_published=True, is_featured=True, language=current_language).select_related('author', 'category').order_by('-published_at', '-created_at')[:3]
+    featured_books = BookReview.objects.filter(is_published=True, is_featured=True, language=language).select_related('author', 'category').order_by('-published_at', '-created_at')[:3]
+    featured_movies = MovieReview.objects.filter(is_published=True, is_featured=True, language=language).select_related('author', 'category').order_by('-published_at', '-created_at')[:3]
     
     # Get latest reviews (excluding featured ones)
     # Convert to list to evaluate queryset and get IDs
@@ -28,7 +35,7 @@ def home(request):
     featured_movies_list = list(featured_movies)
     
     # Get latest books (exclude featured ones if they exist)
-    latest_books_query = BookReview.objects.filter(is_published=True, language=current_language).select_related('author', 'category').order_by('-published_at', '-created_at')
+    latest_books_query = BookReview.objects.filter(is_published=True, language=language).select_related('author', 'category').order_by('-published_at', '-created_at')
     if featured_books_list:
         featured_book_ids = [b.id for b in featured_books_list]
         latest_books = latest_books_query.exclude(id__in=featured_book_ids)[:6]
@@ -36,21 +43,32 @@ def home(request):
         latest_books = latest_books_query[:6]
     
     # Get latest movies (exclude featured ones if they exist)
-    latest_movies_query = MovieReview.objects.filter(is_published=True, language=current_language).select_related('author', 'category').order_by('-published_at', '-created_at')
+    latest_movies_query = MovieReview.objects.filter(is_published=True, language=language).select_related('author', 'category').order_by('-published_at', '-created_at')
     if featured_movies_list:
         featured_movie_ids = [m.id for m in featured_movies_list]
         latest_movies = latest_movies_query.exclude(id__in=featured_movie_ids)[:6]
     else:
         latest_movies = latest_movies_query[:6]
     
-    context = {
-        'latest_articles': latest_articles,
-        'featured_articles': featured_articles,
-        'featured_books': featured_books_list if featured_books_list else [],
-        'featured_movies': featured_movies_list if featured_movies_list else [],
-        'latest_books': latest_books,
-        'latest_movies': latest_movies,
+    return {
+        'latest_articles': list(latest_articles),
+        'featured_articles': list(featured_articles),
+        'featured_books': featured_books_list,
+        'featured_movies': featured_movies_list,
+        'latest_books': list(latest_books),
+        'latest_movies': list(latest_movies),
     }
+
+
+def home(request):
+    """Home page with latest articles and featured reviews"""
+    current_language = request.LANGUAGE_CODE
+    # Cached until content changes (or LISTING_CACHE_TIMEOUT, for the view counts)
+    context = cached(
+        'home', current_language,
+        compute=lambda: home_sections(current_language),
+        timeout=settings.LISTING_CACHE_TIMEOUT,
+    )
     return render(request, 'core/home.html', context)
 
 
@@ -63,6 +81,7 @@ def about(request):
     return render(request, 'core/about.html', context)
 
 
+@ratelimit('contact')
 def contact(request):
     """Contact page with form"""
     if request.method == 'POST':
@@ -82,6 +101,7 @@ def contact(request):
     return render(request, 'core/contact.html', context)
 
 
+@ratelimit('newsletter')
 def newsletter_subscribe(request):
     """Handle newsletter subscription"""
     if request.method == 'POST':
@@ -110,51 +130,52 @@ def newsletter_subscribe(request):
 
 
 def search(request):
-    """Search functionality for articles and reviews"""
+    """Ranked search over articles and reviews, one page at a time (see core/search.py)"""
     query = request.GET.get('q', '').strip()
-    results = {}
+    content_type = request.GET.get('type', '')
+    if content_type not in SEARCH_TYPES:
+        content_type = ''
+    page_obj = None
+    counts = {}
     
     if query:
-        # Search articles
-        current_language = request.LANGUAGE_CODE
-        articles = Article.objects.filter(
-            Q(title__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(content__icontains=query) |
-            Q(tags__name__icontains=query)
-        ).filter(status='published', language=current_language).distinct().select_related('author', 'category')
-        
-        # Search book reviews
-        books = BookReview.objects.filter(
-            Q(title__icontains=query) |
-            Q(book_title__icontains=query) |
-            Q(book_author__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(content__icontains=query)
-        ).filter(is_published=True, language=current_language).distinct().select_related('author')
-        
-        # Search movie reviews
-        movies = MovieReview.objects.filter(
-            Q(title__icontains=query) |
-            Q(movie_title__icontains=query) |
-            Q(director__icontains=query) |
-            Q(excerpt__icontains=query) |
-            Q(content__icontains=query)
-        ).filter(is_published=True, language=current_language).distinct().select_related('author')
-        
-        results = {
-            'articles': articles,
-            'books': books,
-            'movies': movies,
-        }
+        # Warming runs the top queries without counting them again
+        results = cached_search(request.LANGUAGE_CODE, query, record=not is_cache_warming(request))
+        counts = type_counts(results)
+        if content_type:
+            results = [result for result in results if result[0] == content_type]
+        page_obj = Paginator(results, settings.SEARCH_PAGE_SIZE).get_page(request.GET.get('page'))
+        page_obj.object_list = load_entries(page_obj.object_list)
     
     context = {
         'query': query,
-        'results': results,
+        'content_type': content_type,
+        'counts': counts,
+        'total': sum(counts.values()),
+        'page_obj': page_obj,
     }
     return render(request, 'core/search.html', context)
 
 
+def autocomplete(request):
+    """JSON search suggestions for the prefix in ?q= (titles, books, authors, movies, directors, tags)"""
+    query = request.GET.get('q', '').strip()
+    results = []
+    if len(query) >= 2:
+        results = suggest(request.LANGUAGE_CODE, query[:100], limit=settings.AUTOCOMPLETE_MAX_RESULTS)
+    response = JsonResponse({'query': query, 'results': results})
+    patch_cache_control(response, public=True, max_age=settings.AUTOCOMPLETE_MAX_AGE)
+    return response
+
+
+def csrf_token(request):
+    """A CSRF token (and cookie) for forms on shared, proxy-cached pages (see core/cache_policy.py)"""
+    response = JsonResponse({'token': get_token(request)})
+    add_never_cache_headers(response)
+    return response
+
+
+@ratelimit('login')
 def login_view(request):
     """Login page for superuser only - redirects to custom admin panel"""
     
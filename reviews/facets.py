@@ -0,0 +1,192 @@
+"""
+Faceted navigation for the book and movie review lists
+Every facet (category, rating, decade, genre, language) is counted with one
+grouped query that applies all the other selected filters, so each value shows
+how many results picking it would give. The counts only change with content,
+so they are cached per language and selection on the content version (see
+core/caching.py) and a list page normally runs no count queries at all.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from django.conf import settings
+from django.db.models import Count, F, IntegerField, Q
+from django.db.models.functions import Cast, Floor
+from django.urls import reverse
+from django.utils import translation
+from django.utils.http import urlencode
+
+from core.caching import cached
+
+
+@dataclass
+class Facet:
+    name: str  # GET parameter
+    field: str  # field (or annotation) grouped on
+    lookup: Callable  # parsed value -> Q
+    parse: Callable = str
+    label_field: str = ''
+    # Filter only (e.g. the movie list's exact ?year=): no counts shown
+    counted: bool = True
+
+
+def _decade(field):
+    # Floor() resolves to a FloatField (1990.0 on PostgreSQL); the value ends up in ?decade=
+    return Cast(Floor(F(field) / 10), IntegerField()) * 10
+
+
+def _decade_lookup(field):
+    return lambda decade: Q(**{f'{field}__gte': decade, f'{field}__lt': decade + 10})
+
+
+BOOK_FACETS = [
+    Facet('category', 'category__slug', lambda slug: Q(category__slug=slug), label_field='category__name'),
+    Facet('rating', 'rating', lambda rating: Q(rating=rating), parse=int),
+    Facet('decade', 'decade', _decade_lookup('book_year'), parse=int),
+]
+BOOK_ANNOTATIONS = {'decade': _decade('book_year')}
+
+MOVIE_FACETS = [
+    Facet('category', 'category__slug', lambda slug: Q(category__slug=slug), label_field='category__name'),
+    Facet('genre', 'genre', lambda genre: Q(genre=genre)),
+    Facet('rating', 'rating', lambda rating: Q(rating=rating), parse=int),
+    Facet('decade', 'decade', _decade_lookup('year'), parse=int),
+    Facet('year', 'year', lambda year: Q(year=year), parse=int, counted=False),
+]
+MOVIE_ANNOTATIONS = {'decade': _decade('year')}
+
+# Category slugs are per language, so switching language drops the category
+LANGUAGE_INDEPENDENT = {'category'}
+
+
+def parse_selection(params, facets):
+    """{facet name: value} for the valid facet parameters in ``params``; invalid values are ignored"""
+    selected = {}
+    for facet in facets:
+        raw = params.get(facet.name, '').strip()
+        if not raw:
+            continue
+        try:
+            selected[facet.name] = facet.parse(raw)
+        except ValueError:
+            continue
+    return selected
+
+
+def filter_queryset(queryset, facets, selected, annotations, exclude=None):
+    """``queryset`` narrowed by every selected facet except ``exclude``"""
+    lookups = {facet.name: facet.lookup for facet in facets}
+    queryset = queryset.annotate(**annotations)
+    for name, value in selected.items():
+        if name != exclude:
+            queryset = queryset.filter(lookups[name](value))
+    return queryset
+
+
+def count_facets(model, facets, annotations, language, selected):
+    """{facet name: [(value, label, count)]}, one grouped query per facet (plus one for language)"""
+    published = model.objects.filter(is_published=True)
+    counts = {}
+    for facet in facets:
+        if not facet.counted:
+            continue
+        queryset = filter_queryset(published.filter(language=language), facets, selected, annotations, exclude=facet.name)
+        columns = [facet.field, facet.label_field] if facet.label_field else [facet.field]
+        rows = (
+            queryset.exclude(**{f'{facet.field}__isnull': True})
+            .values(*columns)
+            .annotate(count=Count('pk'))
+            .order_by(*columns)
+        )
+        counts[facet.name] = [
+            (row[facet.field], row.get(facet.label_field, row[facet.field]), row['count'])
+            for row in rows
+            if row[facet.field] != ''
+        ]
+    # Other languages, with the filters that carry over to them
+    carried = {name: value for name, value in selected.items() if name not in LANGUAGE_INDEPENDENT}
+    rows = (
+        filter_queryset(published, facets, carried, annotations)
+        .values('language')
+        .annotate(count=Count('pk'))
+        .order_by('language')
+    )
+    counts['language'] = [(row['language'], row['language'], row['count']) for row in rows]
+    return counts
+
+
+def cached_facet_counts(model, facets, annotations, language, selected):
+    return cached(
+        'facets', model._meta.label, language, sorted(selected.items()),
+        compute=lambda: count_facets(model, facets, annotations, language, selected),
+        timeout=settings.FACET_CACHE_TIMEOUT,
+    )
+
+
+def build_navigation(request, url_name, facets, selected, counts):
+    """
+    Facets for the template: [{'name', 'selected', 'clear_url', 'options':
+    [{'value', 'label', 'count', 'selected', 'url'}]}]. Picking a value keeps
+    the other filters and returns to the first page.
+    """
+    def url(params, language=None):
+        query = urlencode({name: value for name, value in params.items() if value is not None})
+        if language is None:
+            path = request.path
+        else:
+            with translation.override(language):
+                path = reverse(url_name)
+        return f'{path}?{query}' if query else path
+
+    navigation = []
+    for facet in facets:
+        if not facet.counted:
+            continue
+        current = selected.get(facet.name)
+        options = [
+            {
+                'value': value,
+                'label': label,
+                'count': count,
+                'selected': value == current,
+                'url': url({**selected, facet.name: None if value == current else value}),
+            }
+            for value, label, count in counts.get(facet.name, [])
+        ]
+        navigation.append({
+            'name': facet.name,
+            'selected': current is not None,
+            'clear_url': url({**selected, facet.name: None}),
+            'options': options,
+        })
+
+    carried = {name: value for name, value in selected.items() if name not in LANGUAGE_INDEPENDENT}
+    navigation.append({
+        'name': 'language',
+        'selected': True,
+        'clear_url': None,
+        'options': [
+            {
+                'value': language,
+                'label': language,
+                'count': count,
+                'selected': language == request.LANGUAGE_CODE,
+                'url': url(carried, language=language),
+            }
+            for language, label, count in counts.get('language', [])
+        ],
+    })
+    return navigation
+
+
+def faceted_list(request, queryset, model, facets, annotations, url_name):
+    """(filtered queryset, template context) for a faceted review list"""
+    selected = parse_selection(request.GET, facets)
+    counts = cached_facet_counts(model, facets, annotations, request.LANGUAGE_CODE, selected)
+    context = {
+        'facets': build_navigation(request, url_name, facets, selected, counts),
+        'selected_facets': selected,
+        # Current filters, for pagination links
+        'facet_query': urlencode(selected),
+    }
+    return filter_queryset(queryset, facets, selected, annotations), context
@@ -0,0 +1,87 @@
+"""
+RSS/Atom feeds for published book and movie reviews
+Filter with ?category=<slug>; ?full=1 embeds the full pre-rendered review
+body instead of the excerpt.
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import F
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from core.feeds import AtomFeedMixin, CachedFeed, FeedScope
+from core.templatetags.core_extras import translate_name
+from .models import BookCategory, BookReview, MovieCategory, MovieReview
+
+
+class LatestReviewsFeed(CachedFeed):
+    """Shared implementation; subclasses set the review/category models and names"""
+    filter_params = ('category',)
+    model = None
+    category_model = None
+    list_url_name = None
+    label = None
+
+    def get_object(self, request):
+        language = request.LANGUAGE_CODE
+        scope = FeedScope(language=language, full=self.wants_full(request))
+        category_slug = request.GET.get('category')
+        if category_slug:
+            scope.category = get_object_or_404(self.category_model, slug=category_slug, language=language)
+        return scope
+
+    def title(self, obj):
+        parts = [self.site_name(), self.label]
+        if obj.category:
+            parts.append(translate_name(obj.category.name))
+        return ' - '.join(parts)
+
+    def link(self, obj):
+        url = reverse(self.list_url_name)
+        if obj.category:
+            return f'{url}?{urlencode({"category": obj.category.slug})}'
+        return url
+
+    def description(self, obj):
+        return f'Latest {self.label.lower()} from {self.site_name()}'
+
+    def items(self, obj):
+        reviews = self.model.objects.filter(is_published=True, language=obj.language)
+        if obj.category:
+            reviews = reviews.filter(category=obj.category)
+        # Never load the raw editor HTML; ?full=1 reads the HTML rendered at save time
+        body = 'rendered_content' if obj.full else 'excerpt'
+        return (
+            reviews.select_related('author', 'category')
+            .defer('content', 'rendered_content', 'meta_description')
+            .annotate(feed_body=F(body))[:settings.FEED_ITEMS]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_categories(self, item):
+        return [translate_name(item.category.name)] if item.category else []
+
+
+class LatestBookReviewsFeed(LatestReviewsFeed):
+    model = BookReview
+    category_model = BookCategory
+    list_url_name = 'reviews:book_list'
+    label = 'Book Reviews'
+
+
+class LatestBookReviewsAtomFeed(AtomFeedMixin, LatestBookReviewsFeed):
+    pass
+
+
+class LatestMovieReviewsFeed(LatestReviewsFeed):
+    model = MovieReview
+    category_model = MovieCategory
+    list_url_name = 'reviews:movie_list'
+    label = 'Movie Reviews'
+
+
+class LatestMovieReviewsAtomFeed(AtomFeedMixin, LatestMovieReviewsFeed):
+    pass
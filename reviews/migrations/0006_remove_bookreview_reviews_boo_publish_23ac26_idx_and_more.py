@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('reviews', '0005_bookcategory_language_moviecategory_language_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bookreview',
+            name='reviews_boo_publish_23ac26_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bookreview',
+            name='reviews_boo_categor_0079b7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='moviereview',
+            name='reviews_mov_publish_48f339_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='moviereview',
+            name='reviews_mov_categor_03aec5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bookcategory',
+            index=models.Index(fields=['language', 'name'], name='bookcategory_lang_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['language', '-published_at', '-created_at'], name='bookreview_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', 'language', '-published_at', '-created_at'], name='bookreview_cat_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['language', '-published_at', '-created_at'], name='bookreview_featured_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookreview',
+            index=models.Index(fields=['-created_at'], name='bookreview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviecategory',
+            index=models.Index(fields=['language', 'name'], name='moviecategory_lang_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['language', '-published_at', '-created_at'], name='moviereview_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', 'language', '-published_at', '-created_at'], name='moviereview_cat_lang_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['language', '-published_at', '-created_at'], name='moviereview_featured_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviereview',
+            index=models.Index(fields=['-created_at'], name='moviereview_created_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_remove_bookreview_reviews_boo_publish_23ac26_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookreview',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='bookreview',
+            name='render_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bookreview',
+            name='rendered_content',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content'),
+        ),
+        migrations.AddField(
+            model_name='bookreview',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='moviereview',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='moviereview',
+            name='render_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='moviereview',
+            name='rendered_content',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content'),
+        ),
+        migrations.AddField(
+            model_name='moviereview',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
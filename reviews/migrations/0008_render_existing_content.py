@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:36
+
+from django.db import migrations
+
+
+def render_existing(apps, schema_editor):
+    from core.content_pipeline import PIPELINE_VERSION, render_content
+
+    fields = ['rendered_content', 'word_count', 'reading_time', 'render_version']
+    for model_name in ('BookReview', 'MovieReview'):
+        Model = apps.get_model('reviews', model_name)
+        batch = []
+        for review in Model.objects.only('id', 'content').iterator(chunk_size=500):
+            rendered = render_content(review.content)
+            review.rendered_content = rendered.html
+            review.word_count = rendered.word_count
+            review.reading_time = rendered.reading_time
+            review.render_version = PIPELINE_VERSION
+            batch.append(review)
+            if len(batch) >= 500:
+                Model.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            Model.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_bookreview_reading_time_bookreview_render_version_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -24,6 +24,9 @@ class BookCategory(models.Model):
         verbose_name_plural = 'Book Categories'
         ordering = ['name']
         unique_together = [['slug', 'language']]
+        indexes = [
+            models.Index(fields=['language', 'name'], name='bookcategory_lang_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,6 +60,9 @@ class MovieCategory(models.Model):
         verbose_name_plural = 'Movie Categories'
         ordering = ['name']
         unique_together = [['slug', 'language']]
+        indexes = [
+            models.Index(fields=['language', 'name'], name='moviecategory_lang_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -103,6 +109,12 @@ class BookReview(models.Model):
     excerpt = models.TextField(max_length=500)
     content = models.TextField(help_text='Review content (HTML supported)')
     
+    # Rendered on save by core.content_pipeline - templates output this, never raw content
+    rendered_content = models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content')
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes')
+    render_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    
     # Images
     cover_image = models.ImageField(upload_to='book_reviews/', blank=True, null=True, help_text='Book cover image')
     image_alt = models.CharField(max_length=200, blank=True)
@@ -128,11 +140,29 @@ class BookReview(models.Model):
         verbose_name = 'Book Review'
         verbose_name_plural = 'Book Reviews'
         ordering = ['-published_at', '-created_at']
+        # Indexes follow the public query shapes (see `manage.py explain_views`):
+        # every listing filters on language + is_published and orders by the model ordering.
+        # Boolean filters compile to a bare column test, which can't seek into a
+        # composite key, so they are expressed as partial-index conditions instead.
         indexes = [
-            models.Index(fields=['-published_at', 'is_published']),
+            models.Index(
+                fields=['language', '-published_at', '-created_at'],
+                name='bookreview_lang_pub_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['category', 'language', '-published_at', '-created_at'],
+                name='bookreview_cat_lang_pub_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['language', '-published_at', '-created_at'],
+                name='bookreview_featured_pub_idx',
+                condition=models.Q(is_published=True, is_featured=True),
+            ),
+            models.Index(fields=['-created_at'], name='bookreview_created_idx'),
             models.Index(fields=['slug']),
             models.Index(fields=['rating']),
-            models.Index(fields=['category']),
         ]
 
     def __str__(self):
@@ -148,6 +178,8 @@ class BookReview(models.Model):
         if self.is_published and not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
+        from core.content_pipeline import apply_rendered_content
+        kwargs['update_fields'] = apply_rendered_content(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
     def increment_views(self):
@@ -188,6 +220,12 @@ class MovieReview(models.Model):
     excerpt = models.TextField(max_length=500)
     content = models.TextField(help_text='Review content (HTML supported)')
     
+    # Rendered on save by core.content_pipeline - templates output this, never raw content
+    rendered_content = models.TextField(blank=True, editable=False, help_text='Sanitized HTML generated from content')
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes')
+    render_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    
     # Images
     poster_image = models.ImageField(upload_to='movie_reviews/', blank=True, null=True, help_text='Movie poster image')
     image_alt = models.CharField(max_length=200, blank=True)
@@ -213,11 +251,29 @@ class MovieReview(models.Model):
         verbose_name = 'Movie Review'
         verbose_name_plural = 'Movie Reviews'
         ordering = ['-published_at', '-created_at']
+        # Indexes follow the public query shapes (see `manage.py explain_views`):
+        # every listing filters on language + is_published and orders by the model ordering.
+        # Boolean filters compile to a bare column test, which can't seek into a
+        # composite key, so they are expressed as partial-index conditions instead.
         indexes = [
-            models.Index(fields=['-published_at', 'is_published']),
+            models.Index(
+                fields=['language', '-published_at', '-created_at'],
+                name='moviereview_lang_pub_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['category', 'language', '-published_at', '-created_at'],
+                name='moviereview_cat_lang_pub_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['language', '-published_at', '-created_at'],
+                name='moviereview_featured_pub_idx',
+                condition=models.Q(is_published=True, is_featured=True),
+            ),
+            models.Index(fields=['-created_at'], name='moviereview_created_idx'),
             models.Index(fields=['slug']),
             models.Index(fields=['rating']),
-            models.Index(fields=['category']),
         ]
 
     def __str__(self):
@@ -233,6 +289,8 @@ class MovieReview(models.Model):
         if self.is_published and not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
+        from core.content_pipeline import apply_rendered_content
+        kwargs['update_fields'] = apply_rendered_content(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
     def increment_views(self):
@@ -1,13 +1,20 @@
 from django.urls import path
 from . import views
+from .feeds import (
+    LatestBookReviewsAtomFeed, LatestBookReviewsFeed, LatestMovieReviewsAtomFeed, LatestMovieReviewsFeed,
+)
 
 app_name = 'reviews'
 
 urlpatterns = [
     path('books/', views.book_list, name='book_list'),
+    path('books/feed/', LatestBookReviewsFeed(), name='book_feed'),
+    path('books/feed/atom/', LatestBookReviewsAtomFeed(), name='book_atom_feed'),
     path('books/category/<uslug:slug>/', views.book_category_detail, name='book_category_detail'),
     path('books/<uslug:slug>/', views.book_detail, name='book_detail'),
     path('movies/', views.movie_list, name='movie_list'),
+    path('movies/feed/', LatestMovieReviewsFeed(), name='movie_feed'),
+    path('movies/feed/atom/', LatestMovieReviewsAtomFeed(), name='movie_atom_feed'),
     path('movies/category/<uslug:slug>/', views.movie_category_detail, name='movie_category_detail'),
     path('movies/<uslug:slug>/', views.movie_detail, name='movie_detail'),
 ]
@@ -2,31 +2,24 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
+from .facets import BOOK_ANNOTATIONS, BOOK_FACETS, MOVIE_ANNOTATIONS, MOVIE_FACETS, faceted_list
 from .models import BookReview, MovieReview, BookCategory, MovieCategory
 from comments.models import Comment
 from comments.forms import CommentForm
+from core.caching import is_cache_warming
+from core.ratelimit import get_client_ip, ratelimit
 
 
 def book_list(request):
-    """List all published book reviews"""
+    """List all published book reviews, with faceted filtering (see reviews/facets.py)"""
     current_language = request.LANGUAGE_CODE
     books = BookReview.objects.filter(is_published=True, language=current_language).select_related('author', 'category')
     
-    # Filter by category
-    category_slug = request.GET.get('category')
-    if category_slug:
-        category = get_object_or_404(BookCategory, slug=category_slug)
-        books = books.filter(category=category)
-    else:
-        category = None
-    
-    # Filter by rating
-    rating = request.GET.get('rating')
-    if rating:
-        books = books.filter(rating=rating)
+    books, facet_context = faceted_list(request, books, BookReview, BOOK_FACETS, BOOK_ANNOTATIONS, 'reviews:book_list')
     
-    # Get all categories for filter (filtered by language)
-    categories = BookCategory.objects.filter(language=current_language)
+    # Unknown category slugs are still a 404, as before
+    category_slug = facet_context['selected_facets'].get('category')
+    category = get_object_or_404(BookCategory, slug=category_slug, language=current_language) if category_slug else None
     
     # Pagination
     paginator = Paginator(books, 10)
@@ -35,20 +28,21 @@ def book_list(request):
     
     context = {
         'page_obj': page_obj,
-        'rating': rating,
         'category': category,
-        'categories': categories,
+        **facet_context,
     }
     return render(request, 'reviews/book_list.html', context)
 
 
+@ratelimit('comment')
 def book_detail(request, slug):
     """Book review detail page"""
     current_language = request.LANGUAGE_CODE
     book = get_object_or_404(BookReview.objects.select_related('author'), slug=slug, is_published=True, language=current_language)
     
-    # Increment views
-    book.increment_views()
+    # Increment views (not for cache warming requests)
+    if not is_cache_warming(request):
+        book.increment_views()
     
     # Get related books
     related_books = BookReview.objects.filter(
@@ -76,6 +70,7 @@ def book_detail(request, slug):
                 comment.user = request.user
                 comment.name = request.user.get_full_name() or request.user.username
                 comment.email = request.user.email
+            comment.ip_address = get_client_ip(request)
             comment.save()
             messages.success(request, 'Your comment has been submitted and is awaiting moderation.')
             return redirect('reviews:book_detail', slug=slug)
@@ -92,30 +87,15 @@ def book_detail(request, slug):
 
 
 def movie_list(request):
-    """List all published movie reviews"""
+    """List all published movie reviews, with faceted filtering (see reviews/facets.py)"""
     current_language = request.LANGUAGE_CODE
     movies = MovieReview.objects.filter(is_published=True, language=current_language).select_related('author', 'category')
     
-    # Filter by category
-    category_slug = request.GET.get('category')
-    if category_slug:
-        category = get_object_or_404(MovieCategory, slug=category_slug)
-        movies = movies.filter(category=category)
-    else:
-        category = None
-    
-    # Filter by rating
-    rating = request.GET.get('rating')
-    if rating:
-        movies = movies.filter(rating=rating)
-    
-    # Filter by year
-    year = request.GET.get('year')
-    if year:
-        movies = movies.filter(year=year)
+    movies, facet_context = faceted_list(request, movies, MovieReview, MOVIE_FACETS, MOVIE_ANNOTATIONS, 'reviews:movie_list')
     
-    # Get all categories for filter (filtered by language)
-    categories = MovieCategory.objects.filter(language=current_language)
+    # Unknown category slugs are still a 404, as before
+    category_slug = facet_context['selected_facets'].get('category')
+    category = get_object_or_404(MovieCategory, slug=category_slug, language=current_language) if category_slug else None
     
     # Pagination
     paginator = Paginator(movies, 10)
@@ -124,21 +104,21 @@ def movie_list(request):
     
     context = {
         'page_obj': page_obj,
-        'rating': rating,
-        'year': year,
         'category': category,
-        'categories': categories,
+        **facet_context,
     }
     return render(request, 'reviews/movie_list.html', context)
 
 
+@ratelimit('comment')
 def movie_detail(request, slug):
     """Movie review detail page"""
     current_language = request.LANGUAGE_CODE
     movie = get_object_or_404(MovieReview.objects.select_related('author'), slug=slug, is_published=True, language=current_language)
     
-    # Increment views
-    movie.increment_views()
+    # Increment views (not for cache warming requests)
+    if not is_cache_warming(request):
+        movie.increment_views()
     
     # Get related movies
     related_movies = MovieReview.objects.filter(
@@ -166,6 +146,7 @@ def movie_detail(request, slug):
                 comment.user = request.user
                 comment.name = request.user.get_full_name() or request.user.username
                 comment.email = request.user.email
+            comment.ip_address = get_client_ip(request)
             comment.save()
             messages.success(request, 'Your comment has been submitted and is awaiting moderation.')
             return redirect('reviews:movie_detail', slug=slug)
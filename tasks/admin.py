@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at']
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'finished_at', 'locked_at', 'locked_by', 'attempts']
+    date_hierarchy = 'created_at'
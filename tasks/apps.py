@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tasks'
+    verbose_name = 'Background Tasks'
+
+    def ready(self):
+        # Import every app's tasks.py so @task functions are registered
+        # before the worker starts claiming rows.
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
@@ -0,0 +1,139 @@
+"""
+Management command to run background task workers.
+Claims due rows from the task table and executes them in a thread or
+process pool.
+"""
+import multiprocessing
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tasks.queue import enqueue_periodic_tasks, registered_tasks
+from tasks.worker import HEARTBEAT_INTERVAL, Worker, housekeeping, run_worker_process
+
+
+# Seconds between checks for periodic tasks that need queueing
+PERIODIC_CHECK_INTERVAL = 10
+
+
+class Command(BaseCommand):
+    help = 'Run background task workers (database-backed queue)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Number of tasks to execute in parallel (default: 2)',
+        )
+        parser.add_argument(
+            '--pool',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run workers as threads or as separate processes (default: thread)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1.0)',
+        )
+        parser.add_argument(
+            '--stale-timeout',
+            type=int,
+            default=600,
+            help=(
+                'Requeue running tasks whose worker stopped refreshing their lock this many seconds ago '
+                '(default: 600)'
+            ),
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='Delete finished tasks older than this many days, 0 to keep forever (default: 7)',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever',
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        pool = options['pool']
+        poll_interval = options['poll_interval']
+        burst = options['burst']
+        if options['stale_timeout'] < 3 * HEARTBEAT_INTERVAL:
+            raise CommandError(
+                f'--stale-timeout must be at least {3 * HEARTBEAT_INTERVAL}s '
+                f'(locks are refreshed every {HEARTBEAT_INTERVAL}s)'
+            )
+
+        names = sorted(registered_tasks())
+        self.stdout.write(self.style.SUCCESS(
+            f'Starting {concurrency} {pool} worker(s) for {len(names)} registered task(s)'
+        ))
+        for name in names:
+            periodic = registered_tasks()[name].periodic
+            self.stdout.write(f'   - {name}' + (f' (every {periodic}s)' if periodic else ''))
+
+        requeued, deleted = housekeeping(options['stale_timeout'], options['keep_days'])
+        if requeued or deleted:
+            self.stdout.write(f'Requeued {requeued} stale task(s), purged {deleted} finished task(s)')
+        if not burst:
+            enqueue_periodic_tasks()
+
+        if pool == 'process':
+            # Children must not share the parent's database sockets
+            connections.close_all()
+            stop_event = multiprocessing.Event()
+            workers = [
+                multiprocessing.Process(
+                    target=run_worker_process,
+                    args=(stop_event, poll_interval, burst),
+                    daemon=True,
+                )
+                for _ in range(concurrency)
+            ]
+        else:
+            stop_event = threading.Event()
+            workers = [
+                threading.Thread(
+                    target=Worker(stop_event, poll_interval=poll_interval, burst=burst).run,
+                    daemon=True,
+                )
+                for _ in range(concurrency)
+            ]
+
+        def shutdown(signum, frame):
+            self.stdout.write(self.style.WARNING('Shutting down, waiting for running tasks to finish...'))
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+
+        last_housekeeping = last_periodic_check = time.monotonic()
+        while any(worker.is_alive() for worker in workers):
+            stop_event.wait(1.0)
+            if not burst and time.monotonic() - last_periodic_check >= PERIODIC_CHECK_INTERVAL:
+                enqueue_periodic_tasks()
+                last_periodic_check = time.monotonic()
+            if not burst and time.monotonic() - last_housekeeping >= 60:
+                housekeeping(options['stale_timeout'], options['keep_days'])
+                connections.close_all()
+                last_housekeeping = time.monotonic()
+            if stop_event.is_set():
+                break
+
+        for worker in workers:
+            worker.join()
+
+        self.stdout.write(self.style.SUCCESS(f'Workers stopped after {time.monotonic() - started:.1f}s'))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='periodic_key',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('periodic_key',), name='task_periodic_pending_unique'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Queued background task executed by the run_worker command"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200, help_text='Registered task name')
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    # Retries
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+
+    # Set to the task name on rows queued by enqueue_periodic_tasks(); unique while
+    # queued or running, so concurrent workers can't queue the same periodic task twice
+    periodic_key = models.CharField(max_length=200, null=True, blank=True)
+
+    # Scheduling and locking
+    run_at = models.DateTimeField(default=timezone.now, help_text='Earliest time the task may run')
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+            models.Index(fields=['name', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['periodic_key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='task_periodic_pending_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
@@ -0,0 +1,242 @@
+"""
+Database-backed task queue for Parsa Journal
+Request handlers enqueue work with ``some_task.delay(...)`` and return
+immediately; ``manage.py run_worker`` claims and executes the rows.
+"""
+from datetime import timedelta
+import logging
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 30  # seconds, doubled after every failed attempt
+MAX_RETRY_BACKOFF = 3600
+
+_registry = {}
+
+
+class TaskFunction:
+    """Wrapper returned by @task - callable inline, or queued with delay()/schedule()"""
+
+    def __init__(self, func, name, max_attempts, retry_backoff, periodic=None):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.periodic = periodic
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+        self.__module__ = func.__module__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<TaskFunction {self.name}>"
+
+    def delay(self, *args, **kwargs):
+        """Queue the task to run as soon as a worker is free"""
+        return self.schedule(None, *args, **kwargs)
+
+    def schedule(self, when, *args, **kwargs):
+        """
+        Queue the task to run at ``when`` (a datetime, a timedelta from now,
+        or None for immediately).
+        """
+        if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+            self.func(*args, **kwargs)
+            return None
+
+        if when is None:
+            run_at = timezone.now()
+        elif isinstance(when, timedelta):
+            run_at = timezone.now() + when
+        else:
+            run_at = when
+
+        return Task.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            run_at=run_at,
+            max_attempts=self.max_attempts,
+        )
+
+    def backoff_for(self, attempts):
+        """Seconds to wait before retry number ``attempts``"""
+        return min(self.retry_backoff * (2 ** max(attempts - 1, 0)), MAX_RETRY_BACKOFF)
+
+
+def task(func=None, *, name=None, max_attempts=DEFAULT_MAX_ATTEMPTS, retry_backoff=DEFAULT_RETRY_BACKOFF, periodic=None):
+    """
+    Register a function as a background task.
+
+    Usage::
+
+        @task
+        def send_welcome_email(subscriber_id): ...
+
+        @task(max_attempts=5, retry_backoff=60)
+        def process_image(path): ...
+
+        @task(periodic=30)
+        def score_pending_comments(): ...
+
+    Arguments passed to delay()/schedule() are stored as JSON, so pass IDs
+    rather than model instances. Periodic tasks take no arguments; run_worker
+    queues one every ``periodic`` seconds while none is pending. A task whose
+    worker dies is run again, so tasks should be idempotent.
+    """
+    def decorator(f):
+        task_name = name or f"{f.__module__}.{f.__name__}"
+        wrapped = TaskFunction(f, task_name, max_attempts, retry_backoff, periodic)
+        _registry[task_name] = wrapped
+        return wrapped
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    """Return the registered TaskFunction for ``name`` or None"""
+    return _registry.get(name)
+
+
+def registered_tasks():
+    return dict(_registry)
+
+
+def enqueue_periodic_tasks():
+    """Queue each periodic task that has no queued/running row yet; returns how many were queued"""
+    if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+        # schedule() would run them inline right now; periodic tasks need a real queue
+        return 0
+    queued = 0
+    for task_func in _registry.values():
+        if not task_func.periodic:
+            continue
+        pending = Task.objects.filter(
+            periodic_key=task_func.name,
+            status__in=[Task.STATUS_QUEUED, Task.STATUS_RUNNING],
+        ).exists()
+        if pending:
+            continue
+        try:
+            # The partial unique constraint on periodic_key settles races between worker hosts
+            with transaction.atomic():
+                Task.objects.create(
+                    name=task_func.name,
+                    periodic_key=task_func.name,
+                    run_at=timezone.now() + timedelta(seconds=task_func.periodic),
+                    max_attempts=task_func.max_attempts,
+                )
+        except IntegrityError:
+            continue
+        queued += 1
+    return queued
+
+
+def claim_task(worker_id):
+    """
+    Atomically claim the next due task for ``worker_id``.
+
+    On backends with SKIP LOCKED (PostgreSQL) the row is locked with
+    SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never block on
+    each other. Elsewhere (SQLite) the claim is a conditional UPDATE that
+    only succeeds if the row is still queued.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status=Task.STATUS_QUEUED, run_at__lte=now).order_by('run_at', 'id')
+    claim = {
+        'status': Task.STATUS_RUNNING,
+        'locked_by': worker_id,
+        'locked_at': now,
+        'attempts': F('attempts') + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            candidates = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:1])
+            if not candidates:
+                return None
+            Task.objects.filter(pk=candidates[0]).update(**claim)
+        return Task.objects.get(pk=candidates[0])
+
+    for task_id in due.values_list('id', flat=True)[:10]:
+        if Task.objects.filter(pk=task_id, status=Task.STATUS_QUEUED).update(**claim) == 1:
+            return Task.objects.get(pk=task_id)
+    return None
+
+
+def execute_task(task_obj):
+    """Run a claimed task and record success, retry or failure"""
+    task_func = get_task(task_obj.name)
+    now = timezone.now()
+
+    if task_func is None:
+        logger.error(f"Unknown task '{task_obj.name}' (id={task_obj.pk})")
+        Task.objects.filter(pk=task_obj.pk).update(
+            status=Task.STATUS_FAILED,
+            last_error=f"Task '{task_obj.name}' is not registered",
+            finished_at=now,
+        )
+        return False
+
+    try:
+        task_func.func(*task_obj.args, **task_obj.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if task_obj.attempts < task_obj.max_attempts:
+            delay = task_func.backoff_for(task_obj.attempts)
+            logger.warning(f"Task {task_obj.name} (id={task_obj.pk}) failed, retrying in {delay}s")
+            Task.objects.filter(pk=task_obj.pk).update(
+                status=Task.STATUS_QUEUED,
+                run_at=timezone.now() + timedelta(seconds=delay),
+                locked_by='',
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            logger.error(f"Task {task_obj.name} (id={task_obj.pk}) failed after {task_obj.attempts} attempt(s)")
+            Task.objects.filter(pk=task_obj.pk).update(
+                status=Task.STATUS_FAILED,
+                last_error=error,
+                finished_at=timezone.now(),
+            )
+        return False
+
+    Task.objects.filter(pk=task_obj.pk).update(status=Task.STATUS_DONE, finished_at=timezone.now())
+    return True
+
+
+def refresh_lock(task_id, worker_id):
+    """
+    Record that ``worker_id`` is still running the task, so requeue_stale_tasks
+    leaves it alone. Returns False if the task was taken back in the meantime.
+    """
+    return Task.objects.filter(pk=task_id, status=Task.STATUS_RUNNING, locked_by=worker_id).update(
+        locked_at=timezone.now(),
+    ) == 1
+
+
+def requeue_stale_tasks(timeout):
+    """
+    Put back tasks whose worker died mid-run: running workers refresh locked_at
+    (see worker.HEARTBEAT_INTERVAL), so a lock older than ``timeout`` seconds
+    means nobody is executing the task any more.
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Task.objects.filter(status=Task.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Task.STATUS_QUEUED,
+        locked_by='',
+        locked_at=None,
+    )
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .queue import (
+    claim_task, enqueue_periodic_tasks, execute_task, refresh_lock, requeue_stale_tasks, task,
+)
+
+calls = []
+
+
+@task(name='tasks.tests.record', max_attempts=2, retry_backoff=10)
+def record(value):
+    calls.append(value)
+
+
+@task(name='tasks.tests.fail', max_attempts=2, retry_backoff=10)
+def fail():
+    raise RuntimeError('boom')
+
+
+@task(name='tasks.tests.periodic', periodic=60)
+def periodic():
+    pass
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class ClaimTaskTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claims_due_tasks_in_order(self):
+        later = record.schedule(timedelta(minutes=5), 'later')
+        first = record.schedule(timezone.now() - timedelta(minutes=1), 'first')
+        second = record.delay('second')
+
+        claimed = claim_task('worker-1')
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.locked_by, claimed.attempts), (Task.STATUS_RUNNING, 'worker-1', 1))
+        self.assertEqual(claim_task('worker-2').pk, second.pk)
+        # Not due yet
+        self.assertIsNone(claim_task('worker-3'))
+        self.assertEqual(Task.objects.get(pk=later.pk).status, Task.STATUS_QUEUED)
+
+    def test_claimed_task_is_not_claimed_again(self):
+        record.delay('once')
+        self.assertIsNotNone(claim_task('worker-1'))
+        self.assertIsNone(claim_task('worker-2'))
+
+    def test_execute_records_success(self):
+        record.delay('value')
+        self.assertTrue(execute_task(claim_task('worker-1')))
+        self.assertEqual(calls, ['value'])
+        self.assertEqual(Task.objects.get().status, Task.STATUS_DONE)
+
+    def test_failure_is_retried_with_backoff_then_fails(self):
+        fail.delay()
+        before = timezone.now()
+        self.assertFalse(execute_task(claim_task('worker-1')))
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.locked_by), (Task.STATUS_QUEUED, ''))
+        self.assertGreaterEqual(row.run_at, before + timedelta(seconds=10))
+        self.assertIn('boom', row.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        self.assertFalse(execute_task(claim_task('worker-1')))
+        self.assertEqual(Task.objects.get().status, Task.STATUS_FAILED)
+
+    def test_backoff_doubles(self):
+        self.assertEqual([fail.backoff_for(attempt) for attempt in (1, 2, 3)], [10, 20, 40])
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class StaleTaskTests(TestCase):
+    def test_only_tasks_without_a_fresh_lock_are_requeued(self):
+        record.delay('a')
+        record.delay('b')
+        alive = claim_task('worker-1')
+        dead = claim_task('worker-2')
+        Task.objects.update(locked_at=timezone.now() - timedelta(minutes=20))
+        self.assertTrue(refresh_lock(alive.pk, 'worker-1'))
+
+        self.assertEqual(requeue_stale_tasks(600), 1)
+        self.assertEqual(Task.objects.get(pk=alive.pk).status, Task.STATUS_RUNNING)
+        self.assertEqual(Task.objects.get(pk=dead.pk).status, Task.STATUS_QUEUED)
+        # The requeued task is no longer this worker's to refresh
+        self.assertFalse(refresh_lock(dead.pk, 'worker-2'))
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class PeriodicTaskTests(TestCase):
+    def test_queued_once_while_pending(self):
+        enqueue_periodic_tasks()
+        enqueue_periodic_tasks()
+        self.assertEqual(Task.objects.filter(periodic_key='tasks.tests.periodic').count(), 1)
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_not_queued_in_eager_mode(self):
+        self.assertEqual(enqueue_periodic_tasks(), 0)
+        self.assertFalse(Task.objects.exists())
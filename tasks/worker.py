@@ -0,0 +1,106 @@
+"""
+Worker loop for the database task queue
+"""
+from datetime import timedelta
+import logging
+import os
+import socket
+import threading
+
+from django.db import DatabaseError, close_old_connections, connection
+from django.utils import timezone
+
+from .models import Task
+from .queue import claim_task, execute_task, refresh_lock, requeue_stale_tasks
+
+logger = logging.getLogger(__name__)
+
+# Seconds between locked_at refreshes of a running task; run_worker's
+# --stale-timeout must be well above this
+HEARTBEAT_INTERVAL = 30
+
+
+class Heartbeat(threading.Thread):
+    """Refreshes the lock of the task a worker is executing until stop() is called"""
+
+    def __init__(self, task_id, worker_name):
+        super().__init__(daemon=True)
+        self.task_id = task_id
+        self.worker_name = worker_name
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(HEARTBEAT_INTERVAL):
+                try:
+                    if not refresh_lock(self.task_id, self.worker_name):
+                        logger.warning(f"Task id={self.task_id} is no longer locked by {self.worker_name}")
+                        return
+                except DatabaseError:
+                    logger.exception(f"Could not refresh the lock of task id={self.task_id}")
+        finally:
+            # Each thread has its own connection
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Worker:
+    """
+    Claims due tasks one at a time and executes them until ``stop_event``
+    is set. Several workers run side by side (threads or processes); they
+    coordinate only through the task table.
+    """
+
+    def __init__(self, stop_event, poll_interval=1.0, burst=False, name=None):
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.processed = 0
+        self.failed = 0
+
+    def run(self):
+        logger.info(f"Worker {self.name} started")
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                task_obj = claim_task(self.name)
+                if task_obj is None:
+                    if self.burst:
+                        break
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+                heartbeat = Heartbeat(task_obj.pk, self.name)
+                heartbeat.start()
+                try:
+                    succeeded = execute_task(task_obj)
+                finally:
+                    heartbeat.stop()
+                if succeeded:
+                    self.processed += 1
+                else:
+                    self.failed += 1
+        finally:
+            connection.close()
+            logger.info(f"Worker {self.name} stopped ({self.processed} done, {self.failed} failed)")
+
+
+def housekeeping(stale_timeout, keep_days):
+    """Requeue abandoned tasks and delete old finished rows"""
+    requeued = requeue_stale_tasks(stale_timeout)
+    deleted = 0
+    if keep_days:
+        cutoff = timezone.now() - timedelta(days=keep_days)
+        deleted, _ = Task.objects.filter(status=Task.STATUS_DONE, finished_at__lt=cutoff).delete()
+    return requeued, deleted
+
+
+def run_worker_process(stop_event, poll_interval, burst):
+    """Entry point for process-pool workers (runs in a child process)"""
+    import django
+    django.setup()
+    Worker(stop_event, poll_interval=poll_interval, burst=burst).run()
+